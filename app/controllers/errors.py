@@ -0,0 +1,28 @@
+"""
+Mapping of service-layer errors to HTTP errors, shared by the controllers.
+"""
+
+from contextlib import contextmanager
+from typing import Iterator
+
+from fastapi import HTTPException
+
+from app.core.model_registry import ModelCapacityError
+
+
+def capacity_http_error(exc: ModelCapacityError) -> HTTPException:
+    """
+    503 with Retry-After for a model that cannot be loaded right now.
+    """
+    return HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": str(exc.retry_after)})
+
+
+@contextmanager
+def model_capacity_as_503() -> Iterator[None]:
+    """
+    Re-raise ModelCapacityError from the model registry as HTTPException(503).
+    """
+    try:
+        yield
+    except ModelCapacityError as exc:
+        raise capacity_http_error(exc) from exc
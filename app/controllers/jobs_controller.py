@@ -0,0 +1,159 @@
+"""
+Controller for the asynchronous job API.
+
+- Validates and persists jobs (uploads are copied into the job directory).
+- Provides the handlers executed by job workers, which reuse the regular
+  endpoint controllers so results match the synchronous endpoints.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import NoReturn
+
+from fastapi import HTTPException, UploadFile
+
+from app.core.admission import admission_exempt
+
+from app.controllers.summarize_controller import (
+    summarize_ai_action,
+    validate_text,
+    validate_summary_model,
+)
+from app.controllers.transcribe_controller import (
+    preflight_media,
+    resolve_decoding,
+    resolve_models,
+    transcribe_video_action,
+)
+from app.schemas.jobs import JobOut, JobSummarizeIn, JobsStatsOut
+from app.schemas.summarize import SummarizeAIIn
+from app.schemas.transcribe import TranscribeVideoQuery
+from app.services.jobs.job_queue import JobQueue, JobRejected, JobRetry, QueueFull, get_job_queue
+
+# Run job workers inside the API process. Set to 0 when dedicated worker
+# processes (worker.py) consume the same JOBS_DIR.
+JOBS_RUN_IN_API = os.getenv("JOBS_RUN_IN_API", "1") == "1"
+
+
+def submit_summarize_job(payload: JobSummarizeIn) -> JobOut:
+    """
+    Validate and enqueue an abstractive summarization job.
+    """
+    validate_text(payload.text)
+    validate_summary_model(payload.model)
+    params = payload.model_dump(exclude={"priority"})
+    return JobOut(**_enqueue("summarize", params, payload.priority))
+
+
+def submit_transcribe_job(file: UploadFile, q: TranscribeVideoQuery, priority: int) -> JobOut:
+    """
+    Pre-flight the upload (cheap rejection of bad/over-long videos) and enqueue it.
+    """
+    resolve_models(q.asr_model, q.summary_model)
+    resolve_decoding(q.asr_profile, q.language)
+    preflight_media(file)
+    params = {**q.model_dump(), "filename": file.filename}
+    return JobOut(**_enqueue("transcribe", params, priority, upload=file.file))
+
+
+def get_job_action(job_id: str) -> JobOut:
+    """
+    Return job status, and the result or error once finished.
+    """
+    job = get_job_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    return JobOut(**job)
+
+
+def jobs_stats_action() -> JobsStatsOut:
+    """
+    Report job counts by status.
+    """
+    return JobsStatsOut(**get_job_queue().stats())
+
+
+def _enqueue(kind: str, params: dict, priority: int, upload=None) -> dict:
+    try:
+        return get_job_queue().enqueue(kind, params, priority=priority, upload=upload)
+    except QueueFull:
+        raise HTTPException(
+            status_code=503,
+            detail="Job queue is full. Please retry later.",
+            headers={"Retry-After": "60"},
+        )
+
+
+# ---------- worker handlers ----------
+# Job concurrency is already bounded by the queue, so handlers are never shed
+# (a 503 would fail the job), but their cost still counts against the
+# admission budget: interactive requests are shed while jobs run here.
+def _run_summarize_job(job: dict) -> dict:
+    try:
+        with admission_exempt():
+            return summarize_ai_action(SummarizeAIIn(**job["params"])).model_dump()
+    except HTTPException as exc:
+        _raise_job_error(exc)
+
+
+def _run_transcribe_job(job: dict) -> dict:
+    params = job["params"]
+    with open(job["upload_path"], "rb") as f:
+        upload = UploadFile(file=f, filename=params.get("filename"))
+        try:
+            with admission_exempt():
+                return transcribe_video_action(
+                    file=upload,
+                    do_summary=params["do_summary"],
+                    min_length=params["min_length"],
+                    max_length=params["max_length"],
+                    asr_model=params.get("asr_model"),
+                    summary_model=params.get("summary_model"),
+                    reduce_mode=params.get("reduce_mode"),
+                    asr_profile=params.get("asr_profile"),
+                    language=params.get("language"),
+                )
+        except HTTPException as exc:
+            _raise_job_error(exc)
+
+
+def _raise_job_error(exc: HTTPException) -> NoReturn:
+    """
+    Map an endpoint error to the queue: 4xx fails the job for good, 503
+    (e.g. no model memory right now) requeues it with backoff, anything else
+    is retried as a transient failure up to JOBS_MAX_ATTEMPTS.
+    """
+    error = {"status_code": exc.status_code, "detail": exc.detail}
+    if exc.status_code == 503:
+        retry_after = (exc.headers or {}).get("Retry-After", "0")
+        raise JobRetry(error, retry_after=float(retry_after) if retry_after.isdigit() else 0.0) from exc
+    if 400 <= exc.status_code < 500:
+        raise JobRejected(error) from exc
+    raise exc
+
+
+def register_job_handlers() -> JobQueue:
+    """
+    Attach the summarize/transcribe handlers to the process-wide queue.
+    """
+    queue = get_job_queue()
+    queue.register("summarize", _run_summarize_job)
+    queue.register("transcribe", _run_transcribe_job)
+    return queue
+
+
+def start_job_workers() -> None:
+    """
+    Start in-process job workers (no-op when JOBS_RUN_IN_API=0).
+    """
+    if JOBS_RUN_IN_API:
+        register_job_handlers().start()
+
+
+def stop_job_workers() -> None:
+    """
+    Let in-process workers finish their current job and exit.
+    """
+    if JOBS_RUN_IN_API:
+        get_job_queue().stop()
@@ -0,0 +1,19 @@
+"""
+Controller for model selection and registry introspection.
+"""
+
+from app.core.model_registry import model_registry
+from app.schemas.models import ModelsOut
+from app.services.speech.asr_service import ASR_MODEL_ALIASES, AVAILABLE_ASR_MODELS, DEFAULT_WHISPER_MODEL
+from app.services.text.ai_summarize_service import AVAILABLE_MODELS, DEFAULT_MODEL, MODEL_ALIASES
+
+
+def list_models_action() -> ModelsOut:
+    """
+    Report selectable models per kind and what is loaded right now.
+    """
+    return ModelsOut(
+        summarizer={"default": DEFAULT_MODEL, "aliases": MODEL_ALIASES, "available": AVAILABLE_MODELS},
+        asr={"default": DEFAULT_WHISPER_MODEL, "aliases": ASR_MODEL_ALIASES, "available": AVAILABLE_ASR_MODELS},
+        registry=model_registry.stats(),
+    )
@@ -5,32 +5,54 @@ Controllers orchestrate endpoint-level behavior:
 - Map service results to response schemas
 """
 
+import os
+from typing import Iterator, List, Optional, Tuple
+
 from fastapi import HTTPException
 
+from app.controllers.errors import capacity_http_error, model_capacity_as_503
+from app.core.admission import admission, estimate_summary_cost
+from app.core.model_registry import ModelCapacityError
+from app.core.singleflight import SingleFlight, content_key
+from app.core.streaming import Emit, stream_events
 from app.schemas.summarize import (
+    BatchItemError,
     SummarizeIn,
     SummarizeOut,
     SummarizeAIIn,
     SummarizeAIOut,
+    SummarizeAIBatchIn,
+    SummarizeAIBatchOut,
+    SummarizeAIStatsOut,
+    SummarizeBatchIn,
+    SummarizeBatchOut,
+)
+from app.services.text.summarize_service import extractive_summaries, extractive_summary
+from app.services.text.ai_summarize_service import (
+    BATCH_MAX_SIZE,
+    PartialCallback,
+    batching_stats,
+    resolve_model,
+    summarize_ai_batch,
+    summarize_ai_text_detailed,
 )
-from app.services.text.summarize_service import extractive_summary
-from app.services.text.ai_summarize_service import summarize_ai_text
+from app.services.text.summary_cache import cache_stats
 
 # Global guardrail to prevent abuse and control latency.
-MAX_CHARS = 20000
+MAX_CHARS = int(os.getenv("AI_SUMMARY_MAX_CHARS", "20000"))
+# Max documents per /summarize/batch and /summarize/ai/batch request.
+BATCH_MAX_DOCUMENTS = int(os.getenv("SUMMARIZE_BATCH_MAX_DOCUMENTS", "100"))
+
+# Identical concurrent /summarize/ai requests share one model run.
+_ai_inflight = SingleFlight()
 
 
 def summarize_action(payload: SummarizeIn) -> SummarizeOut:
     """
     Extractive summarization controller.
     """
-    text = payload.text.strip()
-    if len(text) < 50:
-        raise HTTPException(status_code=400, detail="Text is too short (>= 50 chars required).")
-    if len(text) > MAX_CHARS:
-        raise HTTPException(status_code=413, detail=f"Text exceeds {MAX_CHARS} characters.")
-
-    chosen, total = extractive_summary(text, payload.ratio, payload.max_sentences)
+    text = validate_text(payload.text)
+    chosen, total = extractive_summary(text, payload.ratio, payload.max_sentences, payload.method)
     if not chosen:
         raise HTTPException(status_code=422, detail="Unable to produce a summary.")
 
@@ -39,30 +61,215 @@ def summarize_action(payload: SummarizeIn) -> SummarizeOut:
         summary=" ".join(chosen),
         ratio_used=payload.ratio,
         total_sentences=total,
+        method=payload.method,
+    )
+
+
+def summarize_batch_action(payload: SummarizeBatchIn) -> SummarizeBatchOut:
+    """
+    Extractive summarization of many documents in one pass; each document
+    succeeds or fails on its own (results keep the input order).
+    """
+    _check_batch_size(payload.documents)
+    results, valid = _validate_batch(payload.documents)
+
+    summaries = extractive_summaries(
+        [text for _, text in valid], payload.ratio, payload.max_sentences, payload.method
     )
+    for (i, _), (chosen, total) in zip(valid, summaries):
+        if not chosen:
+            results[i] = {"index": i, "error": BatchItemError(status_code=422, detail="Unable to produce a summary.")}
+            continue
+        results[i] = {
+            "index": i,
+            "result": SummarizeOut(
+                sentences=chosen,
+                summary=" ".join(chosen),
+                ratio_used=payload.ratio,
+                total_sentences=total,
+                method=payload.method,
+            ),
+        }
+    return SummarizeBatchOut(**_batch_counts(results))
 
 
 def summarize_ai_action(payload: SummarizeAIIn) -> SummarizeAIOut:
     """
     Abstractive (AI) summarization controller using free DistilBART.
+    Duplicate in-flight requests (same text and parameters) are coalesced;
+    only the leader is charged against the admission budget (503 when full).
+    """
+    text = validate_text(payload.text)
+    model = validate_summary_model(payload.model)
+    key = content_key("summarize_ai", text, model, payload.min_length, payload.max_length, payload.reduce_mode)
+
+    def run() -> SummarizeAIOut:
+        with admission.admit(estimate_summary_cost(len(text)), "summarization"):
+            return _run_summarize_ai(text, payload)
+
+    return _ai_inflight.do(key, run)
+
+
+def summarize_ai_stream_action(payload: SummarizeAIIn, fmt: str = "ndjson") -> Iterator[str]:
+    """
+    Streaming variant of `summarize_ai_action`.
+
+    Emits `partial_summary` events for each map-step chunk, then a `result`
+    event with the SummarizeAIOut payload (or an `error` event).
+    """
+    text = validate_text(payload.text)
+    validate_summary_model(payload.model)
+    # Admit before the response starts so overload is a plain 503.
+    ticket = admission.acquire(estimate_summary_cost(len(text)), "summarization")
+
+    def produce(emit: Emit) -> None:
+        try:
+            emit({"event": "started", "chars": len(text)})
+            result = _run_summarize_ai(
+                text,
+                payload,
+                on_partial=lambda i, partial: emit({"event": "partial_summary", "index": i, "summary": partial}),
+            )
+            emit({"event": "result", **result.model_dump()})
+        finally:
+            ticket.release()
+
+    return stream_events(produce, fmt)
+
+
+def summarize_ai_batch_action(payload: SummarizeAIBatchIn) -> SummarizeAIBatchOut:
+    """
+    Abstractive summarization of many documents: short documents share
+    length-sorted model batches. Each document succeeds or fails on its own
+    (results keep the input order).
+
+    Documents are admitted and run in sub-batches of AI_SUMMARY_BATCH_MAX_SIZE,
+    one after another, so a large batch holds one admission slot and at most
+    one sub-batch of budget at a time. A sub-batch's cost is capped at the
+    admission budget; documents of a sub-batch that is shed get a 503 item.
+    """
+    _check_batch_size(payload.documents)
+    model = validate_summary_model(payload.model)
+    results, valid = _validate_batch(payload.documents)
+
+    for start in range(0, len(valid), BATCH_MAX_SIZE):
+        group = valid[start:start + BATCH_MAX_SIZE]
+        texts = [text for _, text in group]
+        cost = min(estimate_summary_cost(sum(len(t) for t in texts)), admission.budget_seconds)
+        try:
+            with admission.admit(cost, "summarization"):
+                outcomes = summarize_ai_batch(
+                    texts, payload.min_length, payload.max_length, payload.reduce_mode, model
+                )
+        except HTTPException as exc:
+            outcomes = [exc] * len(group)
+
+        for (i, _), outcome in zip(group, outcomes):
+            if isinstance(outcome, Exception):
+                results[i] = {"index": i, "error": _item_error(outcome)}
+            elif not outcome[0]:
+                error = BatchItemError(status_code=422, detail="Unable to produce an AI summary.")
+                results[i] = {"index": i, "error": error}
+            else:
+                summary, info = outcome
+                result = _ai_result(summary, info, payload.min_length, payload.max_length)
+                results[i] = {"index": i, "result": result}
+    return SummarizeAIBatchOut(**_batch_counts(results))
+
+
+def validate_text(raw: str) -> str:
+    """
+    Apply the /summarize length guardrails and return the stripped text.
     """
-    text = payload.text.strip()
+    text = raw.strip()
     if len(text) < 50:
         raise HTTPException(status_code=400, detail="Text is too short (>= 50 chars required).")
     if len(text) > MAX_CHARS:
         raise HTTPException(status_code=413, detail=f"Text exceeds {MAX_CHARS} characters.")
+    return text
 
-    summary = summarize_ai_text(
-        text,
-        min_length=payload.min_length,
-        max_length=payload.max_length,
-    )
+
+def validate_summary_model(name: Optional[str]) -> str:
+    """
+    Resolve a requested summarization model or alias (400 if unknown).
+    """
+    try:
+        return resolve_model(name)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+def _run_summarize_ai(
+    text: str,
+    payload: SummarizeAIIn,
+    on_partial: Optional[PartialCallback] = None,
+) -> SummarizeAIOut:
+    with model_capacity_as_503():
+        summary, info = summarize_ai_text_detailed(
+            text,
+            min_length=payload.min_length,
+            max_length=payload.max_length,
+            reduce_mode=payload.reduce_mode,
+            on_partial=on_partial,
+            model=payload.model,
+        )
     if not summary:
         raise HTTPException(status_code=422, detail="Unable to produce an AI summary.")
+    return _ai_result(summary, info, payload.min_length, payload.max_length)
+
 
+def _ai_result(summary: str, info: dict, min_length: int, max_length: int) -> SummarizeAIOut:
     return SummarizeAIOut(
         summary=summary,
-        model_used="sshleifer/distilbart-cnn-12-6",
-        min_length=payload.min_length,
-        max_length=payload.max_length,
-    )
\ No newline at end of file
+        model_used=info["model"],
+        min_length=min_length,
+        max_length=max_length,
+        reduce_mode=info["reduce_mode"],
+        chunks=info["chunks"],
+        reduce_depth=info["reduce_depth"],
+        model_calls=info["model_calls"],
+        cached=info["cached"],
+        extracted_sentences=info["extracted_sentences"],
+    )
+
+
+def _check_batch_size(documents: List[str]) -> None:
+    if len(documents) > BATCH_MAX_DOCUMENTS:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {BATCH_MAX_DOCUMENTS} documents.")
+
+
+def _validate_batch(documents: List[str]) -> Tuple[List[Optional[dict]], List[Tuple[int, str]]]:
+    """Validate each document; returns (results with per-document errors filled in, [(index, text)] to process)."""
+    results: List[Optional[dict]] = [None] * len(documents)
+    valid: List[Tuple[int, str]] = []
+    for i, raw in enumerate(documents):
+        try:
+            valid.append((i, validate_text(raw)))
+        except HTTPException as exc:
+            results[i] = {"index": i, "error": _item_error(exc)}
+    return results, valid
+
+
+def _item_error(exc: Exception) -> BatchItemError:
+    if isinstance(exc, ModelCapacityError):
+        exc = capacity_http_error(exc)
+    if isinstance(exc, HTTPException):
+        retry_after = (exc.headers or {}).get("Retry-After")
+        return BatchItemError(
+            status_code=exc.status_code,
+            detail=str(exc.detail),
+            retry_after=int(retry_after) if retry_after and retry_after.isdigit() else None,
+        )
+    return BatchItemError(status_code=500, detail="Internal error while summarizing this document.")
+
+
+def _batch_counts(results: List[dict]) -> dict:
+    failed = sum(1 for r in results if r.get("error") is not None)
+    return {"results": results, "succeeded": len(results) - failed, "failed": failed}
+
+
+def summarize_ai_stats_action() -> SummarizeAIStatsOut:
+    """
+    Report micro-batching, cache and admission stats for the AI summarizer.
+    """
+    return SummarizeAIStatsOut(batching=batching_stats(), cache=cache_stats(), admission=admission.stats())
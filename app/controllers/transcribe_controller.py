@@ -4,93 +4,435 @@
 Controller for transcription workflows.
 
 - Accepts an MP4 upload.
-- Extracts audio (WAV) via ffmpeg.
-- Transcribes verbatim with Whisper (CPU).
-- Optionally summarizes the transcript using the local summarization pipeline.
+- Decodes audio in memory via ffmpeg (upload streamed to stdin, PCM read from stdout).
+- Transcribes verbatim with Whisper (CPU), with a selectable decoding profile
+  and an optional language hint; reports the real-time factor.
+- Optionally summarizes the transcript using the local summarization pipeline,
+  once the full-context transcript is complete. With TRANSCRIBE_OVERLAP_SUMMARY=1
+  (and always on the streaming endpoint) ASR runs by windows and the
+  summarizer's map step overlaps it.
 """
 
 from __future__ import annotations
 
 import os
-import shutil
-import tempfile
-from pathlib import Path
+import time
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple
 
 from fastapi import UploadFile, HTTPException
 
-from app.services.media.video_audio_service import extract_wav_from_mp4
-from app.services.speech.asr_service import transcribe_wav, DEFAULT_WHISPER_MODEL
-from app.services.text.ai_summarize_service import summarize_ai_text
+from app.controllers.errors import model_capacity_as_503
+from app.core.admission import admission, estimate_transcription_cost
+from app.core.executors import BoundedExecutor
+from app.core.metrics import stage
+from app.core.singleflight import SingleFlight, content_key, file_digest
+from app.core.streaming import Emit, stream_events
+from app.services.media.video_audio_service import (
+    audio_duration_seconds,
+    decode_audio_stream,
+    probe_media,
+)
+from app.services.speech.asr_service import (
+    PROFILE_COST_FACTORS,
+    STREAM_EVENT_WINDOW_SECONDS,
+    resolve_asr_model,
+    resolve_language,
+    resolve_profile,
+    stream_transcribe_audio,
+    transcribe_audio,
+)
+from app.services.text.ai_summarize_service import (
+    StreamingSummarizer,
+    model_label,
+    resolve_model,
+    summarize_ai_text_detailed,
+)
+
+if TYPE_CHECKING:
+    import numpy as np
 
 # Max duration safeguard for cheap tiers (in seconds).
 # Puedes ajustar el valor sin tocar código, solo cambiando la variable en Railway.
 MAX_VIDEO_DURATION_SECONDS = int(os.getenv("MAX_VIDEO_DURATION_SECONDS", "600"))  # 10 minutos por defecto
 
+# Dedicated pool for the blocking transcription pipeline (upload copy, ffmpeg,
+# Whisper, summary). Extra requests wait in a bounded queue, then get a 503.
+TRANSCRIBE_WORKERS = int(os.getenv("TRANSCRIBE_WORKERS", str(os.cpu_count() or 1)))
+TRANSCRIBE_MAX_QUEUE = int(os.getenv("TRANSCRIBE_MAX_QUEUE", "16"))
+transcribe_executor = BoundedExecutor("transcribe", TRANSCRIBE_WORKERS, TRANSCRIBE_MAX_QUEUE)
+
+# Producers of /transcribe/video/stream (ASR + summary after the response has
+# started). Their own pool, reserved before decoding: the setup step already
+# holds a `transcribe_executor` slot, so a second submit there could 503
+# mid-setup when that pool is full.
+TRANSCRIBE_STREAM_WORKERS = int(os.getenv("TRANSCRIBE_STREAM_WORKERS", str(TRANSCRIBE_WORKERS)))
+TRANSCRIBE_STREAM_MAX_QUEUE = int(os.getenv("TRANSCRIBE_STREAM_MAX_QUEUE", str(TRANSCRIBE_MAX_QUEUE)))
+transcribe_stream_executor = BoundedExecutor(
+    "transcribe-stream", TRANSCRIBE_STREAM_WORKERS, TRANSCRIBE_STREAM_MAX_QUEUE
+)
+
+# Overlap the summary with ASR by transcribing silence-cut windows (opt-in).
+# Windows are decoded without the previous window's text as context and the
+# language is detected on the first one, so the transcript can differ from
+# the default single full-context pass.
+OVERLAP_SUMMARY = os.getenv("TRANSCRIBE_OVERLAP_SUMMARY", "0") == "1"
+
+# Identical concurrent uploads (same bytes and parameters) share one pipeline run.
+_video_inflight = SingleFlight()
+
 
 def transcribe_video_action(
     file: UploadFile,
     do_summary: bool,
     min_length: int,
     max_length: int,
+    asr_model: Optional[str] = None,
+    summary_model: Optional[str] = None,
+    reduce_mode: Optional[str] = None,
+    asr_profile: Optional[str] = None,
+    language: Optional[str] = None,
 ) -> dict:
     """
     Orchestrate video transcription:
-      1) Persist MP4 to a temp file.
-      2) Extract WAV (mono/16k).
-      3) Transcribe with Whisper (verbatim).
-      4) Optionally summarize.
+      0) Pre-flight: probe duration/streams from the header and reject early.
+      1) Stream the upload into ffmpeg.
+      2) Decode mono/16k float32 PCM into memory.
+      3) Transcribe with Whisper (verbatim) using the `asr_profile` decoding
+         profile; a `language` hint skips language detection.
+      4) Optionally summarize (after the full transcript, or overlapping
+         windowed ASR with TRANSCRIBE_OVERLAP_SUMMARY=1;
+         `reduce_mode` as in /summarize/ai).
+
+    Duplicate in-flight requests (same file content and parameters) wait for
+    the first one instead of recomputing. The leader is admitted against the
+    cost budget using the probed duration (503 + Retry-After when full).
 
     Returns:
         dict payload matching TranscribeVideoOut schema.
     """
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmpdir_path = Path(tmpdir)
-        mp4_path = tmpdir_path / "input.mp4"
-
-        # 1) Save uploaded file
-        with mp4_path.open("wb") as f:
-            shutil.copyfileobj(file.file, f)
-
-        # 2) Extract WAV using ffmpeg
-        wav_path = tmpdir_path / "audio.wav"
-        wav_path, duration_seconds = extract_wav_from_mp4(mp4_path, wav_path)
-
-        # 2.1) Duration guard to avoid timeouts in production
-        if duration_seconds and duration_seconds > MAX_VIDEO_DURATION_SECONDS:
-            raise HTTPException(
-                status_code=413,
-                detail=(
-                    f"Video too long (~{int(duration_seconds)}s). "
-                    f"Max allowed is {MAX_VIDEO_DURATION_SECONDS} seconds for this plan."
-                ),
-            )
+    models = resolve_models(asr_model, summary_model)
+    decoding = resolve_decoding(asr_profile, language)
+    media = preflight_media(file)
+    cost = _estimate_cost(media, do_summary, decoding)
+    with stage("upload_hash"):
+        digest = file_digest(file.file)
+    key = content_key(
+        "transcribe_video", digest, *models, *decoding, do_summary, min_length, max_length, reduce_mode
+    )
 
-        # 3) Transcribe WAV (auto language detect)
-        transcript, language, _raw = transcribe_wav(wav_path)
+    def run() -> dict:
+        with admission.admit(cost, "transcription"), model_capacity_as_503():
+            return _run_transcription(file, do_summary, min_length, max_length, models, decoding, reduce_mode)
 
-        if not transcript.strip():
-            raise HTTPException(
-                status_code=422,
-                detail="No speech detected in the provided video.",
-            )
+    return _video_inflight.do(key, run)
+
+
+def resolve_models(asr_model: Optional[str], summary_model: Optional[str]) -> Tuple[str, str]:
+    """
+    Resolve requested Whisper and summarization models or aliases (400 if unknown).
+    """
+    try:
+        return resolve_asr_model(asr_model), resolve_model(summary_model)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+def resolve_decoding(asr_profile: Optional[str], language: Optional[str]) -> Tuple[str, Optional[str]]:
+    """
+    Resolve the Whisper decoding profile and language hint (400 if unknown).
+    """
+    try:
+        return resolve_profile(asr_profile), resolve_language(language)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+def preflight_media(file: UploadFile) -> dict:
+    """
+    Validate an upload before any decoding happens.
+
+    Raises:
+        HTTPException(400): the container cannot be read.
+        HTTPException(422): the video has no audio track.
+        HTTPException(413): the probed duration exceeds MAX_VIDEO_DURATION_SECONDS.
+    """
+    try:
+        media = probe_media(file.file)
+    except RuntimeError:
+        raise HTTPException(status_code=400, detail="Could not read the uploaded media file.")
+
+    if not media["has_audio"]:
+        raise HTTPException(status_code=422, detail="The uploaded video has no audio track.")
+
+    duration_seconds = media["duration_seconds"]
+    if duration_seconds and duration_seconds > MAX_VIDEO_DURATION_SECONDS:
+        raise HTTPException(
+            status_code=413,
+            detail=(
+                f"Video too long (~{int(duration_seconds)}s). "
+                f"Max allowed is {MAX_VIDEO_DURATION_SECONDS} seconds for this plan."
+            ),
+        )
+    return media
+
+
+def _run_transcription(
+    file: UploadFile,
+    do_summary: bool,
+    min_length: int,
+    max_length: int,
+    models: Tuple[str, str],
+    decoding: Tuple[str, Optional[str]],
+    reduce_mode: Optional[str] = None,
+) -> dict:
+    asr_model, summary_model = models
+    profile, language_hint = decoding
+    # 1-2) Decode audio straight from the upload (no temp files)
+    audio, duration_seconds = _decode_upload(file)
+
+    # 3-4) Transcribe PCM (auto language detect unless hinted) and optionally summarize.
+    # With OVERLAP_SUMMARY the map step of the summarizer overlaps windowed
+    # ASR; only the reduce waits for the last window.
+    summary_text = summary_seconds = None
+    overlap = do_summary and OVERLAP_SUMMARY
+    if overlap:
+        transcript, language, vad_stats, summary_text, asr_seconds, summary_seconds = _transcribe_and_summarize(
+            audio, do_summary, min_length, max_length, models, decoding, reduce_mode
+        )
+    else:
+        started = time.perf_counter()
+        transcript, language, raw = transcribe_audio(
+            audio, model=asr_model, profile=profile, language=language_hint
+        )
+        asr_seconds = time.perf_counter() - started
+        vad_stats = raw.get("vad") or {}
+
+    if not transcript.strip():
+        raise HTTPException(
+            status_code=422,
+            detail="No speech detected in the provided video.",
+        )
+
+    if do_summary and not overlap:
+        started = time.perf_counter()
+        summary_text, _info = summarize_ai_text_detailed(
+            transcript, min_length, max_length, reduce_mode, model=summary_model
+        )
+        summary_seconds = time.perf_counter() - started
+
+    return _build_result(
+        language, duration_seconds, transcript, summary_text, do_summary, vad_stats, models, decoding,
+        asr_seconds, summary_seconds,
+    )
 
-        # 4) Optional abstractive summary
-        summary_text = None
-        summary_model_id = None
-        if do_summary:
-            summary_text = summarize_ai_text(
-                transcript,
-                min_length=min_length,
-                max_length=max_length,
+
+def transcribe_video_stream_action(
+    file: UploadFile,
+    do_summary: bool,
+    min_length: int,
+    max_length: int,
+    fmt: str = "ndjson",
+    asr_model: Optional[str] = None,
+    summary_model: Optional[str] = None,
+    reduce_mode: Optional[str] = None,
+    asr_profile: Optional[str] = None,
+    language: Optional[str] = None,
+) -> Iterator[str]:
+    """
+    Streaming variant of `transcribe_video_action`.
+
+    Pre-flight and audio decoding run synchronously (the upload is only valid
+    during the request); ASR and summarization then run in a slot of the
+    stream executor, reserved before decoding, while events are streamed
+    (ASR always runs by windows here, as with TRANSCRIBE_OVERLAP_SUMMARY=1):
+      - `started` (duration and VAD stats), `segment` (per Whisper segment,
+        sent as soon as its ~ASR_STREAM_EVENT_WINDOW_SECONDS window is decoded),
+      - `partial_summary` (per map chunk), `result` (TranscribeVideoOut payload),
+      - or a final `error`.
+    """
+    models = resolve_models(asr_model, summary_model)
+    decoding = resolve_decoding(asr_profile, language)
+    media = preflight_media(file)
+    ticket = admission.acquire(_estimate_cost(media, do_summary, decoding), "transcription")
+    slot = None
+    try:
+        slot = transcribe_stream_executor.reserve()
+        audio, duration_seconds = _decode_upload(file)
+
+        def produce(emit: Emit) -> None:
+            try:
+                with model_capacity_as_503():
+                    transcript, language, vad_stats, summary_text, asr_seconds, summary_seconds = (
+                        _transcribe_and_summarize(
+                            audio, do_summary, min_length, max_length, models, decoding, reduce_mode,
+                            emit=emit, window_seconds=STREAM_EVENT_WINDOW_SECONDS,
+                        )
+                    )
+                if not transcript.strip():
+                    raise HTTPException(status_code=422, detail="No speech detected in the provided video.")
+                emit({
+                    "event": "result",
+                    **_build_result(
+                        language, duration_seconds, transcript, summary_text, do_summary, vad_stats, models,
+                        decoding, asr_seconds, summary_seconds,
+                    ),
+                })
+            finally:
+                ticket.release()
+
+        return stream_events(produce, fmt, submit=slot.submit)
+    except BaseException:
+        if slot is not None:
+            slot.cancel()
+        ticket.release()
+        raise
+
+
+def _estimate_cost(media: dict, do_summary: bool, decoding: Tuple[str, Optional[str]]) -> float:
+    # Containers without a probed duration are charged as if at the limit.
+    duration_seconds = media.get("duration_seconds") or MAX_VIDEO_DURATION_SECONDS
+    return estimate_transcription_cost(duration_seconds, do_summary, PROFILE_COST_FACTORS.get(decoding[0], 1.0))
+
+
+def _decode_upload(file: UploadFile) -> Tuple["np.ndarray", float]:
+    file.file.seek(0)
+    audio = decode_audio_stream(file.file)
+    duration_seconds = audio_duration_seconds(audio)
+
+    # Duration guard for containers whose duration could not be probed
+    if duration_seconds and duration_seconds > MAX_VIDEO_DURATION_SECONDS:
+        raise HTTPException(
+            status_code=413,
+            detail=(
+                f"Video too long (~{int(duration_seconds)}s). "
+                f"Max allowed is {MAX_VIDEO_DURATION_SECONDS} seconds for this plan."
+            ),
+        )
+    return audio, duration_seconds
+
+
+def _build_result(
+    language: str,
+    duration_seconds: float,
+    transcript: str,
+    summary_text: Optional[str],
+    do_summary: bool,
+    vad_stats: dict,
+    models: Tuple[str, str],
+    decoding: Tuple[str, Optional[str]],
+    asr_seconds: float,
+    summary_seconds: Optional[float] = None,
+) -> dict:
+    asr_model, summary_model = models
+    return {
+        "language": language,
+        "duration_seconds": float(duration_seconds),
+        "transcript": transcript,
+        "summary": summary_text,
+        "asr_model_used": f"whisper-{asr_model}-cpu",
+        "summary_model_used": model_label(summary_model) if do_summary else None,
+        "speech_seconds": vad_stats.get("speech_seconds"),
+        "speech_ratio": vad_stats.get("speech_ratio"),
+        "silence_ratio": round(1.0 - vad_stats["speech_ratio"], 4) if "speech_ratio" in vad_stats else None,
+        "asr_profile": decoding[0],
+        "realtime_factor": round(duration_seconds / asr_seconds, 2) if asr_seconds > 0 else None,
+        "summary_seconds": round(summary_seconds, 3) if summary_seconds is not None else None,
+    }
+
+
+def _transcribe_and_summarize(
+    audio: "np.ndarray",
+    do_summary: bool,
+    min_length: int,
+    max_length: int,
+    models: Tuple[str, str],
+    decoding: Tuple[str, Optional[str]],
+    reduce_mode: Optional[str] = None,
+    emit: Optional[Emit] = None,
+    window_seconds: Optional[float] = None,
+) -> Tuple[str, str, dict, Optional[str], float, Optional[float]]:
+    """
+    Pipelined ASR + summary: each decoded window is fed to a streaming
+    summarizer whose map step runs while the next windows are transcribed.
+    When `emit` is given, segments and partial summaries are reported as events.
+    `window_seconds` overrides the ASR window length (see `stream_transcribe_audio`).
+
+    Returns:
+        transcript, language, vad_stats, summary (None if no speech or no summary),
+        asr_seconds (wall time spent in the VAD and waiting for Whisper windows only),
+        summary_seconds (wall time spent feeding and finishing the summarizer,
+        including its model load; None without a summary)
+    """
+    asr_model, summary_model = models
+    profile, language_hint = decoding
+    started = time.perf_counter()
+    vad_stats, windows = stream_transcribe_audio(
+        audio, model=asr_model, profile=profile, language=language_hint, window_seconds=window_seconds
+    )
+    asr_seconds = time.perf_counter() - started
+    summary_seconds = 0.0
+    if emit:
+        emit({"event": "started", "duration_seconds": audio_duration_seconds(audio), **vad_stats})
+
+    summarizer = None
+    if do_summary:
+        on_partial = None
+        if emit:
+            on_partial = lambda i, partial: emit(  # noqa: E731
+                {"event": "partial_summary", "index": i, "summary": partial}
             )
-            # Ajusta al modelo real que estés usando internamente
-            summary_model_id = "t5-small"
-
-        return {
-            "language": language,
-            "duration_seconds": float(duration_seconds),
-            "transcript": transcript,
-            "summary": summary_text,
-            "asr_model_used": f"whisper-{DEFAULT_WHISPER_MODEL}-cpu",
-            "summary_model_used": summary_model_id,
-        }
\ No newline at end of file
+        summarizer = StreamingSummarizer(
+            min_length=min_length,
+            max_length=max_length,
+            reduce_mode=reduce_mode,
+            on_partial=on_partial,
+            model=summary_model,
+        )
+
+    texts: List[str] = []
+    language = language_hint or "unknown"
+    try:
+        while True:
+            started = time.perf_counter()
+            window = next(windows, None)
+            asr_seconds += time.perf_counter() - started
+            if window is None:
+                break
+            if language == "unknown":
+                language = window["language"]
+            if emit:
+                for seg in window["segments"]:
+                    emit({
+                        "event": "segment",
+                        "start": round(float(seg["start"]), 3),
+                        "end": round(float(seg["end"]), 3),
+                        "text": (seg.get("text") or "").strip(),
+                    })
+            if window["text"]:
+                texts.append(window["text"])
+                if summarizer:
+                    started = time.perf_counter()
+                    summarizer.feed(window["text"])
+                    summary_seconds += time.perf_counter() - started
+        transcript = " ".join(texts)
+        if summarizer is None or not transcript.strip():
+            return transcript, language, vad_stats, None, asr_seconds, None
+        started = time.perf_counter()
+        summary, _info = summarizer.finish()
+        summary_seconds += time.perf_counter() - started
+        return transcript, language, vad_stats, summary, asr_seconds, summary_seconds
+    finally:
+        if summarizer:
+            summarizer.close()
+
+
+def transcribe_stats_action() -> dict:
+    """
+    Report queue depth and worker-pool utilization of the transcription
+    and stream-producer executors, plus the shared admission budget.
+    """
+    return {
+        "executor": transcribe_executor.stats(),
+        "stream_executor": transcribe_stream_executor.stats(),
+        "admission": admission.stats(),
+    }
@@ -0,0 +1,192 @@
+"""
+Cost-aware admission control and load shedding for heavy endpoints.
+
+Each heavy request gets an estimated cost in CPU-seconds before it runs:
+- /summarize/ai: proportional to input characters,
+- /transcribe/video: proportional to probed audio duration (plus the summary).
+
+The estimated cost of in-flight work is tracked; a new request that would push
+it above the budget, or above ADMISSION_MAX_CONCURRENT requests in flight, is
+rejected at once with 503 and a Retry-After estimate, instead of piling up
+until everything times out. The concurrency cap keeps cheap but numerous
+requests from filling the shared threadpool that plain /summarize also uses.
+When nothing is in flight a request is always admitted, so a single large
+request can still run. Cheap endpoints (/health, extractive /summarize) never
+go through here.
+
+Work that must not be shed (in-process job workers) runs under
+`admission_exempt()`: it is always admitted but still counted, so it sheds
+interactive requests while it runs.
+
+Environment variables:
+- ADMISSION_ENABLED: enable load shedding (default: 1)
+- ADMISSION_CPU_BUDGET_SECONDS: max estimated CPU-seconds in flight (default: the
+  cost of one MAX_VIDEO_DURATION_SECONDS transcription with summary, plus 60 s
+  per CPU core; about 313 + 60 * cores with the defaults)
+- ADMISSION_MAX_CONCURRENT: max admitted requests in flight (default: 2 per CPU core, at most 32)
+- ADMISSION_AI_SECONDS_PER_1K_CHARS: cost model for abstractive summaries (default: 1.5)
+- ADMISSION_ASR_SECONDS_PER_AUDIO_SECOND: cost model for Whisper (default: 0.5)
+"""
+
+from __future__ import annotations
+
+import contextvars
+import math
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+
+from fastapi import HTTPException
+
+ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "1") == "1"
+AI_SECONDS_PER_1K_CHARS = float(os.getenv("ADMISSION_AI_SECONDS_PER_1K_CHARS", "1.5"))
+ASR_SECONDS_PER_AUDIO_SECOND = float(os.getenv("ADMISSION_ASR_SECONDS_PER_AUDIO_SECOND", "0.5"))
+
+# Rough speech rate used to estimate transcript length before ASR has run.
+_TRANSCRIPT_CHARS_PER_SECOND = 15.0
+
+_CPU_COUNT = os.cpu_count() or 1
+# Same setting as the /transcribe/video duration limit; sizes the default budget.
+_MAX_VIDEO_DURATION_SECONDS = float(os.getenv("MAX_VIDEO_DURATION_SECONDS", "600"))
+# Stays below the 40 threads of the shared anyio pool that sync routes run on.
+ADMISSION_MAX_CONCURRENT = int(os.getenv("ADMISSION_MAX_CONCURRENT", str(min(32, 2 * _CPU_COUNT))))
+
+_exempt: contextvars.ContextVar[bool] = contextvars.ContextVar("admission_exempt", default=False)
+
+
+def estimate_summary_cost(chars: int) -> float:
+    """Estimated CPU-seconds for an abstractive summary of `chars` characters."""
+    return chars / 1000.0 * AI_SECONDS_PER_1K_CHARS
+
+
+def estimate_transcription_cost(duration_seconds: float, do_summary: bool, asr_factor: float = 1.0) -> float:
+    """
+    Estimated CPU-seconds to transcribe (and optionally summarize) a video.
+    `asr_factor` scales the Whisper part (relative cost of the decoding profile).
+    """
+    cost = duration_seconds * ASR_SECONDS_PER_AUDIO_SECOND * asr_factor
+    if do_summary:
+        cost += estimate_summary_cost(int(duration_seconds * _TRANSCRIPT_CHARS_PER_SECOND))
+    return cost
+
+
+def _default_budget() -> float:
+    # Room for the longest accepted video plus a minute of other work per core,
+    # so one long transcription does not shed every summary request.
+    return estimate_transcription_cost(_MAX_VIDEO_DURATION_SECONDS, do_summary=True) + 60.0 * _CPU_COUNT
+
+
+ADMISSION_CPU_BUDGET_SECONDS = float(os.getenv("ADMISSION_CPU_BUDGET_SECONDS") or _default_budget())
+
+
+class Ticket:
+    """
+    Handle for admitted work; `release()` returns its cost to the budget (idempotent).
+    `counted` is False for tickets that bypassed the controller (nothing to return).
+    """
+
+    def __init__(self, controller: "AdmissionController", cost: float, counted: bool = True) -> None:
+        self._controller = controller
+        self.cost = cost
+        self.counted = counted
+        self._released = False
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._controller._release(self)
+
+
+class AdmissionController:
+    """Tracks estimated in-flight cost against a CPU-seconds budget and a concurrency cap."""
+
+    def __init__(self, budget_seconds: float, drain_rate: float, max_concurrent: int) -> None:
+        self.budget_seconds = budget_seconds
+        self.max_concurrent = max(1, max_concurrent)
+        # CPU-seconds completed per wall-second (roughly the number of cores).
+        self.drain_rate = max(1.0, drain_rate)
+        self._lock = threading.Lock()
+        self._in_flight_cost = 0.0
+        self._in_flight = 0
+        self._admitted = 0
+        self._rejected = 0
+
+    def acquire(self, cost: float, label: str) -> Ticket:
+        """
+        Reserve `cost` CPU-seconds or shed the request. Exempt work
+        (`admission_exempt()`) is always admitted but still counted.
+
+        Raises:
+            HTTPException(503): with a Retry-After header when over budget
+                or at the concurrency cap.
+        """
+        if not ADMISSION_ENABLED:
+            return Ticket(self, 0.0, counted=False)
+
+        with self._lock:
+            overflow = self._in_flight_cost + cost - self.budget_seconds
+            full = overflow > 0 or self._in_flight >= self.max_concurrent
+            if self._in_flight and full and not _exempt.get():
+                self._rejected += 1
+                # At the cap: wait for roughly one average request to finish.
+                backlog = max(overflow, self._in_flight_cost / self._in_flight)
+                retry_after = max(1, min(300, math.ceil(backlog / self.drain_rate)))
+                raise HTTPException(
+                    status_code=503,
+                    detail=f"Server is at capacity for {label} requests. Please retry later.",
+                    headers={"Retry-After": str(retry_after)},
+                )
+            self._in_flight_cost += cost
+            self._in_flight += 1
+            self._admitted += 1
+        return Ticket(self, cost)
+
+    @contextmanager
+    def admit(self, cost: float, label: str) -> Iterator[Ticket]:
+        """Context-manager form of `acquire`; releases the cost on exit."""
+        ticket = self.acquire(cost, label)
+        try:
+            yield ticket
+        finally:
+            ticket.release()
+
+    def _release(self, ticket: Ticket) -> None:
+        # Every counted ticket incremented `_in_flight`, whatever its cost
+        # (a probed duration of 0 gives cost 0.0), so always decrement it.
+        if not ticket.counted:
+            return
+        with self._lock:
+            self._in_flight_cost = max(0.0, self._in_flight_cost - ticket.cost)
+            self._in_flight = max(0, self._in_flight - 1)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": ADMISSION_ENABLED,
+                "budget_seconds": self.budget_seconds,
+                "max_concurrent": self.max_concurrent,
+                "in_flight_cost_seconds": round(self._in_flight_cost, 3),
+                "in_flight_requests": self._in_flight,
+                "admitted": self._admitted,
+                "rejected": self._rejected,
+            }
+
+
+@contextmanager
+def admission_exempt() -> Iterator[None]:
+    """
+    Never shed work in this context (e.g. job workers, whose concurrency is
+    already bounded by the job queue and which would fail on a 503). Its cost
+    still counts against the budget and the concurrency cap.
+    """
+    token = _exempt.set(True)
+    try:
+        yield
+    finally:
+        _exempt.reset(token)
+
+
+admission = AdmissionController(
+    ADMISSION_CPU_BUDGET_SECONDS, drain_rate=_CPU_COUNT, max_concurrent=ADMISSION_MAX_CONCURRENT
+)
@@ -5,6 +5,30 @@ Environment variables (optional):
 - AI_SUMMARY_MODEL: override the default HF model (default: sshleifer/distilbart-cnn-12-6)
 - AI_SUMMARY_MAX_INPUT_TOKENS: token limit used to chunk long inputs (default: 900)
 - AI_SUMMARY_SENT_OVERLAP: sentence overlap between chunks (default: 1)
+- AI_SUMMARY_BATCHING: enable cross-request micro-batching (default: 1)
+- AI_SUMMARY_BATCH_MAX_SIZE: max blocks per padded batch (default: 8)
+- AI_SUMMARY_BATCH_MAX_WAIT_MS: how long to collect blocks before running (default: 20)
+- AI_SUMMARY_BATCH_LENGTH_BUCKET: token-length bucket width for grouping (default: 128)
+- AI_SUMMARY_MAP_BATCH_SIZE: chunks per batch in the map step of long inputs (default: 4)
+- AI_SUMMARY_REDUCE_MODE: "tree" (hierarchical reduce), "flat" (single reduce pass) or "hybrid"
+  (extractive pre-selection into one window, single model pass) (default: tree)
+- AI_SUMMARY_MAX_REDUCE_DEPTH: safety cap on reduce levels in tree mode (default: 6)
+- AI_SUMMARY_CACHE, AI_SUMMARY_CACHE_MAX_BYTES, AI_SUMMARY_CACHE_TTL_SECONDS, AI_SUMMARY_CACHE_DB:
+  summary cache settings (see app/services/text/summary_cache.py)
+- AI_SUMMARY_QUANTIZE, AI_SUMMARY_QUANTIZED_DIR: dynamic int8 quantization of the summarizer
+  (see app/services/text/quantization.py)
+- TORCH_INTRA_OP_THREADS, TORCH_INTER_OP_THREADS: torch CPU thread pools (see app/core/torch_runtime.py)
+- AI_SUMMARY_MODELS: per-request summarization models as "alias=model" pairs
+  (default: fast=t5-small,quality=sshleifer/distilbart-cnn-12-6)
+- MODEL_MEMORY_BUDGET_MB, MODEL_IDLE_TTL_SECONDS: model registry RAM budget and idle eviction
+  (see app/core/model_registry.py)
+- PRELOAD_MODELS, WARMUP_ON_STARTUP, WARMUP_MODELS: model preloading (serve.py) and startup
+  warmup gating /ready (see app/core/warmup.py)
+- AI_SUMMARY_MAX_CHARS: input length guardrail for /summarize endpoints (default: 20000)
+- SUMMARIZE_BATCH_MAX_DOCUMENTS: max documents per /summarize/batch and /summarize/ai/batch (default: 100)
+- ASR_PROFILE: default Whisper decoding profile, "fast", "balanced" or "accurate" (default: balanced)
+- METRICS_ENABLED, SERVER_TIMING_ENABLED: stage timers, /metrics and the Server-Timing header
+  (see app/core/metrics.py)
 """
 
 from pydantic import BaseModel
@@ -0,0 +1,167 @@
+"""
+Bounded worker pools for CPU-heavy pipelines called from async routes.
+
+The event loop only awaits the submitted job; the work itself runs on a
+dedicated ThreadPoolExecutor so /health and other routes stay responsive.
+Submissions beyond `max_queue` waiting jobs are rejected with HTTP 503.
+`reserve()` claims a slot up front, for work that only becomes ready after
+some setup (so the 503 happens before the setup, not after it).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from fastapi import HTTPException
+
+T = TypeVar("T")
+
+
+class BoundedExecutor:
+    """
+    A named thread pool with a bounded backlog and utilization counters.
+    The pool is created lazily on first use (safe to import before forking).
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int) -> None:
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._busy_seconds = 0.0
+        self._started_at = time.monotonic()
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.name)
+                self._started_at = time.monotonic()
+            return self._pool
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run `fn(*args, **kwargs)` on the pool and await its result.
+        Context variables are propagated to the worker thread.
+
+        Raises:
+            HTTPException(503): if the backlog is already full.
+        """
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def submit(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> "Future[T]":
+        """
+        Synchronous counterpart of `run`: schedule the call and return its Future.
+
+        Raises:
+            HTTPException(503): if the backlog is already full.
+        """
+        self._claim()
+        return self._start(fn, *args, **kwargs)
+
+    def reserve(self) -> "Reservation":
+        """
+        Claim a backlog slot now and run work in it later (`Reservation.submit`).
+        The slot counts as queued until then; `Reservation.cancel()` gives it back.
+
+        Raises:
+            HTTPException(503): if the backlog is already full.
+        """
+        self._claim()
+        return Reservation(self)
+
+    def _claim(self) -> None:
+        with self._lock:
+            if self._queued + self._running >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise HTTPException(
+                    status_code=503,
+                    detail=f"Server busy ({self.name} queue is full). Please retry later.",
+                    headers={"Retry-After": "30"},
+                )
+            self._queued += 1
+
+    def _unclaim(self) -> None:
+        with self._lock:
+            self._queued -= 1
+
+    def _start(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> "Future[T]":
+        call = functools.partial(self._tracked, functools.partial(fn, *args, **kwargs))
+        ctx = contextvars.copy_context()
+        future = self._get_pool().submit(ctx.run, call)
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, future: Any) -> None:
+        # A job cancelled before it started never reaches `_tracked`.
+        if future.cancelled():
+            self._unclaim()
+
+    def _tracked(self, call: Callable[[], T]) -> T:
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+        started = time.perf_counter()
+        ok = False
+        try:
+            result = call()
+            ok = True
+            return result
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._busy_seconds += time.perf_counter() - started
+                if ok:
+                    self._completed += 1
+                else:
+                    self._failed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of queue depth and worker utilization."""
+        with self._lock:
+            uptime = max(time.monotonic() - self._started_at, 1e-9)
+            return {
+                "name": self.name,
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queued": self._queued,
+                "running": self._running,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "busy_seconds": round(self._busy_seconds, 3),
+                "utilization": round(self._running / self.max_workers, 3),
+                "avg_utilization": round(min(1.0, self._busy_seconds / (uptime * self.max_workers)), 3),
+            }
+
+
+class Reservation:
+    """A claimed `BoundedExecutor` slot; use it once with `submit`, or `cancel` it."""
+
+    def __init__(self, executor: BoundedExecutor) -> None:
+        self._executor = executor
+        self._used = False
+
+    def submit(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> "Future[T]":
+        """Run `fn(*args, **kwargs)` in the reserved slot (never rejected)."""
+        if self._used:
+            raise RuntimeError("Reservation already used.")
+        self._used = True
+        return self._executor._start(fn, *args, **kwargs)
+
+    def cancel(self) -> None:
+        """Give the slot back if it was not used (idempotent)."""
+        if not self._used:
+            self._used = True
+            self._executor._unclaim()
@@ -0,0 +1,74 @@
+"""
+Request body size limits for upload endpoints.
+
+The limit is enforced while the body is still streaming in: requests that
+declare a larger Content-Length are rejected before reading anything, and
+chunked uploads are cut off as soon as they cross the limit.
+
+Environment variables:
+- MAX_UPLOAD_BYTES: maximum upload size in bytes (default: 209715200 = 200 MiB)
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Iterable, Tuple
+
+from fastapi import FastAPI, HTTPException
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(200 * 1024 * 1024)))
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Pure ASGI middleware limiting request bodies on selected path prefixes.
+    """
+
+    def __init__(self, app: ASGIApp, max_bytes: int, path_prefixes: Iterable[str]) -> None:
+        self.app = app
+        self.max_bytes = max_bytes
+        self.path_prefixes: Tuple[str, ...] = tuple(path_prefixes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        detail = f"Upload exceeds the maximum allowed size of {self.max_bytes} bytes."
+        for name, value in scope.get("headers", []):
+            if name == b"content-length":
+                try:
+                    declared = int(value)
+                except ValueError:
+                    break
+                if declared > self.max_bytes:
+                    await JSONResponse({"detail": detail}, status_code=413)(scope, receive, send)
+                    return
+                break
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # Raised inside body parsing; FastAPI re-raises HTTPException as-is.
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+def setup_upload_limit(app: FastAPI, path_prefixes: Iterable[str] = ("/transcribe",)) -> None:
+    """
+    Install the upload size limit for the given path prefixes.
+    """
+    app.add_middleware(
+        UploadSizeLimitMiddleware,
+        max_bytes=MAX_UPLOAD_BYTES,
+        path_prefixes=tuple(path_prefixes),
+    )
@@ -0,0 +1,224 @@
+"""
+Lightweight in-process metrics: per-stage timers, counters and histograms.
+
+- `with stage("ffprobe"):` times a pipeline stage into the
+  `smart_ai_stage_seconds{stage="..."}` histogram.
+- `inc(...)` / `observe(...)` record the other metrics (chunks per document,
+  model tokens in/out, audio seconds and real-time factor of Whisper).
+- `render()` produces the Prometheus text exposition format (served on
+  /metrics); no client library is needed.
+- Server-Timing: with SERVER_TIMING_ENABLED=1 the stages timed while serving
+  a request are also added to its `Server-Timing` response header. Timings are
+  collected through a context variable, which the executors propagate to
+  their worker threads. Streaming responses send headers before the work
+  runs, so they only carry the stages finished by then.
+
+The cost per stage is two perf_counter() calls and a short locked bucket
+update, cheap enough to leave on; METRICS_ENABLED=0 turns recording off.
+Values are per process: with WEB_CONCURRENCY > 1 each worker reports its own.
+
+Environment variables:
+- METRICS_ENABLED: record metrics and serve /metrics (default: 1)
+- SERVER_TIMING_ENABLED: add a Server-Timing header to responses (default: 0)
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from fastapi import FastAPI
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "0") == "1"
+
+PREFIX = "smart_ai_"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+_CHUNK_BUCKETS = (1, 2, 3, 4, 6, 8, 12, 16, 24, 32, 64)
+_REALTIME_BUCKETS = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 64.0)
+_LE_INF = 'le="+Inf"'
+
+# name -> (type, help, buckets, label names)
+_DEFINITIONS: Dict[str, Tuple[str, str, Tuple[float, ...], Tuple[str, ...]]] = {
+    "stage_seconds": ("histogram", "Wall time of pipeline stages.", _SECONDS_BUCKETS, ("stage",)),
+    "summary_chunks": ("histogram", "Token-aware chunks per summarized document.", _CHUNK_BUCKETS, ()),
+    "summary_tokens_in_total": ("counter", "Tokens fed to the summarization model.", (), ("model",)),
+    "summary_tokens_out_total": ("counter", "Tokens generated by the summarization model.", (), ("model",)),
+    "asr_audio_seconds_total": ("counter", "Seconds of audio transcribed.", (), ("model",)),
+    "asr_realtime_factor": (
+        "histogram", "Audio seconds transcribed per wall-clock second of Whisper decoding.", _REALTIME_BUCKETS, ("model",)
+    ),
+}
+
+# Stage timings of the current request: [(stage, seconds)], None outside requests.
+_request_timings: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("request_timings", default=None)
+
+
+@dataclass
+class _Series:
+    value: float = 0.0  # counter value or histogram sum
+    count: int = 0
+    buckets: List[int] = field(default_factory=list)
+
+
+class _Timer:
+    __slots__ = ("seconds",)
+
+    def __init__(self) -> None:
+        self.seconds = 0.0
+
+
+class Metrics:
+    """Thread-safe store for the metrics declared in `_DEFINITIONS`."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, Tuple[str, ...]], _Series] = {}
+
+    def inc(self, name: str, value: float = 1.0, *labels: str) -> None:
+        with self._lock:
+            series = self._get(name, labels)
+            series.value += value
+
+    def observe(self, name: str, value: float, *labels: str) -> None:
+        buckets = _DEFINITIONS[name][2]
+        index = bisect_left(buckets, value)
+        with self._lock:
+            series = self._get(name, labels)
+            series.value += value
+            series.count += 1
+            if index < len(buckets):
+                series.buckets[index] += 1
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            snapshot = {key: (s.value, s.count, list(s.buckets)) for key, s in self._series.items()}
+        lines: List[str] = []
+        for name, (kind, help_text, bounds, label_names) in _DEFINITIONS.items():
+            full = PREFIX + name
+            lines += [f"# HELP {full} {help_text}", f"# TYPE {full} {kind}"]
+            for (metric, labels), (value, count, buckets) in sorted(snapshot.items()):
+                if metric != name:
+                    continue
+                pairs = [f'{k}="{_escape(v)}"' for k, v in zip(label_names, labels)]
+                if kind == "counter":
+                    lines.append(f"{full}{_labels(pairs)} {_number(value)}")
+                    continue
+                cumulative = 0
+                for bound, n in zip(bounds, buckets):
+                    cumulative += n
+                    le = 'le="%s"' % _number(bound)
+                    lines.append(f"{full}_bucket{_labels(pairs + [le])} {cumulative}")
+                lines.append(f"{full}_bucket{_labels(pairs + [_LE_INF])} {count}")
+                lines.append(f"{full}_sum{_labels(pairs)} {_number(value)}")
+                lines.append(f"{full}_count{_labels(pairs)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def _get(self, name: str, labels: Tuple[str, ...]) -> _Series:
+        # Caller holds the lock.
+        key = (name, labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = _Series(buckets=[0] * len(_DEFINITIONS[name][2]))
+        return series
+
+
+def _labels(pairs: List[str]) -> str:
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+metrics = Metrics()
+
+
+def inc(name: str, value: float = 1.0, *labels: str) -> None:
+    """Add `value` to a counter (no-op when METRICS_ENABLED=0)."""
+    if METRICS_ENABLED:
+        metrics.inc(name, value, *labels)
+
+
+def observe(name: str, value: float, *labels: str) -> None:
+    """Record one histogram sample (no-op when METRICS_ENABLED=0)."""
+    if METRICS_ENABLED:
+        metrics.observe(name, value, *labels)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[_Timer]:
+    """
+    Time a block as pipeline stage `name`. The yielded timer holds the
+    elapsed seconds once the block exits (also when it raises).
+    """
+    timer = _Timer()
+    started = time.perf_counter()
+    try:
+        yield timer
+    finally:
+        timer.seconds = time.perf_counter() - started
+        if METRICS_ENABLED:
+            metrics.observe("stage_seconds", timer.seconds, name)
+            timings = _request_timings.get()
+            if timings is not None:
+                timings.append((name, timer.seconds))
+
+
+def server_timing(timings: List[Tuple[str, float]]) -> str:
+    """Format stage timings as a Server-Timing header value (repeated stages are summed)."""
+    totals: Dict[str, float] = {}
+    for name, seconds in timings:
+        totals[name] = totals.get(name, 0.0) + seconds
+    return ", ".join(f"{name};dur={seconds * 1000:.1f}" for name, seconds in totals.items())
+
+
+class ServerTimingMiddleware:
+    """
+    Pure ASGI middleware collecting stage timings per request and adding
+    them to the response as a `Server-Timing` header.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings: List[Tuple[str, float]] = []
+        token = _request_timings.set(timings)
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start" and timings:
+                MutableHeaders(scope=message).append("Server-Timing", server_timing(timings))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_timings.reset(token)
+
+
+def setup_server_timing(app: FastAPI) -> None:
+    """
+    Install the Server-Timing middleware when SERVER_TIMING_ENABLED=1 (and metrics are on).
+    """
+    if METRICS_ENABLED and SERVER_TIMING_ENABLED:
+        app.add_middleware(ServerTimingMiddleware)
@@ -0,0 +1,264 @@
+"""
+Process-wide registry of loaded models (summarizers, Whisper sizes).
+
+- Each model kind registers a loader; models are loaded on first use and
+  concurrent requests for the same model share one load.
+- Loads respect a RAM budget: before loading, least recently used idle models
+  are evicted until the new model (estimated from a size hint) fits; the
+  measured parameter size replaces the hint once loaded.
+- Models idle for longer than the TTL are evicted on the next registry access
+  and by a background sweeper.
+- Models in use (`with registry.use(...)`) are never evicted; when the budget
+  cannot be met without evicting them the load raises ModelCapacityError
+  (controllers answer it with a 503).
+- Preloaded models (`registry.preload(...)`, e.g. loaded before forking
+  workers) are pinned and never evicted, so forked workers keep sharing them.
+
+Budgets only count weights; leave headroom for activations and the rest of
+the process when setting MODEL_MEMORY_BUDGET_MB.
+
+Environment variables:
+- MODEL_MEMORY_BUDGET_MB: RAM for loaded model weights; 0 means unlimited (default: 0)
+- MODEL_IDLE_TTL_SECONDS: evict models unused for this long; 0 disables (default: 0)
+"""
+
+from __future__ import annotations
+
+import gc
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from app.core.metrics import stage
+from app.core.singleflight import SingleFlight
+
+MODEL_MEMORY_BUDGET_MB = float(os.getenv("MODEL_MEMORY_BUDGET_MB", "0"))
+MODEL_IDLE_TTL_SECONDS = float(os.getenv("MODEL_IDLE_TTL_SECONDS", "0"))
+
+_MB = 1024 * 1024
+# Used when a kind has no size hint for a model.
+_DEFAULT_SIZE_HINT_MB = 500.0
+
+# Suggested wait before retrying a load refused for lack of memory.
+_CAPACITY_RETRY_SECONDS = 30
+
+Loader = Callable[[str], Any]
+Sizer = Callable[[Any], int]
+
+
+class ModelCapacityError(RuntimeError):
+    """
+    A model cannot be loaded now without evicting models in use (transient).
+    `retry_after` is a suggested wait in seconds.
+    """
+
+    def __init__(self, message: str, retry_after: int = _CAPACITY_RETRY_SECONDS) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def parse_model_aliases(raw: str) -> Dict[str, str]:
+    """
+    Parse "alias=model,alias2=model2" into a dict. Bare entries map to themselves.
+    """
+    aliases: Dict[str, str] = {}
+    for item in raw.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        alias, _, model = item.partition("=")
+        alias, model = alias.strip(), (model.strip() or alias.strip())
+        aliases[alias] = model
+    return aliases
+
+
+def torch_module_bytes(module: Any) -> int:
+    """Bytes held by the parameters and buffers of a torch module."""
+    tensors = list(module.parameters()) + list(module.buffers())
+    return sum(t.numel() * t.element_size() for t in tensors)
+
+
+@dataclass
+class _Kind:
+    loader: Loader
+    sizer: Sizer
+    size_hints_mb: Dict[str, float]
+
+
+@dataclass
+class _Entry:
+    value: Any
+    size_bytes: int
+    last_used: float
+    in_use: int = 0
+    pinned: bool = False
+
+
+class ModelRegistry:
+    """Loads models on demand and keeps them within a memory budget."""
+
+    def __init__(self, budget_mb: float, idle_ttl_seconds: float) -> None:
+        self.budget_bytes = int(budget_mb * _MB)
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self._kinds: Dict[str, _Kind] = {}
+        self._entries: "OrderedDict[Tuple[str, str], _Entry]" = OrderedDict()
+        self._reserved = 0  # bytes reserved by loads in progress
+        self._lock = threading.Lock()
+        self._loads = SingleFlight()
+        self._sweeper: Optional[threading.Thread] = None
+        self._load_count = 0
+        self._evictions = 0
+
+    def register(
+        self,
+        kind: str,
+        loader: Loader,
+        sizer: Sizer,
+        size_hints_mb: Optional[Dict[str, float]] = None,
+    ) -> None:
+        """Declare how models of `kind` are loaded and measured."""
+        self._kinds[kind] = _Kind(loader, sizer, dict(size_hints_mb or {}))
+
+    def get(self, kind: str, name: str) -> Any:
+        """Return the loaded model (loading it if needed) without pinning it."""
+        with self.use(kind, name) as value:
+            return value
+
+    @contextmanager
+    def use(self, kind: str, name: str) -> Iterator[Any]:
+        """Pin the model for the duration of the block so it cannot be evicted."""
+        entry = self._acquire(kind, name)
+        try:
+            yield entry.value
+        finally:
+            with self._lock:
+                entry.in_use -= 1
+                entry.last_used = time.monotonic()
+
+    def preload(self, kind: str, name: str) -> None:
+        """Load a model now and pin it in memory (exempt from LRU/TTL eviction)."""
+        entry = self._acquire(kind, name)
+        with self._lock:
+            entry.pinned = True
+            entry.in_use -= 1
+
+    def loaded(self, kind: str, name: str) -> bool:
+        with self._lock:
+            return (kind, name) in self._entries
+
+    def evict_idle(self) -> int:
+        """Evict models idle for longer than the TTL. Returns how many were evicted."""
+        if self.idle_ttl_seconds <= 0:
+            return 0
+        cutoff = time.monotonic() - self.idle_ttl_seconds
+        with self._lock:
+            expired = [
+                k for k, e in self._entries.items() if e.in_use == 0 and not e.pinned and e.last_used < cutoff
+            ]
+            for key in expired:
+                self._drop(key)
+        if expired:
+            gc.collect()
+        return len(expired)
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            models: List[Dict[str, Any]] = [
+                {
+                    "kind": kind,
+                    "name": name,
+                    "size_mb": round(e.size_bytes / _MB, 1),
+                    "in_use": e.in_use,
+                    "pinned": e.pinned,
+                    "idle_seconds": round(now - e.last_used, 1),
+                }
+                for (kind, name), e in self._entries.items()
+            ]
+            return {
+                "budget_mb": round(self.budget_bytes / _MB, 1) if self.budget_bytes else None,
+                "used_mb": round(self._used_bytes() / _MB, 1),
+                "idle_ttl_seconds": self.idle_ttl_seconds or None,
+                "loads": self._load_count,
+                "evictions": self._evictions,
+                "models": models,
+            }
+
+    # ---------- internals ----------
+    def _acquire(self, kind: str, name: str) -> _Entry:
+        self.evict_idle()
+        key = (kind, name)
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.in_use += 1
+                    entry.last_used = time.monotonic()
+                    self._entries.move_to_end(key)
+                    return entry
+            self._loads.do(f"{kind}:{name}", lambda: self._load(kind, name))
+
+    def _load(self, kind: str, name: str) -> None:
+        spec = self._kinds[kind]
+        hint = int(spec.size_hints_mb.get(name, _DEFAULT_SIZE_HINT_MB) * _MB)
+        with self._lock:
+            if (kind, name) in self._entries:
+                return
+            evictions = self._evictions
+            self._make_room(hint, f"{kind} model '{name}'")
+            self._reserved += hint
+            evicted = self._evictions > evictions
+        if evicted:
+            gc.collect()
+        try:
+            with stage("model_load"):
+                value = spec.loader(name)
+            size = spec.sizer(value)
+        finally:
+            with self._lock:
+                self._reserved -= hint
+        with self._lock:
+            self._entries[(kind, name)] = _Entry(value, size, time.monotonic())
+            self._load_count += 1
+        self._ensure_sweeper()
+
+    def _make_room(self, needed: int, label: str) -> None:
+        # Caller holds the lock.
+        if not self.budget_bytes:
+            return
+        for key in [k for k, e in self._entries.items() if e.in_use == 0 and not e.pinned]:
+            if self._used_bytes() + self._reserved + needed <= self.budget_bytes:
+                return
+            self._drop(key)
+        busy = self._used_bytes() + self._reserved
+        if busy and busy + needed > self.budget_bytes:
+            raise ModelCapacityError(f"Not enough model memory to load the {label} right now. Please retry later.")
+
+    def _drop(self, key: Tuple[str, str]) -> None:
+        # Caller holds the lock; memory is freed once running requests drop their references.
+        del self._entries[key]
+        self._evictions += 1
+
+    def _used_bytes(self) -> int:
+        return sum(e.size_bytes for e in self._entries.values())
+
+    def _ensure_sweeper(self) -> None:
+        if self.idle_ttl_seconds <= 0:
+            return
+        with self._lock:
+            if self._sweeper is None or not self._sweeper.is_alive():
+                self._sweeper = threading.Thread(target=self._sweep, name="model-sweeper", daemon=True)
+                self._sweeper.start()
+
+    def _sweep(self) -> None:
+        interval = max(1.0, self.idle_ttl_seconds / 4)
+        while True:
+            time.sleep(interval)
+            self.evict_idle()
+
+
+model_registry = ModelRegistry(MODEL_MEMORY_BUDGET_MB, MODEL_IDLE_TTL_SECONDS)
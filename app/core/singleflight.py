@@ -0,0 +1,79 @@
+"""
+In-flight request coalescing ("single-flight").
+
+Identical concurrent calls share one execution: the first caller for a key
+runs the function, later callers with the same key block on its Future and
+receive the same result (or the same exception).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from concurrent.futures import Future
+from typing import Any, BinaryIO, Callable, Dict, TypeVar
+
+T = TypeVar("T")
+
+_HASH_BLOCK = 1024 * 1024
+
+
+def content_key(*parts: Any) -> str:
+    """SHA-256 over the string form of `parts` (text, parameters, digests)."""
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(str(part).encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+def file_digest(fileobj: BinaryIO) -> str:
+    """SHA-256 of a seekable file object; the read position is restored to 0."""
+    h = hashlib.sha256()
+    fileobj.seek(0)
+    for block in iter(lambda: fileobj.read(_HASH_BLOCK), b""):
+        h.update(block)
+    fileobj.seek(0)
+    return h.hexdigest()
+
+
+class SingleFlight:
+    """Deduplicate concurrent calls that share the same key."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        """
+        Run `fn` once per key among concurrent callers.
+
+        The leader executes `fn`; followers wait for its outcome. The key is
+        released as soon as the leader finishes, so later requests recompute.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def in_flight(self) -> int:
+        """Number of distinct keys currently executing."""
+        with self._lock:
+            return len(self._calls)
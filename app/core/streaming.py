@@ -0,0 +1,101 @@
+"""
+Helpers for progress streaming as NDJSON or server-sent events (SSE).
+
+A blocking producer runs on a worker thread and calls `emit(event)` for each
+progress event; the HTTP response iterates the events as they arrive.
+Every event is a dict with an `event` key (e.g. "segment", "partial_summary",
+"result", "error").
+"""
+
+from __future__ import annotations
+
+import json
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from fastapi import HTTPException
+
+Event = Dict[str, Any]
+Emit = Callable[[Event], None]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "sse": "text/event-stream",
+}
+
+_DONE = object()
+
+
+class StreamClosed(Exception):
+    """Raised inside the producer when the client stopped reading."""
+
+
+def format_event(event: Event, fmt: str) -> str:
+    """Serialize one event as an NDJSON line or an SSE frame."""
+    data = json.dumps(event, ensure_ascii=False, default=str)
+    if fmt == "sse":
+        return f"event: {event.get('event', 'message')}\ndata: {data}\n\n"
+    return data + "\n"
+
+
+def _error_event(exc: BaseException) -> Event:
+    if isinstance(exc, HTTPException):
+        return {"event": "error", "status_code": exc.status_code, "detail": exc.detail}
+    return {"event": "error", "status_code": 500, "detail": "Internal error while processing the request."}
+
+
+def stream_events(
+    producer: Callable[[Emit], None],
+    fmt: str = "ndjson",
+    submit: Optional[Callable[[Callable[[], None]], Future]] = None,
+) -> Iterator[str]:
+    """
+    Run `producer(emit)` in the background and yield formatted events.
+
+    Args:
+        producer: blocking function that reports progress through `emit`.
+        fmt: "ndjson" or "sse".
+        submit: optional executor hook (e.g. a bounded pool) used to start the
+                producer; a daemon thread is used otherwise.
+
+    The producer is started eagerly (so e.g. a full pool is reported as an
+    HTTP error before the response begins). Exceptions in the producer are
+    turned into a final "error" event. If the client disconnects, the next
+    `emit` raises StreamClosed to stop the work.
+    """
+    events: "queue.Queue[Any]" = queue.Queue()
+    closed = threading.Event()
+
+    def emit(event: Event) -> None:
+        if closed.is_set():
+            raise StreamClosed()
+        events.put(event)
+
+    def run() -> None:
+        try:
+            producer(emit)
+        except StreamClosed:
+            pass
+        except BaseException as exc:  # surfaced to the client as an event
+            events.put(_error_event(exc))
+        finally:
+            events.put(_DONE)
+
+    if submit is not None:
+        submit(run)
+    else:
+        threading.Thread(target=run, name="stream-producer", daemon=True).start()
+
+    def drain() -> Iterator[str]:
+        try:
+            while True:
+                event = events.get()
+                if event is _DONE:
+                    break
+                yield format_event(event, fmt)
+        finally:
+            closed.set()
+
+    return drain()
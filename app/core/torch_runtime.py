@@ -0,0 +1,39 @@
+"""
+Process-wide torch CPU runtime settings.
+
+Environment variables:
+- TORCH_INTRA_OP_THREADS: threads used inside one op (matmul, conv); 0 keeps torch's default
+- TORCH_INTER_OP_THREADS: threads used to run independent ops in parallel; 0 keeps torch's default
+
+Inter-op threads can only be set before torch runs any parallel work, so
+`configure_torch_threads()` is called right before the first model load.
+"""
+
+from __future__ import annotations
+
+import os
+from functools import lru_cache
+
+TORCH_INTRA_OP_THREADS = int(os.getenv("TORCH_INTRA_OP_THREADS", "0"))
+TORCH_INTER_OP_THREADS = int(os.getenv("TORCH_INTER_OP_THREADS", "0"))
+
+
+@lru_cache(maxsize=1)
+def configure_torch_threads() -> dict:
+    """
+    Apply the configured thread counts once per process.
+
+    Returns:
+        the effective {"intra_op": n, "inter_op": n} settings.
+    """
+    import torch
+
+    if TORCH_INTRA_OP_THREADS > 0:
+        torch.set_num_threads(TORCH_INTRA_OP_THREADS)
+    if TORCH_INTER_OP_THREADS > 0:
+        try:
+            torch.set_num_interop_threads(TORCH_INTER_OP_THREADS)
+        except RuntimeError:
+            # Parallel work already started; the reported value shows what is in effect.
+            pass
+    return {"intra_op": torch.get_num_threads(), "inter_op": torch.get_num_interop_threads()}
@@ -0,0 +1,123 @@
+"""
+Model preloading, startup warmup and readiness state.
+
+- `preload_models()` loads and pins the configured models (run it in the
+  parent process before forking workers so they share the weights).
+- `start_warmup()` runs one dummy generation and transcription on a
+  background thread; `/ready` reports ready only once it has finished,
+  while `/health` keeps answering during warmup.
+
+Environment variables:
+- PRELOAD_MODELS: comma-separated "kind" or "kind:model" entries, kind being
+  "summarizer" or "asr" (bare kind = default model) (default: "summarizer,asr"
+  when WEB_CONCURRENCY > 1, else empty: a single worker loads models lazily on
+  first use, so it binds its port without importing torch)
+- WARMUP_ON_STARTUP: run the dummy inference before reporting ready (default: 0)
+- WARMUP_MODELS: models to warm up, same format as PRELOAD_MODELS
+  (default: PRELOAD_MODELS, or "summarizer,asr" when that is empty)
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_MODELS = "summarizer,asr"
+# Preloading only pays off when forked workers share the weights.
+_FORKED_WORKERS = int(os.getenv("WEB_CONCURRENCY", "1")) > 1
+PRELOAD_MODELS = os.getenv("PRELOAD_MODELS", DEFAULT_MODELS if _FORKED_WORKERS else "")
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "0") == "1"
+WARMUP_MODELS = os.getenv("WARMUP_MODELS", PRELOAD_MODELS or DEFAULT_MODELS)
+
+_state: Dict[str, Any] = {
+    "ready": not WARMUP_ON_STARTUP,
+    "startup_seconds": None,
+    "warmup_seconds": None,
+    "error": None,
+}
+_lock = threading.Lock()
+
+
+def parse_model_specs(raw: str) -> List[Tuple[str, Optional[str]]]:
+    """Parse "summarizer,asr:base" into [("summarizer", None), ("asr", "base")]."""
+    specs = []
+    for item in raw.split(","):
+        item = item.strip()
+        if item:
+            kind, _, name = item.partition(":")
+            specs.append((kind.strip(), name.strip() or None))
+    return specs
+
+
+def _resolve(kind: str, name: Optional[str]) -> str:
+    if kind == "summarizer":
+        from app.services.text.ai_summarize_service import resolve_model
+
+        return resolve_model(name)
+    if kind == "asr":
+        from app.services.speech.asr_service import resolve_asr_model
+
+        return resolve_asr_model(name)
+    raise ValueError(f"Unknown model kind '{kind}' (expected 'summarizer' or 'asr').")
+
+
+def preload_models(raw: str = PRELOAD_MODELS) -> List[str]:
+    """
+    Load and pin the given models in the model registry.
+
+    Returns:
+        "kind:model" labels of the loaded models.
+    """
+    from app.core.model_registry import model_registry
+
+    loaded = []
+    for kind, name in parse_model_specs(raw):
+        model = _resolve(kind, name)
+        model_registry.preload(kind, model)
+        loaded.append(f"{kind}:{model}")
+    return loaded
+
+
+def run_warmup(raw: str = WARMUP_MODELS) -> float:
+    """Run one dummy inference per model. Returns elapsed seconds."""
+    started = time.perf_counter()
+    for kind, name in parse_model_specs(raw):
+        model = _resolve(kind, name)
+        if kind == "summarizer":
+            from app.services.text.ai_summarize_service import warmup
+        else:
+            from app.services.speech.asr_service import warmup
+        warmup(model)
+    return time.perf_counter() - started
+
+
+def start_warmup() -> None:
+    """Run the warmup in the background when WARMUP_ON_STARTUP=1 (no-op otherwise)."""
+    if not WARMUP_ON_STARTUP:
+        return
+
+    def run() -> None:
+        try:
+            seconds = run_warmup()
+        except Exception as exc:  # reported by /ready, which stays not-ready
+            with _lock:
+                _state.update(error=f"{type(exc).__name__}: {exc}")
+        else:
+            with _lock:
+                _state.update(ready=True, warmup_seconds=round(seconds, 3))
+
+    threading.Thread(target=run, name="warmup", daemon=True).start()
+
+
+def mark_started(seconds: float) -> None:
+    """Record how long the app took to import and start (before any warmup)."""
+    with _lock:
+        _state["startup_seconds"] = round(seconds, 3)
+
+
+def readiness() -> Dict[str, Any]:
+    """Snapshot of the readiness state: ready, startup_seconds, warmup_seconds, error."""
+    with _lock:
+        return dict(_state)
@@ -0,0 +1,62 @@
+"""
+Asynchronous job API.
+
+- POST /jobs/summarize   -> enqueue an abstractive summary, returns a job id immediately
+- POST /jobs/transcribe  -> enqueue an MP4 transcription, returns a job id immediately
+- GET  /jobs/stats       -> job counts by status
+- GET  /jobs/{job_id}    -> job status and result
+"""
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+
+from app.controllers.jobs_controller import (
+    get_job_action,
+    jobs_stats_action,
+    submit_summarize_job,
+    submit_transcribe_job,
+)
+from app.schemas.jobs import JobOut, JobSummarizeIn, JobsStatsOut
+from app.schemas.transcribe import TranscribeVideoQuery
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+@router.post("/summarize", response_model=JobOut, status_code=status.HTTP_202_ACCEPTED)
+def create_summarize_job(payload: JobSummarizeIn):
+    """
+    Queue an abstractive summarization; poll GET /jobs/{id} for the result.
+    """
+    return submit_summarize_job(payload)
+
+
+@router.post("/transcribe", response_model=JobOut, status_code=status.HTTP_202_ACCEPTED)
+def create_transcribe_job(
+    file: UploadFile = File(..., description="MP4 video file to be transcribed."),
+    q: TranscribeVideoQuery = Depends(),
+    priority: int = Query(0, ge=0, le=9, description="Higher priorities run first (0-9)."),
+):
+    """
+    Queue a video transcription; poll GET /jobs/{id} for the result.
+    """
+    if file.content_type not in ("video/mp4", "application/octet-stream"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unsupported content type. Please upload an MP4 file.",
+        )
+    return submit_transcribe_job(file, q, priority)
+
+
+@router.get("/stats", response_model=JobsStatsOut)
+def jobs_stats():
+    """
+    Job counts by status.
+    """
+    return jobs_stats_action()
+
+
+@router.get("/{job_id}", response_model=JobOut)
+def get_job(job_id: str):
+    """
+    Job status, plus the result (or error) once finished.
+    """
+    return get_job_action(job_id)
@@ -0,0 +1,20 @@
+"""
+Model registry routes.
+
+- GET /models -> selectable summarization/Whisper models and what is loaded in memory
+"""
+
+from fastapi import APIRouter
+
+from app.controllers.models_controller import list_models_action
+from app.schemas.models import ModelsOut
+
+router = APIRouter(prefix="/models", tags=["models"])
+
+
+@router.get("", response_model=ModelsOut)
+def list_models():
+    """
+    Selectable models (with tier aliases), memory budget and loaded models.
+    """
+    return list_models_action()
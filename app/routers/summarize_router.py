@@ -2,14 +2,26 @@
 Routers define public HTTP routes and delegate to controllers.
 """
 
-from fastapi import APIRouter
+from typing import Literal
+
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+
+from app.core.streaming import MEDIA_TYPES
 from app.schemas.summarize import (
     SummarizeIn, SummarizeOut,
     SummarizeAIIn, SummarizeAIOut,
+    SummarizeBatchIn, SummarizeBatchOut,
+    SummarizeAIBatchIn, SummarizeAIBatchOut,
+    SummarizeAIStatsOut,
 )
 from app.controllers.summarize_controller import (
     summarize_action,
     summarize_ai_action,
+    summarize_ai_batch_action,
+    summarize_batch_action,
+    summarize_ai_stats_action,
+    summarize_ai_stream_action,
 )
 
 router = APIRouter(prefix="/summarize", tags=["summarizer"])
@@ -18,14 +30,50 @@ router = APIRouter(prefix="/summarize", tags=["summarizer"])
 @router.post("", response_model=SummarizeOut)
 def summarize(payload: SummarizeIn):
     """
-    Extractive summarization endpoint (heuristic).
+    Extractive summarization endpoint (TextRank / TF-IDF ranking, no models).
     """
     return summarize_action(payload)
 
 
+@router.post("/batch", response_model=SummarizeBatchOut)
+def summarize_batch(payload: SummarizeBatchIn):
+    """
+    Extractive summarization of many documents; per-document results or errors, in input order.
+    """
+    return summarize_batch_action(payload)
+
+
 @router.post("/ai", response_model=SummarizeAIOut)
 def summarize_ai(payload: SummarizeAIIn):
     """
     Abstractive summarization endpoint (free DistilBART model on CPU).
     """
-    return summarize_ai_action(payload)
\ No newline at end of file
+    return summarize_ai_action(payload)
+
+
+@router.post("/ai/batch", response_model=SummarizeAIBatchOut)
+def summarize_ai_batch(payload: SummarizeAIBatchIn):
+    """
+    Abstractive summarization of many documents with shared model batches;
+    per-document results or errors, in input order.
+    """
+    return summarize_ai_batch_action(payload)
+
+
+@router.post("/ai/stream")
+def summarize_ai_stream(
+    payload: SummarizeAIIn,
+    fmt: Literal["ndjson", "sse"] = Query("ndjson", alias="format", description="Stream framing."),
+):
+    """
+    Streaming abstractive summarization: partial summaries per chunk, then the final result.
+    """
+    return StreamingResponse(summarize_ai_stream_action(payload, fmt), media_type=MEDIA_TYPES[fmt])
+
+
+@router.get("/ai/stats", response_model=SummarizeAIStatsOut)
+def summarize_ai_stats():
+    """
+    Micro-batching scheduler and summary cache stats.
+    """
+    return summarize_ai_stats_action()
@@ -2,17 +2,30 @@
 Public HTTP routes for transcription.
 
 - /transcribe/video  -> accept MP4, return verbatim transcript (and optional AI summary)
+- /transcribe/video/stream -> same, streamed as NDJSON/SSE progress events
+- /transcribe/stats  -> queue depth and worker-pool utilization
 """
 
 from __future__ import annotations
 
-from fastapi import APIRouter, File, UploadFile, Depends, HTTPException, status
+from typing import Literal
+
+from fastapi import APIRouter, File, UploadFile, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+
+from app.core.streaming import MEDIA_TYPES
 
 from app.schemas.transcribe import (
+    TranscribeStatsOut,
     TranscribeVideoOut,
     TranscribeVideoQuery,
 )
-from app.controllers.transcribe_controller import transcribe_video_action
+from app.controllers.transcribe_controller import (
+    transcribe_executor,
+    transcribe_stats_action,
+    transcribe_video_action,
+    transcribe_video_stream_action,
+)
 
 router = APIRouter(prefix="/transcribe", tags=["transcribe"])
 
@@ -32,16 +45,63 @@ async def transcribe_video(
     Notes:
     - This endpoint does NOT require any paid external services.
     - Large files will take longer on CPU; consider chunking or client-side trimming if needed.
+    - The pipeline runs on a bounded worker pool; the event loop only awaits it.
     """
-    if file.content_type not in ("video/mp4", "application/octet-stream"):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Unsupported content type. Please upload an MP4 file.",
-        )
+    _check_content_type(file)
 
-    return transcribe_video_action(
+    return await transcribe_executor.run(
+        transcribe_video_action,
         file=file,
         do_summary=q.do_summary,
         min_length=q.min_length,
         max_length=q.max_length,
-    )
\ No newline at end of file
+        asr_model=q.asr_model,
+        summary_model=q.summary_model,
+        reduce_mode=q.reduce_mode,
+        asr_profile=q.asr_profile,
+        language=q.language,
+    )
+
+
+@router.post("/video/stream")
+async def transcribe_video_stream(
+    file: UploadFile = File(..., description="MP4 video file to be transcribed."),
+    q: TranscribeVideoQuery = Depends(),
+    fmt: Literal["ndjson", "sse"] = Query("ndjson", alias="format", description="Stream framing."),
+):
+    """
+    Streaming transcription: emits transcript segments as Whisper produces them,
+    partial summaries per map chunk, and the final result (same payload as /transcribe/video).
+    """
+    _check_content_type(file)
+
+    events = await transcribe_executor.run(
+        transcribe_video_stream_action,
+        file=file,
+        do_summary=q.do_summary,
+        min_length=q.min_length,
+        max_length=q.max_length,
+        fmt=fmt,
+        asr_model=q.asr_model,
+        summary_model=q.summary_model,
+        reduce_mode=q.reduce_mode,
+        asr_profile=q.asr_profile,
+        language=q.language,
+    )
+    return StreamingResponse(events, media_type=MEDIA_TYPES[fmt])
+
+
+@router.get("/stats", response_model=TranscribeStatsOut)
+def transcribe_stats():
+    """
+    Queue depth and worker-pool utilization of the transcription executor.
+    """
+    return transcribe_stats_action()
+
+
+def _check_content_type(file: UploadFile) -> None:
+    if file.content_type not in ("video/mp4", "application/octet-stream"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unsupported content type. Please upload an MP4 file.",
+        )
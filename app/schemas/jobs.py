@@ -0,0 +1,47 @@
+"""
+Pydantic schemas for the asynchronous job API.
+"""
+
+from typing import Any, Dict, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+from app.schemas.summarize import SummarizeAIIn
+
+
+class JobSummarizeIn(SummarizeAIIn):
+    """
+    Request schema for POST /jobs/summarize (same fields as /summarize/ai plus a priority).
+    """
+    priority: int = Field(0, ge=0, le=9, description="Higher priorities run first (0-9).")
+
+
+class JobOut(BaseModel):
+    """
+    Status (and, once finished, result or error) of an asynchronous job.
+    """
+    id: str
+    kind: Literal["summarize", "transcribe"]
+    status: Literal["queued", "running", "succeeded", "failed"]
+    priority: int
+    attempts: int = Field(..., description="Times a worker has started this job.")
+    created_at: float = Field(..., description="Unix timestamp of submission.")
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[Dict[str, Any]] = Field(
+        default=None, description="Endpoint payload (SummarizeAIOut / TranscribeVideoOut) when succeeded."
+    )
+    error: Optional[Dict[str, Any]] = Field(
+        default=None, description="`status_code` and `detail` of the last failure."
+    )
+
+
+class JobsStatsOut(BaseModel):
+    """
+    Job counts by status and worker threads alive in this process.
+    """
+    queued: int
+    running: int
+    succeeded: int
+    failed: int
+    workers: int
@@ -0,0 +1,49 @@
+"""
+Pydantic schemas for the model registry endpoint.
+"""
+
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class ModelChoicesOut(BaseModel):
+    """
+    Models selectable per request for one model kind.
+    """
+    default: str
+    aliases: Dict[str, str] = Field(..., description="Tier aliases (e.g. 'fast', 'quality') and the model each maps to.")
+    available: List[str]
+
+
+class LoadedModelOut(BaseModel):
+    """
+    A model currently held in memory.
+    """
+    kind: str = Field(..., description="'summarizer' or 'asr'.")
+    name: str
+    size_mb: float
+    in_use: int = Field(..., description="Requests currently using the model.")
+    pinned: bool = Field(..., description="Preloaded at startup; never evicted.")
+    idle_seconds: float
+
+
+class ModelRegistryOut(BaseModel):
+    """
+    Memory budget and load/eviction counters of the model registry.
+    """
+    budget_mb: Optional[float] = Field(None, description="RAM budget for model weights (null = unlimited).")
+    used_mb: float
+    idle_ttl_seconds: Optional[float] = Field(None, description="Idle eviction TTL (null = disabled).")
+    loads: int
+    evictions: int
+    models: List[LoadedModelOut]
+
+
+class ModelsOut(BaseModel):
+    """
+    Response for GET /models.
+    """
+    summarizer: ModelChoicesOut
+    asr: ModelChoicesOut
+    registry: ModelRegistryOut
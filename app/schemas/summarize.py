@@ -3,7 +3,7 @@ Pydantic schemas for request/response validation.
 """
 
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 
 # ---------- Extractive (heuristic) ----------
@@ -14,6 +14,9 @@ class SummarizeIn(BaseModel):
     text: str = Field(..., min_length=50, description="Text to summarize (>= 50 chars).")
     ratio: float = Field(0.2, ge=0.05, le=0.6, description="Summary ratio (5% - 60%).")
     max_sentences: Optional[int] = Field(None, ge=1, le=25, description="Optional cap on sentence count.")
+    method: Literal["textrank", "tfidf", "length"] = Field(
+        "textrank", description="Sentence ranking: TextRank graph, TF-IDF centroid similarity, or length."
+    )
 
 
 class SummarizeOut(BaseModel):
@@ -24,6 +27,7 @@ class SummarizeOut(BaseModel):
     summary: str
     ratio_used: float
     total_sentences: int
+    method: str = Field("textrank", description="Sentence ranking method used.")
 
 
 # ---------- Abstractive (AI: DistilBART) ----------
@@ -34,6 +38,16 @@ class SummarizeAIIn(BaseModel):
     text: str = Field(..., min_length=50, description="Text to summarize (>= 50 chars).")
     min_length: int = Field(60, ge=20, le=300, description="Lower bound for the generated summary length.")
     max_length: int = Field(160, ge=60, le=400, description="Upper bound for the generated summary length.")
+    reduce_mode: Optional[Literal["flat", "tree", "hybrid"]] = Field(
+        None,
+        description=(
+            "Strategy for long inputs (default: server setting, usually 'tree'); 'hybrid' summarizes "
+            "the top-ranked sentences that fit one model window in a single pass."
+        ),
+    )
+    model: Optional[str] = Field(
+        None, description="Summarization model or tier alias (e.g. 'fast', 'quality'); server default when omitted."
+    )
 
 
 class SummarizeAIOut(BaseModel):
@@ -41,6 +55,136 @@ class SummarizeAIOut(BaseModel):
     Response schema for AI-based abstractive summarization.
     """
     summary: str
-    model_used: str
+    model_used: str = Field(..., description="Summarization model that produced the summary ('+int8' when quantized).")
     min_length: int
-    max_length: int
\ No newline at end of file
+    max_length: int
+    reduce_mode: str = Field("tree", description="Reduce strategy used for multi-chunk inputs.")
+    chunks: int = Field(1, description="Number of token-aware chunks in the map step.")
+    reduce_depth: int = Field(0, description="Number of reduce levels (0 for single-chunk inputs).")
+    model_calls: int = Field(1, description="Total blocks summarized across map, reduce and final passes.")
+    cached: bool = Field(False, description="True when the summary was served from the cache.")
+    extracted_sentences: Optional[int] = Field(
+        None, description="Sentences kept by the hybrid extractive pre-selection (multi-chunk inputs only)."
+    )
+
+# ---------- Batch ----------
+class BatchItemError(BaseModel):
+    """
+    Why one document of a batch could not be summarized.
+    """
+    status_code: int = Field(..., description="HTTP status the single-document endpoint would have returned.")
+    detail: str
+    retry_after: Optional[int] = Field(None, description="Seconds to wait before retrying (503 items only).")
+
+
+class SummarizeBatchIn(BaseModel):
+    """
+    Request schema for POST /summarize/batch (same options as /summarize, applied to every document).
+    """
+    documents: List[str] = Field(..., min_length=1, description="Texts to summarize; results keep this order.")
+    ratio: float = Field(0.2, ge=0.05, le=0.6, description="Summary ratio (5% - 60%).")
+    max_sentences: Optional[int] = Field(None, ge=1, le=25, description="Optional cap on sentence count.")
+    method: Literal["textrank", "tfidf", "length"] = Field("textrank", description="Sentence ranking method.")
+
+
+class SummarizeBatchItemOut(BaseModel):
+    """
+    Outcome for one document: `result` on success, `error` otherwise.
+    """
+    index: int
+    result: Optional[SummarizeOut] = None
+    error: Optional[BatchItemError] = None
+
+
+class SummarizeBatchOut(BaseModel):
+    """
+    Response schema for POST /summarize/batch.
+    """
+    results: List[SummarizeBatchItemOut]
+    succeeded: int
+    failed: int
+
+
+class SummarizeAIBatchIn(BaseModel):
+    """
+    Request schema for POST /summarize/ai/batch (same options as /summarize/ai, applied to every document).
+    """
+    documents: List[str] = Field(..., min_length=1, description="Texts to summarize; results keep this order.")
+    min_length: int = Field(60, ge=20, le=300, description="Lower bound for the generated summary length.")
+    max_length: int = Field(160, ge=60, le=400, description="Upper bound for the generated summary length.")
+    reduce_mode: Optional[Literal["flat", "tree", "hybrid"]] = Field(
+        None, description="Strategy for long inputs ('flat', 'tree' or 'hybrid')."
+    )
+    model: Optional[str] = Field(None, description="Summarization model or tier alias (e.g. 'fast', 'quality').")
+
+
+class SummarizeAIBatchItemOut(BaseModel):
+    """
+    Outcome for one document: `result` on success, `error` otherwise.
+    """
+    index: int
+    result: Optional[SummarizeAIOut] = None
+    error: Optional[BatchItemError] = None
+
+
+class SummarizeAIBatchOut(BaseModel):
+    """
+    Response schema for POST /summarize/ai/batch.
+    """
+    results: List[SummarizeAIBatchItemOut]
+    succeeded: int
+    failed: int
+
+
+class BatchingStatsOut(BaseModel):
+    """
+    Micro-batching scheduler configuration and counters.
+    """
+    enabled: bool
+    max_batch_size: int
+    max_wait_ms: float
+    queue_depth: int
+    batches_run: int
+    blocks_processed: int
+    avg_batch_size: float
+    largest_batch: int
+    busy_seconds: float
+
+
+class CacheStatsOut(BaseModel):
+    """
+    Summary cache configuration and hit/miss counters.
+    """
+    enabled: bool
+    disk_enabled: bool
+    entries: int
+    bytes: int
+    max_bytes: int
+    ttl_seconds: float
+    hits: int
+    disk_hits: int
+    misses: int
+    evictions: int
+    hit_ratio: float
+
+
+class AdmissionStatsOut(BaseModel):
+    """
+    Cost-based admission control budget and counters (shared by heavy endpoints).
+    """
+    enabled: bool
+    budget_seconds: float = Field(..., description="Max estimated CPU-seconds in flight.")
+    max_concurrent: int = Field(..., description="Max admitted requests in flight.")
+    in_flight_cost_seconds: float
+    in_flight_requests: int
+    admitted: int
+    rejected: int = Field(..., description="Requests shed with 503 because the budget or concurrency cap was reached.")
+
+
+class SummarizeAIStatsOut(BaseModel):
+    """
+    Response schema for the AI summarization stats endpoint.
+    """
+    batching: BatchingStatsOut
+    cache: CacheStatsOut
+    admission: AdmissionStatsOut
@@ -4,7 +4,9 @@ All docstrings and field descriptions are in English as requested.
 """
 
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Literal, Optional
+
+from app.schemas.summarize import AdmissionStatsOut
 
 
 class TranscribeVideoQuery(BaseModel):
@@ -27,6 +29,32 @@ class TranscribeVideoQuery(BaseModel):
         le=600,
         description="Maximum token length for the abstractive summary.",
     )
+    asr_model: Optional[str] = Field(
+        default=None,
+        description="Whisper size or tier alias (e.g. 'fast', 'quality'); server default when omitted.",
+    )
+    summary_model: Optional[str] = Field(
+        default=None,
+        description="Summarization model or tier alias (e.g. 'fast', 'quality'); server default when omitted.",
+    )
+    reduce_mode: Optional[Literal["flat", "tree", "hybrid"]] = Field(
+        default=None,
+        description=(
+            "Summary strategy for long transcripts (server default when omitted); 'hybrid' summarizes "
+            "the top-ranked sentences that fit one model window in a single pass."
+        ),
+    )
+    asr_profile: Optional[Literal["fast", "balanced", "accurate"]] = Field(
+        default=None,
+        description=(
+            "Whisper decoding profile: 'fast' (greedy, no fallback), 'balanced' (Whisper defaults) or "
+            "'accurate' (beam search); server default when omitted."
+        ),
+    )
+    language: Optional[str] = Field(
+        default=None,
+        description="Spoken language hint (e.g. 'en', 'es' or 'spanish'); skips automatic language detection.",
+    )
 
 
 class TranscribeVideoOut(BaseModel):
@@ -43,4 +71,47 @@ class TranscribeVideoOut(BaseModel):
     asr_model_used: str = Field(..., description="Identifier of the speech-to-text model used.")
     summary_model_used: Optional[str] = Field(
         default=None, description="Identifier of the summarization model used (if do_summary=true)."
-    )
\ No newline at end of file
+    )
+    speech_seconds: Optional[float] = Field(
+        default=None, description="Seconds of audio classified as speech by the VAD pre-pass."
+    )
+    speech_ratio: Optional[float] = Field(
+        default=None, description="Fraction of the audio classified as speech (0-1)."
+    )
+    silence_ratio: Optional[float] = Field(
+        default=None, description="Fraction of the audio skipped as silence (0-1)."
+    )
+    asr_profile: Optional[str] = Field(default=None, description="Whisper decoding profile used.")
+    realtime_factor: Optional[float] = Field(
+        default=None, description="Audio seconds transcribed per wall-clock second (>1 is faster than real time)."
+    )
+    summary_seconds: Optional[float] = Field(
+        default=None,
+        description="Wall-clock seconds the request spent in summarization (if do_summary=true; excluded from realtime_factor).",
+    )
+
+
+class ExecutorStatsOut(BaseModel):
+    """
+    Queue depth and utilization of a bounded worker pool.
+    """
+    name: str
+    max_workers: int
+    max_queue: int
+    queued: int = Field(..., description="Jobs waiting for a free worker.")
+    running: int = Field(..., description="Jobs currently executing.")
+    completed: int
+    failed: int
+    rejected: int = Field(..., description="Jobs refused with 503 because the queue was full.")
+    busy_seconds: float
+    utilization: float = Field(..., description="Fraction of workers busy right now.")
+    avg_utilization: float = Field(..., description="Average fraction of workers busy since start.")
+
+
+class TranscribeStatsOut(BaseModel):
+    """
+    Response for /transcribe/stats.
+    """
+    executor: ExecutorStatsOut
+    stream_executor: ExecutorStatsOut = Field(..., description="Producers of /transcribe/video/stream.")
+    admission: AdmissionStatsOut
@@ -0,0 +1,495 @@
+"""
+Durable local job queue backed by sqlite.
+
+- Jobs survive restarts: state, parameters, results and errors live in a sqlite
+  file (WAL mode), uploads are kept next to it until the job finishes.
+- Priorities: higher `priority` runs first, then FIFO.
+- Concurrency: `concurrency` worker threads per process, plus optional per-kind
+  limits enforced across every process sharing the database.
+- Crash-safe resume: a claimed job holds a lease that a heartbeat thread
+  renews while the job runs, so long jobs keep it. If the worker dies, the
+  lease expires (JOBS_LEASE_SECONDS) and another worker picks the job up again
+  (up to `max_attempts`). On start, jobs held by dead processes on the same
+  host are requeued at once instead of waiting for their lease.
+- Transient overload: a handler raising JobRetry (e.g. a 503) puts the job
+  back in the queue with exponential backoff; this does not use up an attempt.
+
+Worker threads can run inside the API process or in a separate process
+(see worker.py at the repository root), so workers scale independently.
+
+Environment variables:
+- JOBS_DIR: directory for the database and uploaded files (default: /tmp/smart-ai-tools/jobs)
+- JOBS_CONCURRENCY: worker threads per process (default: 1)
+- JOBS_KIND_LIMITS: per-kind running limits, e.g. "transcribe=1,summarize=2" (default: transcribe=1)
+- JOBS_MAX_ATTEMPTS: attempts before a job is marked failed (default: 3)
+- JOBS_LEASE_SECONDS: how long a claimed job survives without a heartbeat before it is
+  considered lost; renewed every third of it while the job runs (default: 120)
+- JOBS_MAX_QUEUED: queued jobs accepted before new submissions are refused (default: 1000)
+- JOBS_RETENTION_SECONDS: finished jobs older than this are purged (default: 604800)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from functools import lru_cache
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple
+
+from app.core.metrics import stage
+
+JOBS_DIR = os.getenv("JOBS_DIR", "/tmp/smart-ai-tools/jobs")
+JOBS_CONCURRENCY = int(os.getenv("JOBS_CONCURRENCY", "1"))
+JOBS_KIND_LIMITS = os.getenv("JOBS_KIND_LIMITS", "transcribe=1")
+JOBS_MAX_ATTEMPTS = int(os.getenv("JOBS_MAX_ATTEMPTS", "3"))
+JOBS_LEASE_SECONDS = float(os.getenv("JOBS_LEASE_SECONDS", "120"))
+JOBS_MAX_QUEUED = int(os.getenv("JOBS_MAX_QUEUED", "1000"))
+JOBS_RETENTION_SECONDS = float(os.getenv("JOBS_RETENTION_SECONDS", str(7 * 24 * 3600)))
+
+# Idle workers poll the database at this interval (seconds).
+_POLL_SECONDS = 1.0
+_COPY_BLOCK = 1024 * 1024
+# Backoff of JobRetry requeues: 15 s, 30 s, 60 s, ... capped at 5 minutes.
+_RETRY_BASE_SECONDS = 15.0
+_RETRY_MAX_SECONDS = 300.0
+
+# Columns added after the first schema version (added to existing databases on open).
+_LATER_COLUMNS = {"lease_owner": "TEXT", "available_at": "REAL", "deferrals": "INTEGER NOT NULL DEFAULT 0"}
+
+Handler = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+class JobRejected(Exception):
+    """Raised by a handler for deterministic failures that must not be retried."""
+
+    def __init__(self, error: Dict[str, Any]) -> None:
+        super().__init__(error.get("detail"))
+        self.error = error
+
+
+class JobRetry(Exception):
+    """
+    Raised by a handler for transient failures (e.g. a 503 under load): the job
+    is requeued after a backoff of at least `retry_after` seconds, without
+    counting as a failed attempt.
+    """
+
+    def __init__(self, error: Dict[str, Any], retry_after: float = 0.0) -> None:
+        super().__init__(error.get("detail"))
+        self.error = error
+        self.retry_after = retry_after
+
+
+class QueueFull(Exception):
+    """Raised by `enqueue` when JOBS_MAX_QUEUED jobs are already waiting."""
+
+
+def parse_kind_limits(raw: str) -> Dict[str, int]:
+    """Parse "kind=limit,kind=limit" into a dict."""
+    limits: Dict[str, int] = {}
+    for part in raw.split(","):
+        if "=" in part:
+            kind, value = part.split("=", 1)
+            limits[kind.strip()] = int(value)
+    return limits
+
+
+class JobQueue:
+    """
+    sqlite-backed priority queue with leases and a worker thread pool.
+    One connection per thread; all state transitions are single transactions.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        concurrency: int = 1,
+        kind_limits: Optional[Dict[str, int]] = None,
+        max_attempts: int = 3,
+        lease_seconds: float = 120.0,
+        max_queued: int = 1000,
+    ) -> None:
+        self.directory = directory
+        self.files_dir = os.path.join(directory, "files")
+        self.db_path = os.path.join(directory, "jobs.db")
+        self.concurrency = max(1, concurrency)
+        self.kind_limits = kind_limits or {}
+        self.max_attempts = max(1, max_attempts)
+        self.lease_seconds = lease_seconds
+        self.max_queued = max_queued
+        self._local = threading.local()
+        self._handlers: Dict[str, Handler] = {}
+        self._threads: List[threading.Thread] = []
+        self._heartbeat: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._owner: Optional[str] = None
+        self._owner_pid = 0
+        os.makedirs(self.files_dir, exist_ok=True)
+        self._init_schema()
+
+    @property
+    def owner(self) -> str:
+        """Lease owner id of this process: "host:pid:nonce" (new after a fork)."""
+        if self._owner is None or self._owner_pid != os.getpid():
+            self._owner_pid = os.getpid()
+            self._owner = f"{socket.gethostname()}:{self._owner_pid}:{uuid.uuid4().hex[:8]}"
+        return self._owner
+
+    # ---------- storage ----------
+    def _db(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30.0, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self) -> None:
+        self._db().executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                status TEXT NOT NULL,
+                priority INTEGER NOT NULL DEFAULT 0,
+                params TEXT NOT NULL,
+                upload_path TEXT,
+                result TEXT,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                lease_expires_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS jobs_pick ON jobs (status, priority DESC, created_at);
+            """
+        )
+        existing = {row["name"] for row in self._db().execute("PRAGMA table_info(jobs)")}
+        for name, decl in _LATER_COLUMNS.items():
+            if name not in existing:
+                self._db().execute(f"ALTER TABLE jobs ADD COLUMN {name} {decl}")
+
+    @staticmethod
+    def _row_to_job(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        for key in ("params", "result", "error"):
+            job[key] = json.loads(job[key]) if job[key] else None
+        return job
+
+    # ---------- producer side ----------
+    def enqueue(
+        self,
+        kind: str,
+        params: Dict[str, Any],
+        priority: int = 0,
+        upload: Optional[BinaryIO] = None,
+    ) -> Dict[str, Any]:
+        """
+        Persist a new job (and its upload, if any) and return it.
+
+        The upload is copied before the write transaction (so the database is
+        not locked during the copy); the capacity check and the insert then
+        run in one transaction, so concurrent submissions cannot overshoot
+        `max_queued`.
+
+        Raises:
+            QueueFull: if too many jobs are already waiting.
+        """
+        db = self._db()
+        # Cheap early refusal before copying the upload; re-checked below.
+        self._check_capacity(db)
+
+        job_id = uuid.uuid4().hex
+        upload_path = None
+        if upload is not None:
+            upload_path = os.path.join(self.files_dir, job_id)
+            upload.seek(0)
+            with open(upload_path, "wb") as f, stage("upload_copy"):
+                shutil.copyfileobj(upload, f, _COPY_BLOCK)
+
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            self._check_capacity(db)
+            db.execute(
+                "INSERT INTO jobs (id, kind, status, priority, params, upload_path, created_at)"
+                " VALUES (?, ?, 'queued', ?, ?, ?, ?)",
+                (job_id, kind, priority, json.dumps(params), upload_path, time.time()),
+            )
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            self._remove_upload(upload_path)
+            raise
+        return self.get(job_id)
+
+    def _check_capacity(self, db: sqlite3.Connection) -> None:
+        queued = db.execute("SELECT COUNT(*) FROM jobs WHERE status = 'queued'").fetchone()[0]
+        if queued >= self.max_queued:
+            raise QueueFull(f"{queued} jobs already queued")
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._db().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def stats(self) -> Dict[str, Any]:
+        rows = self._db().execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        counts = {row["status"]: row["n"] for row in rows}
+        return {
+            "queued": counts.get("queued", 0),
+            "running": counts.get("running", 0),
+            "succeeded": counts.get("succeeded", 0),
+            "failed": counts.get("failed", 0),
+            "workers": len([t for t in self._threads if t.is_alive()]),
+        }
+
+    # ---------- worker side ----------
+    def claim(self) -> Optional[Dict[str, Any]]:
+        """
+        Atomically take the highest-priority runnable job.
+
+        Runnable means queued (and past its retry backoff), or running with an
+        expired lease (its worker crashed). Kinds at their concurrency limit
+        are skipped. Jobs found over `max_attempts` are marked failed on the
+        way and the search goes on.
+        """
+        while True:
+            row, abandoned = self._claim_next()
+            if row is None:
+                return None
+            if not abandoned:
+                return self.get(row["id"])
+            self._remove_upload(row["upload_path"])
+
+    def _claim_next(self) -> Tuple[Optional[sqlite3.Row], bool]:
+        """One claim transaction: (picked row or None, whether it was abandoned instead of claimed)."""
+        db = self._db()
+        now = time.time()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            running = {
+                row["kind"]: row["n"]
+                for row in db.execute(
+                    "SELECT kind, COUNT(*) AS n FROM jobs"
+                    " WHERE status = 'running' AND lease_expires_at > ? GROUP BY kind",
+                    (now,),
+                )
+            }
+            blocked = [k for k, limit in self.kind_limits.items() if running.get(k, 0) >= limit]
+            query = (
+                "SELECT * FROM jobs WHERE ((status = 'queued' AND (available_at IS NULL OR available_at <= ?))"
+                " OR (status = 'running' AND lease_expires_at <= ?))"
+            )
+            args: List[Any] = [now, now]
+            if blocked:
+                query += f" AND kind NOT IN ({','.join('?' * len(blocked))})"
+                args.extend(blocked)
+            query += " ORDER BY priority DESC, created_at LIMIT 1"
+            row = db.execute(query, args).fetchone()
+            if row is None:
+                db.execute("COMMIT")
+                return None, False
+
+            abandoned = row["attempts"] >= self.max_attempts
+            if abandoned:
+                error = {"status_code": 500, "detail": "Job abandoned after repeated worker failures."}
+                db.execute(
+                    "UPDATE jobs SET status = 'failed', error = ?, finished_at = ? WHERE id = ?",
+                    (json.dumps(error), now, row["id"]),
+                )
+            else:
+                db.execute(
+                    "UPDATE jobs SET status = 'running', attempts = attempts + 1,"
+                    " started_at = ?, lease_expires_at = ?, lease_owner = ? WHERE id = ?",
+                    (now, now + self.lease_seconds, self.owner, row["id"]),
+                )
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        return row, abandoned
+
+    # State changes below only apply while this process still holds the
+    # lease; a job whose lease was lost belongs to whoever reclaimed it.
+    def _finish(self, job: Dict[str, Any], status: str, result: Any = None, error: Any = None) -> None:
+        cur = self._db().execute(
+            "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?,"
+            " lease_expires_at = NULL, lease_owner = NULL WHERE id = ? AND lease_owner = ?",
+            (
+                status,
+                json.dumps(result) if result is not None else None,
+                json.dumps(error) if error is not None else None,
+                time.time(),
+                job["id"],
+                self.owner,
+            ),
+        )
+        if cur.rowcount:
+            self._remove_upload(job.get("upload_path"))
+
+    def _requeue(self, job: Dict[str, Any], error: Dict[str, Any]) -> None:
+        self._db().execute(
+            "UPDATE jobs SET status = 'queued', error = ?, lease_expires_at = NULL, lease_owner = NULL"
+            " WHERE id = ? AND lease_owner = ?",
+            (json.dumps(error), job["id"], self.owner),
+        )
+
+    def _defer(self, job: Dict[str, Any], exc: JobRetry) -> None:
+        # The attempt is given back: the job did not fail, the server was busy.
+        delay = max(exc.retry_after, min(_RETRY_MAX_SECONDS, _RETRY_BASE_SECONDS * 2 ** job["deferrals"]))
+        self._db().execute(
+            "UPDATE jobs SET status = 'queued', error = ?, lease_expires_at = NULL, lease_owner = NULL,"
+            " attempts = attempts - 1, deferrals = deferrals + 1, available_at = ?"
+            " WHERE id = ? AND lease_owner = ?",
+            (json.dumps(exc.error), time.time() + delay, job["id"], self.owner),
+        )
+
+    def renew_leases(self) -> int:
+        """Extend the leases of every job this process is running. Returns how many."""
+        cur = self._db().execute(
+            "UPDATE jobs SET lease_expires_at = ? WHERE status = 'running' AND lease_owner = ?",
+            (time.time() + self.lease_seconds, self.owner),
+        )
+        return cur.rowcount
+
+    def reclaim_stale(self) -> int:
+        """
+        Requeue running jobs held by processes on this host that no longer
+        exist (or whose pid now belongs to another process, e.g. pid 1 after
+        a container restart), without waiting for their leases to expire.
+        Jobs of other hosts are left to lease expiry. Returns how many.
+        """
+        host = socket.gethostname()
+        stale = []
+        for row in self._db().execute("SELECT id, lease_owner FROM jobs WHERE status = 'running'"):
+            owner = row["lease_owner"] or ""
+            if owner != self.owner and owner.split(":")[0] == host and not _owner_alive(owner, self.owner):
+                stale.append(row["id"])
+        for job_id in stale:
+            self._db().execute(
+                "UPDATE jobs SET status = 'queued', lease_expires_at = NULL, lease_owner = NULL"
+                " WHERE id = ? AND status = 'running'",
+                (job_id,),
+            )
+        return len(stale)
+
+    @staticmethod
+    def _remove_upload(path: Optional[str]) -> None:
+        if path and os.path.exists(path):
+            os.remove(path)
+
+    def run_one(self) -> bool:
+        """Claim and execute a single job. Returns False when nothing was runnable."""
+        job = self.claim()
+        if job is None:
+            return False
+        handler = self._handlers.get(job["kind"])
+        if handler is None:
+            self._finish(job, "failed", error={"status_code": 500, "detail": f"Unknown job kind: {job['kind']}"})
+            return True
+        self._ensure_heartbeat()
+        try:
+            result = handler(job)
+        except JobRejected as exc:
+            self._finish(job, "failed", error=exc.error)
+        except JobRetry as exc:
+            self._defer(job, exc)
+        except Exception as exc:  # transient: retry until max_attempts
+            error = {"status_code": 500, "detail": f"{type(exc).__name__}: {exc}"}
+            if job["attempts"] >= self.max_attempts:
+                self._finish(job, "failed", error=error)
+            else:
+                self._requeue(job, error)
+        else:
+            self._finish(job, "succeeded", result=result)
+        return True
+
+    def purge(self, older_than_seconds: float) -> int:
+        """Delete finished jobs older than the given age."""
+        cutoff = time.time() - older_than_seconds
+        cur = self._db().execute(
+            "DELETE FROM jobs WHERE status IN ('succeeded', 'failed') AND finished_at < ?", (cutoff,)
+        )
+        return cur.rowcount
+
+    def register(self, kind: str, handler: Handler) -> None:
+        self._handlers[kind] = handler
+
+    def start(self) -> None:
+        """Reclaim jobs of dead local workers, then start `concurrency` daemon worker threads (idempotent)."""
+        if any(t.is_alive() for t in self._threads):
+            return
+        self._stop.clear()
+        self.reclaim_stale()
+        self._threads = [
+            threading.Thread(target=self._worker_loop, name=f"jobs-worker-{i}", daemon=True)
+            for i in range(self.concurrency)
+        ]
+        for t in self._threads:
+            t.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Ask workers to exit after their current job."""
+        self._stop.set()
+        for t in self._threads:
+            t.join(timeout)
+
+    def _ensure_heartbeat(self) -> None:
+        if self._heartbeat is None or not self._heartbeat.is_alive():
+            self._heartbeat = threading.Thread(target=self._heartbeat_loop, name="jobs-heartbeat", daemon=True)
+            self._heartbeat.start()
+
+    def _heartbeat_loop(self) -> None:
+        # Keeps renewing after stop() so jobs still finishing keep their lease.
+        while True:
+            time.sleep(self.lease_seconds / 3)
+            try:
+                self.renew_leases()
+            except sqlite3.Error:
+                pass  # retried on the next beat, well before the lease runs out
+
+    def _worker_loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                ran = self.run_one()
+            except sqlite3.Error:
+                ran = False
+            if not ran:
+                self._stop.wait(_POLL_SECONDS)
+
+
+def _owner_alive(owner: str, own: str) -> bool:
+    """Whether the process behind lease owner id `owner` (of this host) still runs."""
+    parts = owner.split(":")
+    if len(parts) != 3 or not parts[1].isdigit():
+        return True  # unknown format: leave it to lease expiry
+    if parts[1] == own.split(":")[1]:
+        return False  # our pid under another owner id: an earlier process (e.g. pid 1 before a restart)
+    try:
+        os.kill(int(parts[1]), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+@lru_cache(maxsize=1)
+def get_job_queue() -> JobQueue:
+    """Lazily open the process-wide job queue."""
+    queue = JobQueue(
+        JOBS_DIR,
+        concurrency=JOBS_CONCURRENCY,
+        kind_limits=parse_kind_limits(JOBS_KIND_LIMITS),
+        max_attempts=JOBS_MAX_ATTEMPTS,
+        lease_seconds=JOBS_LEASE_SECONDS,
+        max_queued=JOBS_MAX_QUEUED,
+    )
+    queue.purge(JOBS_RETENTION_SECONDS)
+    return queue
@@ -2,6 +2,9 @@
 Media utilities for handling video/audio operations.
 
 - Extract audio (WAV) from an MP4 file using ffmpeg binary (installed in the Docker image).
+- Decode an upload straight to 16 kHz float32 PCM in memory (no temp files),
+  ready to be passed to Whisper as a NumPy array.
+- Probe container duration and streams from the upload header before decoding.
 - Keep it minimal and CPU-friendly.
 
 This module does NOT require any paid services.
@@ -9,9 +12,28 @@ This module does NOT require any paid services.
 
 from __future__ import annotations
 
+import io
+import json
+import os
+import shutil
 import subprocess
+import tempfile
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Tuple
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.metrics import stage
+
+# Whisper expects mono 16 kHz audio.
+SAMPLE_RATE = 16000
+
+_STREAM_BLOCK = 1024 * 1024
+
+# Bytes of the upload handed to ffprobe for the fast header probe.
+PROBE_HEADER_BYTES = int(os.getenv("MEDIA_PROBE_HEADER_BYTES", str(4 * 1024 * 1024)))
 
 
 def extract_wav_from_mp4(
@@ -46,7 +68,8 @@ def extract_wav_from_mp4(
         "-f", "wav",
         str(wav_path),
     ]
-    proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    with stage("ffmpeg_decode"):
+        proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
     if proc.returncode != 0:
         raise RuntimeError(f"ffmpeg failed extracting audio: {proc.stderr.decode('utf-8', errors='ignore')}")
 
@@ -58,7 +81,8 @@ def extract_wav_from_mp4(
         "-of", "default=nw=1:nk=1",
         str(wav_path),
     ]
-    probe = subprocess.run(probe_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    with stage("ffprobe"):
+        probe = subprocess.run(probe_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
     if probe.returncode != 0:
         # Fallback: return unknown duration as 0.0 if probing fails
         return wav_path, 0.0
@@ -68,4 +92,232 @@ def extract_wav_from_mp4(
     except Exception:
         duration = 0.0
 
-    return wav_path, duration
\ No newline at end of file
+    return wav_path, duration
+
+
+def _descriptor_path(fileobj: BinaryIO) -> Optional[Tuple[str, int]]:
+    """
+    (/dev/fd/N, N) when `fileobj` is a seekable file backed by a real
+    descriptor, else None. In-memory spooled uploads are not forced to disk.
+    """
+    if isinstance(fileobj, tempfile.SpooledTemporaryFile) and not getattr(fileobj, "_rolled", True):
+        return None
+    try:
+        fd = fileobj.fileno()
+        seekable = fileobj.seekable()
+    except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+        return None
+    path = f"/dev/fd/{fd}"
+    return (path, fd) if seekable and os.path.exists(path) else None
+
+
+@contextmanager
+def _seekable_input(fileobj: BinaryIO) -> Iterator[Tuple[str, Tuple[int, ...]]]:
+    """
+    Yield an ffmpeg input path for a seekable view of `fileobj` plus the fds to pass.
+
+    Files backed by a descriptor are exposed as /dev/fd/N (no copy); anything
+    else is spilled to a temporary file.
+    """
+    described = _descriptor_path(fileobj)
+    if described is not None:
+        path, fd = described
+        yield path, (fd,)
+        return
+
+    with tempfile.NamedTemporaryFile(suffix=".mp4") as tmp:
+        with stage("upload_copy"):
+            fileobj.seek(0)
+            shutil.copyfileobj(fileobj, tmp, _STREAM_BLOCK)
+            tmp.flush()
+        yield tmp.name, ()
+
+
+def _pcm_command(source: str, sample_rate: int, channels: int) -> List[str]:
+    return [
+        "ffmpeg",
+        "-hide_banner",
+        "-loglevel", "error",
+        "-i", source,
+        "-vn",               # no video
+        "-ac", str(channels),
+        "-ar", str(sample_rate),
+        "-f", "f32le",       # raw little-endian float32
+        "pipe:1",
+    ]
+
+
+def _run_pcm_decoder(cmd: List[str], fileobj: BinaryIO | None, pass_fds: Tuple[int, ...] = ()) -> Tuple[int, bytearray, bytes]:
+    """
+    Run ffmpeg, optionally feeding `fileobj` to stdin from a writer thread,
+    and collect raw PCM from stdout. Returns (returncode, pcm_bytes, stderr).
+    """
+    proc = subprocess.Popen(
+        cmd,
+        stdin=subprocess.PIPE if fileobj is not None else subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        pass_fds=pass_fds,
+    )
+    stderr_chunks: List[bytes] = []
+
+    def feed() -> None:
+        try:
+            for block in iter(lambda: fileobj.read(_STREAM_BLOCK), b""):
+                proc.stdin.write(block)
+        except (BrokenPipeError, ValueError):
+            pass  # ffmpeg stopped reading (error or unseekable input)
+        finally:
+            try:
+                proc.stdin.close()
+            except (BrokenPipeError, OSError):
+                pass
+
+    threads = [threading.Thread(target=lambda: stderr_chunks.append(proc.stderr.read()), daemon=True)]
+    if fileobj is not None:
+        threads.append(threading.Thread(target=feed, daemon=True))
+    for t in threads:
+        t.start()
+
+    pcm = bytearray()
+    for block in iter(lambda: proc.stdout.read(_STREAM_BLOCK), b""):
+        pcm.extend(block)
+    returncode = proc.wait()
+    for t in threads:
+        t.join()
+    return returncode, pcm, b"".join(stderr_chunks)
+
+
+def decode_audio_stream(
+    fileobj: BinaryIO, sample_rate: int = SAMPLE_RATE, channels: int = 1
+) -> np.ndarray:
+    """
+    Decode the audio track of an uploaded video into a float32 NumPy array.
+
+    PCM is read from ffmpeg's stdout, so no WAV file is written and Whisper
+    does not need to run ffmpeg again. Uploads backed by a real file
+    descriptor (uploads spooled to disk, job files) are opened by ffmpeg as
+    /dev/fd/N, which can seek to an MP4 index (moov atom) at the end of the
+    file, so they decode in a single pass. Other inputs are streamed into
+    ffmpeg's stdin; when that fails because the index is at the end, the
+    decode is retried once on a temporary copy.
+
+    Args:
+        fileobj: readable binary file object positioned at the start of the upload.
+        sample_rate: Target sample rate in Hz (default 16k).
+        channels: Target number of channels (default mono = 1).
+
+    Returns:
+        1-D float32 array of samples in [-1, 1] (interleaved if channels > 1).
+
+    Raises:
+        RuntimeError: if ffmpeg cannot decode the input.
+    """
+    described = _descriptor_path(fileobj)
+    if described is not None:
+        path, fd = described
+        fileobj.seek(0)  # /dev/fd may share the file offset (e.g. on macOS)
+        with stage("ffmpeg_decode"):
+            returncode, pcm, stderr = _run_pcm_decoder(_pcm_command(path, sample_rate, channels), None, (fd,))
+    else:
+        with stage("ffmpeg_decode"):
+            returncode, pcm, stderr = _run_pcm_decoder(_pcm_command("pipe:0", sample_rate, channels), fileobj)
+
+    if returncode != 0 and described is None and fileobj.seekable():
+        fileobj.seek(0)
+        with _seekable_input(fileobj) as (source, pass_fds), stage("ffmpeg_decode"):
+            returncode, pcm, stderr = _run_pcm_decoder(
+                _pcm_command(source, sample_rate, channels), None, pass_fds
+            )
+
+    if returncode != 0:
+        raise RuntimeError(f"ffmpeg failed extracting audio: {stderr.decode('utf-8', errors='ignore')}")
+
+    usable = len(pcm) - (len(pcm) % 4)
+    return np.frombuffer(pcm, dtype=np.float32, count=usable // 4)
+
+
+def audio_duration_seconds(audio: np.ndarray, sample_rate: int = SAMPLE_RATE, channels: int = 1) -> float:
+    """Duration of a decoded PCM buffer in seconds."""
+    return float(audio.shape[0]) / float(sample_rate * channels)
+
+
+def _ffprobe_command(source: str) -> List[str]:
+    return [
+        "ffprobe",
+        "-v", "error",
+        "-show_entries", "format=duration,format_name:stream=codec_type,codec_name,sample_rate,channels,duration",
+        "-of", "json",
+        source,
+    ]
+
+
+def _parse_probe(raw: bytes) -> Optional[Dict[str, Any]]:
+    try:
+        data = json.loads(raw.decode("utf-8", errors="ignore") or "{}")
+    except ValueError:
+        return None
+    streams = data.get("streams") or []
+    fmt = data.get("format") or {}
+    durations = [fmt.get("duration")] + [st.get("duration") for st in streams]
+    duration = None
+    for value in durations:
+        try:
+            duration = max(duration or 0.0, float(value))
+        except (TypeError, ValueError):
+            continue
+    if not streams and duration is None:
+        return None
+    return {
+        "duration_seconds": duration,
+        "format_name": fmt.get("format_name"),
+        "has_audio": any(st.get("codec_type") == "audio" for st in streams),
+        "streams": [
+            {
+                "codec_type": st.get("codec_type"),
+                "codec_name": st.get("codec_name"),
+                "sample_rate": st.get("sample_rate"),
+                "channels": st.get("channels"),
+            }
+            for st in streams
+        ],
+    }
+
+
+def probe_media(fileobj: BinaryIO) -> Dict[str, Any]:
+    """
+    Read container duration and stream metadata without decoding any media.
+
+    First only the upload header (PROBE_HEADER_BYTES) is piped to ffprobe,
+    which is enough for "fast start" MP4s. When the index is at the end of the
+    file, ffprobe is run again on a seekable view so it can jump to it.
+    The read position of `fileobj` is restored to 0.
+
+    Returns:
+        dict with `duration_seconds` (float or None), `format_name`,
+        `has_audio` and a `streams` summary.
+
+    Raises:
+        RuntimeError: if ffprobe cannot read the container at all.
+    """
+    fileobj.seek(0)
+    header = fileobj.read(PROBE_HEADER_BYTES)
+    fileobj.seek(0)
+    with stage("ffprobe"):
+        probe = subprocess.run(
+            _ffprobe_command("pipe:0"), input=header, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+    info = _parse_probe(probe.stdout) if probe.returncode == 0 else None
+
+    if (info is None or info["duration_seconds"] is None) and fileobj.seekable():
+        with _seekable_input(fileobj) as (source, pass_fds), stage("ffprobe"):
+            probe = subprocess.run(
+                _ffprobe_command(source), stdout=subprocess.PIPE, stderr=subprocess.PIPE, pass_fds=pass_fds
+            )
+        fileobj.seek(0)
+        if probe.returncode == 0:
+            info = _parse_probe(probe.stdout) or info
+
+    if info is None:
+        raise RuntimeError(f"ffprobe could not read the media: {probe.stderr.decode('utf-8', errors='ignore')}")
+    return info
@@ -4,10 +4,33 @@ Speech-to-text (ASR) service using open-source Whisper (CPU-friendly).
 - Package: open-source `whisper` (a.k.a. openai-whisper) under MIT License.
 - Runs fully on CPU; no external paid services.
 - Auto-detects language; returns verbatim transcript.
+- Long in-memory audio can be transcribed by windows in a process pool
+  (see app/services/speech/parallel_asr.py, opt-in via ASR_PARALLEL_WORKERS).
+- Optional (opt-in) energy-based VAD pre-pass: only speech regions reach
+  Whisper and segment timestamps are mapped back to the original timeline.
+- Streaming mode: windows are decoded in order and yielded as soon as they
+  are ready, so downstream stages (summarization) can start early.
+- Several Whisper sizes can be served (ASR_MODELS aliases, picked per request)
+  through the shared model registry (RAM budget, idle eviction). The process
+  pool only serves the default model; other sizes run in-process.
+- Decoding profiles ("fast", "balanced", "accurate") set beam search, best-of,
+  temperature fallback, conditioning on previous text and the
+  compression/no-speech thresholds; a language hint skips detection.
 
 Environment variables:
 - WHISPER_MODEL (default: "small")   # other options: "base", "medium" (larger = slower)
 - WHISPER_COMPUTE_TYPE ignored for openai-whisper; used by faster-whisper only.
+- ASR_MODELS: selectable sizes as "alias=size" pairs (default: "fast=tiny,quality=base")
+- ASR_VAD_ENABLED: skip silent stretches before ASR (default: 0; opt-in until
+  validated on real recordings, since dropped speech is lost from the transcript)
+- ASR_VAD_MIN_RMS: absolute energy floor for speech frames (default: 0.003)
+- ASR_VAD_MARGIN_DB: speech threshold above the noise floor, in dB (default: 6)
+- ASR_VAD_PAD_MS: padding kept around each speech region (default: 400)
+- ASR_STREAM_WINDOW_SECONDS: window length used by the streaming mode (default: 60)
+- ASR_STREAM_EVENT_WINDOW_SECONDS: shorter window used when segments are streamed to
+  the client (/transcribe/video/stream), so each window is about one Whisper
+  decoding pass (30 s of audio) and its segments are sent as soon as it is decoded (default: 25)
+- ASR_PROFILE: default decoding profile (default: "balanced")
 
 Note: We deliberately use openai-whisper since torch is already in your stack.
 """
@@ -15,39 +38,367 @@ Note: We deliberately use openai-whisper since torch is already in your stack.
 from __future__ import annotations
 
 import os
-from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Iterator, List, Optional, Tuple, Union
 
-import whisper  # open-source speech-to-text
+import numpy as np
+
+from app.core import metrics
+from app.core.model_registry import model_registry, parse_model_aliases, torch_module_bytes
+from app.core.torch_runtime import configure_torch_threads
+from app.services.speech.parallel_asr import (
+    iter_transcribe_parallel,
+    parallel_enabled,
+    shift_segments,
+    transcribe_parallel,
+)
+from app.services.speech.segmentation import (
+    compact_regions,
+    detect_speech_regions,
+    map_to_original,
+    split_on_silence,
+)
 
 
 DEFAULT_WHISPER_MODEL = os.getenv("WHISPER_MODEL", "tiny")
+ASR_MODEL_ALIASES = parse_model_aliases(os.getenv("ASR_MODELS", "fast=tiny,quality=base"))
+AVAILABLE_ASR_MODELS = sorted({DEFAULT_WHISPER_MODEL, *ASR_MODEL_ALIASES.values()})
+
+# Approximate fp32 weight sizes, used to plan evictions before a model is loaded.
+WHISPER_SIZE_HINTS_MB = {"tiny": 150, "base": 290, "small": 970, "medium": 3050, "large": 6200}
+
+SAMPLE_RATE = 16000
+VAD_ENABLED = os.getenv("ASR_VAD_ENABLED", "0") == "1"
+VAD_MIN_RMS = float(os.getenv("ASR_VAD_MIN_RMS", "0.003"))
+VAD_MARGIN_DB = float(os.getenv("ASR_VAD_MARGIN_DB", "6"))
+VAD_PAD_MS = int(os.getenv("ASR_VAD_PAD_MS", "400"))
+# Below this fraction of removable silence, the VAD result is not applied.
+VAD_MIN_SAVINGS = 0.05
+
+STREAM_WINDOW_SECONDS = float(os.getenv("ASR_STREAM_WINDOW_SECONDS", "60"))
+STREAM_EVENT_WINDOW_SECONDS = float(os.getenv("ASR_STREAM_EVENT_WINDOW_SECONDS", "25"))
+
+_FALLBACK_TEMPERATURES = (0.0, 0.2, 0.4, 0.6, 0.8, 1.0)
+_THRESHOLDS = {"compression_ratio_threshold": 2.4, "logprob_threshold": -1.0, "no_speech_threshold": 0.6}
 
+# Extra Whisper `transcribe()` arguments per profile. Whisper drops beam_size
+# when it falls back to sampling (temperature > 0) and best_of at temperature 0,
+# so a profile can set both.
+DECODING_PROFILES: Dict[str, Dict[str, Any]] = {
+    # Greedy, no temperature fallback, windows decoded independently.
+    "fast": {"temperature": 0.0, "condition_on_previous_text": False, **_THRESHOLDS},
+    # Whisper's defaults: greedy with temperature fallback on repetitive/low-confidence output.
+    "balanced": {"temperature": _FALLBACK_TEMPERATURES, "condition_on_previous_text": True, **_THRESHOLDS},
+    # Beam search, 5 samples per fallback temperature.
+    "accurate": {
+        "temperature": _FALLBACK_TEMPERATURES,
+        "beam_size": 5,
+        "best_of": 5,
+        "condition_on_previous_text": True,
+        **_THRESHOLDS,
+    },
+}
+# Relative CPU cost of each profile, applied to the admission estimate.
+PROFILE_COST_FACTORS = {"fast": 0.6, "balanced": 1.0, "accurate": 2.5}
+DEFAULT_PROFILE = os.getenv("ASR_PROFILE", "balanced")
 
-@lru_cache(maxsize=1)
-def get_asr_model():
+
+def resolve_asr_model(name: Optional[str] = None) -> str:
     """
-    Lazily load and cache the Whisper model in CPU mode.
+    Map a requested Whisper size (alias, size, or None for WHISPER_MODEL) to a size.
+
+    Raises:
+        ValueError: the size is not in ASR_MODELS.
     """
-    model = whisper.load_model(DEFAULT_WHISPER_MODEL, device="cpu")
-    return model
+    if not name:
+        return DEFAULT_WHISPER_MODEL
+    size = ASR_MODEL_ALIASES.get(name, name)
+    if size not in AVAILABLE_ASR_MODELS:
+        raise ValueError(
+            f"Unknown speech model '{name}'. Available: {', '.join(sorted(ASR_MODEL_ALIASES) + AVAILABLE_ASR_MODELS)}."
+        )
+    return size
 
 
-def transcribe_wav(wav_path: Path) -> Tuple[str, str, Dict[str, Any]]:
+def resolve_profile(name: Optional[str] = None) -> str:
+    """
+    Return the decoding profile name (ASR_PROFILE when None).
+
+    Raises:
+        ValueError: the profile does not exist.
     """
-    Transcribe a WAV file (mono 16k recommended) and return the verbatim text,
-    the detected language code, and raw info dict.
+    profile = name or DEFAULT_PROFILE
+    if profile not in DECODING_PROFILES:
+        raise ValueError(f"Unknown decoding profile '{profile}'. Available: {', '.join(DECODING_PROFILES)}.")
+    return profile
+
+
+def resolve_language(language: Optional[str] = None) -> Optional[str]:
+    """
+    Normalize a language hint ("es", "Spanish", ...) to a Whisper language code.
+
+    Raises:
+        ValueError: Whisper does not support the language.
+    """
+    if not language:
+        return None
+    # Imported here (pulls in torch); only needed when a hint is given.
+    from whisper.tokenizer import LANGUAGES, TO_LANGUAGE_CODE
+
+    code = language.strip().lower()
+    code = TO_LANGUAGE_CODE.get(code, code)
+    if code not in LANGUAGES:
+        raise ValueError(f"Unsupported language '{language}'. Use a Whisper language code such as 'en' or 'es'.")
+    return code
+
+
+def _load_whisper(size: str):
+    # Imported here (pulls in torch) so startup does not pay for it.
+    import whisper  # open-source speech-to-text
+
+    configure_torch_threads()
+    return whisper.load_model(size, device="cpu")
+
+
+model_registry.register(
+    "asr",
+    loader=_load_whisper,
+    sizer=torch_module_bytes,
+    size_hints_mb=WHISPER_SIZE_HINTS_MB,
+)
+
+
+def get_asr_model(model: Optional[str] = None):
+    """
+    Return the Whisper model (CPU) for `model`, loading it through the model registry if needed.
+    """
+    return model_registry.get("asr", resolve_asr_model(model))
+
+
+def warmup(model: Optional[str] = None) -> None:
+    """Load the Whisper model and decode one second of silence (no VAD, no pool)."""
+    with model_registry.use("asr", resolve_asr_model(model)) as asr_model:
+        asr_model.transcribe(
+            np.zeros(SAMPLE_RATE, dtype=np.float32), task="transcribe", language="en", verbose=None, fp16=False
+        )
+
+
+def transcribe_audio(
+    audio: Union[np.ndarray, Path, str],
+    vad: bool | None = None,
+    model: Optional[str] = None,
+    profile: Optional[str] = None,
+    language: Optional[str] = None,
+) -> Tuple[str, str, Dict[str, Any]]:
+    """
+    Transcribe audio and return the verbatim text, the detected language code,
+    and raw info dict.
 
     Args:
-        wav_path: path to a WAV audio file.
+        audio: mono 16 kHz float32 PCM array (no extra ffmpeg pass), or a path
+               to an audio file (decoded by Whisper through ffmpeg).
+        vad: run the VAD pre-pass on PCM input (default: ASR_VAD_ENABLED).
+        model: Whisper size or alias (default: WHISPER_MODEL); see `resolve_asr_model`.
+        profile: decoding profile (default: ASR_PROFILE); see DECODING_PROFILES.
+        language: language code hint (skips detection); see `resolve_language`.
 
     Returns:
         transcript_text, language_code, raw_info
+        (raw_info["vad"] holds speech/silence stats when the VAD ran,
+        raw_info["profile"] the decoding profile used)
     """
-    model = get_asr_model()
+    size = resolve_asr_model(model)
+    profile = resolve_profile(profile)
+    options = DECODING_PROFILES[profile]
+    language = resolve_language(language)
+    use_vad = VAD_ENABLED if vad is None else vad
+    if isinstance(audio, np.ndarray) and use_vad:
+        text, lang, raw = _transcribe_speech_only(audio, size, options, language)
+    else:
+        text, lang, raw = _transcribe(audio, size, options, language)
+    raw["profile"] = profile
+    return text, lang, raw
+
+
+def _use_pool(size: str, n_samples: int) -> bool:
+    # The process pool holds copies of the default model only.
+    return size == DEFAULT_WHISPER_MODEL and parallel_enabled(n_samples)
+
+
+def _record_decode(size: str, audio_seconds: float, wall_seconds: float) -> None:
+    metrics.inc("asr_audio_seconds_total", audio_seconds, size)
+    if wall_seconds > 0:
+        metrics.observe("asr_realtime_factor", audio_seconds / wall_seconds, size)
+
+
+def _transcribe(
+    audio: Union[np.ndarray, Path, str],
+    size: str,
+    options: Dict[str, Any],
+    language: Optional[str] = None,
+) -> Tuple[str, str, Dict[str, Any]]:
+    if isinstance(audio, np.ndarray) and _use_pool(size, audio.shape[0]):
+        with metrics.stage("whisper_decode") as timer:
+            out = transcribe_parallel(audio, size, language, options)
+        _record_decode(size, audio.shape[0] / SAMPLE_RATE, timer.seconds)
+        return out
+
+    if isinstance(audio, Path):
+        audio = str(audio)
     # `translate=False` keeps the original language; automatic language detection is included.
-    result = model.transcribe(str(wav_path), task="transcribe", verbose=False, fp16=False)
+    with model_registry.use("asr", size) as asr_model, metrics.stage("whisper_decode") as timer:
+        result = asr_model.transcribe(
+            audio, task="transcribe", language=language, verbose=False, fp16=False, **options
+        )
+    if isinstance(audio, np.ndarray):
+        _record_decode(size, audio.shape[0] / SAMPLE_RATE, timer.seconds)
     text = (result.get("text") or "").strip()
     lang = result.get("language") or "unknown"
-    return text, lang, result
\ No newline at end of file
+    return text, lang, result
+
+
+def _vad_prepare(
+    audio: np.ndarray,
+) -> Tuple[Optional[np.ndarray], Optional[List[Tuple[float, float]]], Dict[str, Any]]:
+    """
+    Run the VAD and decide what to send to Whisper.
+
+    Returns:
+        (asr_audio, mapping, stats): `asr_audio` is None when there is no
+        speech at all; `mapping` is None when the original audio is used as-is.
+    """
+    total = audio.shape[0] / SAMPLE_RATE
+    with metrics.stage("vad"):
+        regions = detect_speech_regions(
+            audio, SAMPLE_RATE, min_rms=VAD_MIN_RMS, margin_db=VAD_MARGIN_DB, pad_ms=VAD_PAD_MS
+        )
+    speech = sum(end - start for start, end in regions) / SAMPLE_RATE
+    stats = {
+        "speech_seconds": round(speech, 3),
+        "silence_seconds": round(max(0.0, total - speech), 3),
+        "speech_ratio": round(speech / total, 4) if total else 0.0,
+        "regions": len(regions),
+        "applied": False,
+    }
+
+    if not regions:
+        return None, None, stats
+    if total and (total - speech) / total < VAD_MIN_SAVINGS:
+        return audio, None, stats
+
+    compact, mapping = compact_regions(audio, regions, SAMPLE_RATE)
+    stats["applied"] = True
+    return compact, mapping, stats
+
+
+def _remap_segments(segments: List[Dict[str, Any]], mapping: Optional[List[Tuple[float, float]]]) -> None:
+    if not mapping:
+        return
+    for seg in segments:
+        seg["start"] = map_to_original(float(seg.get("start", 0.0)), mapping)
+        seg["end"] = map_to_original(float(seg.get("end", 0.0)), mapping)
+
+
+def _transcribe_speech_only(
+    audio: np.ndarray,
+    size: str,
+    options: Dict[str, Any],
+    language: Optional[str] = None,
+) -> Tuple[str, str, Dict[str, Any]]:
+    """VAD pre-pass: transcribe only speech regions and remap timestamps."""
+    asr_audio, mapping, stats = _vad_prepare(audio)
+    if asr_audio is None:
+        return "", language or "unknown", {"text": "", "segments": [], "vad": stats}
+
+    text, lang, raw = _transcribe(asr_audio, size, options, language)
+    _remap_segments(raw.get("segments") or [], mapping)
+    raw["vad"] = stats
+    return text, lang, raw
+
+
+def stream_transcribe_audio(
+    audio: np.ndarray,
+    vad: bool | None = None,
+    model: Optional[str] = None,
+    profile: Optional[str] = None,
+    language: Optional[str] = None,
+    window_seconds: Optional[float] = None,
+) -> Tuple[Dict[str, Any], Iterator[Dict[str, Any]]]:
+    """
+    Transcribe PCM window by window, yielding results as they are decoded.
+
+    Windows are cut at silences (~`window_seconds`, default
+    ASR_STREAM_WINDOW_SECONDS, within +/- a fifth of it). The language is
+    detected on the first window (unless `language` is given) and reused for
+    the rest. With the process pool enabled, all windows are decoded in
+    parallel and yielded in order. `profile` as in `transcribe_audio`.
+
+    Returns:
+        (vad_stats, iterator) where each item is a dict with `language`,
+        `text` and `segments` (timestamps on the original timeline).
+        `vad_stats` is empty when the VAD pre-pass is disabled.
+    """
+    size = resolve_asr_model(model)
+    options = DECODING_PROFILES[resolve_profile(profile)]
+    language = resolve_language(language)
+    use_vad = VAD_ENABLED if vad is None else vad
+    asr_audio, mapping, stats = _vad_prepare(audio) if use_vad else (audio, None, {})
+
+    def windows_iter() -> Iterator[Dict[str, Any]]:
+        if asr_audio is None or asr_audio.shape[0] == 0:
+            return
+        target = window_seconds or STREAM_WINDOW_SECONDS
+        windows = split_on_silence(asr_audio, SAMPLE_RATE, target, search_seconds=min(10.0, target / 5))
+
+        if _use_pool(size, asr_audio.shape[0]):
+            results = iter_transcribe_parallel(asr_audio, size, windows, language, options)
+        else:
+            results = _iter_transcribe_sequential(asr_audio, windows, size, options, language)
+
+        decode_seconds = 0.0
+        while True:
+            # Time only the wait for the next window, not the consumer's work.
+            with metrics.stage("whisper_decode") as timer:
+                item = next(results, None)
+            decode_seconds += timer.seconds
+            if item is None:
+                break
+            start, lang, result = item
+            segments = shift_segments(result.get("segments") or [], start / SAMPLE_RATE)
+            _remap_segments(segments, mapping)
+            yield {
+                "language": lang or "unknown",
+                "text": (result.get("text") or "").strip(),
+                "segments": segments,
+            }
+        _record_decode(size, asr_audio.shape[0] / SAMPLE_RATE, decode_seconds)
+
+    return stats, windows_iter()
+
+
+def _iter_transcribe_sequential(
+    audio: np.ndarray,
+    windows: List[Tuple[int, int]],
+    size: str,
+    options: Dict[str, Any],
+    language: Optional[str] = None,
+) -> Iterator[Tuple[int, str, Dict[str, Any]]]:
+    for start, end in windows:
+        # Pinned per window only, so a paused consumer does not hold the model.
+        with model_registry.use("asr", size) as asr_model:
+            result = asr_model.transcribe(
+                audio[start:end], task="transcribe", language=language, verbose=None, fp16=False, **options
+            )
+        language = language or result.get("language")
+        yield start, language, result
+
+
+def transcribe_wav(
+    wav_path: Path,
+    profile: Optional[str] = None,
+    language: Optional[str] = None,
+) -> Tuple[str, str, Dict[str, Any]]:
+    """
+    Transcribe a WAV file (mono 16k recommended). See `transcribe_audio`.
+    """
+    return transcribe_audio(wav_path, profile=profile, language=language)
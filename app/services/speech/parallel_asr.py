@@ -0,0 +1,159 @@
+"""
+Parallel Whisper transcription across a pool of worker processes.
+
+- Long audio is split at silence boundaries into windows (~ASR_PARALLEL_WINDOW_SECONDS).
+- Each worker process loads its own Whisper model once and transcribes windows.
+- Language is detected once (on the first window) and reused for every window,
+  unless the caller passes it.
+- Whisper decoding options (see DECODING_PROFILES in asr_service) are passed
+  through to every window.
+- Segments are stitched back with timestamps shifted to the original timeline.
+
+Environment variables:
+- ASR_PARALLEL_WORKERS: number of worker processes; 0 or 1 disables parallel mode (default: 0)
+- ASR_PARALLEL_WINDOW_SECONDS: target window length in seconds (default: 60)
+- ASR_PARALLEL_MIN_SECONDS: only audio at least this long is parallelized (default: 90)
+- ASR_WORKER_THREADS: torch threads per worker process (default: 1)
+
+Each worker holds a full copy of the model, so size the pool with the
+container memory limit in mind.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.speech.segmentation import split_on_silence
+
+ASR_PARALLEL_WORKERS = int(os.getenv("ASR_PARALLEL_WORKERS", "0"))
+ASR_PARALLEL_WINDOW_SECONDS = float(os.getenv("ASR_PARALLEL_WINDOW_SECONDS", "60"))
+ASR_PARALLEL_MIN_SECONDS = float(os.getenv("ASR_PARALLEL_MIN_SECONDS", "90"))
+ASR_WORKER_THREADS = int(os.getenv("ASR_WORKER_THREADS", "1"))
+
+SAMPLE_RATE = 16000
+
+# ---------- worker process side ----------
+_worker_model = None
+
+
+def _init_worker(model_name: str, threads: int) -> None:
+    """Process initializer: load Whisper once per worker."""
+    global _worker_model
+    import torch
+    import whisper
+
+    torch.set_num_threads(max(1, threads))
+    _worker_model = whisper.load_model(model_name, device="cpu")
+
+
+def _detect_language(audio: np.ndarray) -> str:
+    import whisper
+
+    mel = whisper.log_mel_spectrogram(whisper.pad_or_trim(audio), _worker_model.dims.n_mels)
+    _, probs = _worker_model.detect_language(mel)
+    return max(probs, key=probs.get)
+
+
+def _transcribe_window(audio: np.ndarray, language: Optional[str], options: Dict[str, Any]) -> Dict[str, Any]:
+    return _worker_model.transcribe(
+        audio, task="transcribe", language=language, verbose=None, fp16=False, **options
+    )
+
+
+# ---------- parent process side ----------
+def parallel_enabled(n_samples: int) -> bool:
+    """Whether audio of `n_samples` should go through the process pool."""
+    return ASR_PARALLEL_WORKERS > 1 and n_samples >= ASR_PARALLEL_MIN_SECONDS * SAMPLE_RATE
+
+
+@lru_cache(maxsize=1)
+def get_asr_pool(model_name: str) -> ProcessPoolExecutor:
+    """
+    Lazily start the worker pool. Uses the "spawn" start method so workers do
+    not inherit torch thread pools or locks from the (threaded) API process.
+    """
+    return ProcessPoolExecutor(
+        max_workers=ASR_PARALLEL_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(model_name, ASR_WORKER_THREADS),
+    )
+
+
+def shift_segments(segments: List[Dict[str, Any]], offset: float) -> List[Dict[str, Any]]:
+    """Copy Whisper segments with timestamps shifted by `offset` seconds (token ids dropped)."""
+    shifted = []
+    for seg in segments:
+        seg = dict(seg)
+        seg["start"] = float(seg.get("start", 0.0)) + offset
+        seg["end"] = float(seg.get("end", 0.0)) + offset
+        seg.pop("tokens", None)
+        shifted.append(seg)
+    return shifted
+
+
+def iter_transcribe_parallel(
+    audio: np.ndarray,
+    model_name: str,
+    windows: List[Tuple[int, int]],
+    language: Optional[str] = None,
+    options: Optional[Dict[str, Any]] = None,
+) -> Iterator[Tuple[int, str, Dict[str, Any]]]:
+    """
+    Submit every window to the pool and yield (start_sample, language, result)
+    in window order as soon as each window (and all before it) is done.
+    `options` are extra Whisper `transcribe()` arguments (decoding profile).
+    """
+    pool = get_asr_pool(model_name)
+    if not language:
+        first_start, first_end = windows[0]
+        language = pool.submit(_detect_language, audio[first_start:first_end]).result()
+
+    futures = [
+        pool.submit(_transcribe_window, audio[start:end], language, options or {}) for start, end in windows
+    ]
+    try:
+        for (start, _), future in zip(windows, futures):
+            yield start, language, future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def transcribe_parallel(
+    audio: np.ndarray,
+    model_name: str,
+    language: Optional[str] = None,
+    options: Optional[Dict[str, Any]] = None,
+) -> Tuple[str, str, Dict[str, Any]]:
+    """
+    Transcribe a 16 kHz mono array by windows in parallel and stitch the result.
+
+    Returns:
+        transcript_text, language_code, raw_info (with shifted `segments`
+        and the `windows` used as (start_s, end_s) pairs)
+    """
+    windows = split_on_silence(audio, SAMPLE_RATE, ASR_PARALLEL_WINDOW_SECONDS)
+
+    texts: List[str] = []
+    segments: List[Dict[str, Any]] = []
+    for start, language, result in iter_transcribe_parallel(audio, model_name, windows, language, options):
+        texts.append((result.get("text") or "").strip())
+        for seg in shift_segments(result.get("segments") or [], start / SAMPLE_RATE):
+            seg["id"] = len(segments)
+            segments.append(seg)
+
+    text = " ".join(t for t in texts if t)
+    raw = {
+        "text": text,
+        "language": language,
+        "segments": segments,
+        "windows": [(s / SAMPLE_RATE, e / SAMPLE_RATE) for s, e in windows],
+    }
+    return text, language, raw
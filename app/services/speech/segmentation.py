@@ -0,0 +1,181 @@
+"""
+Energy-based audio segmentation helpers (NumPy only, no models).
+
+- Frame-level RMS energy.
+- Split long audio into windows that end in the quietest spot near a target length,
+  so ASR windows rarely cut through a word.
+- Energy-based voice activity detection (VAD): keep speech regions (with padding),
+  drop long silences, and map timestamps of the compacted audio back.
+
+The VAD is intentionally simple and conservative (energy threshold a few dB
+above the noise floor): it removes clear silences, not quiet speech or music,
+and leaves clips without a clear noise floor untouched.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from typing import List, Tuple
+
+import numpy as np
+
+FRAME_MS = 30
+
+
+def frame_energies(audio: np.ndarray, sample_rate: int, frame_ms: int = FRAME_MS) -> Tuple[np.ndarray, int]:
+    """
+    RMS energy of consecutive non-overlapping frames.
+
+    Returns:
+        (energies, frame_length_in_samples)
+    """
+    frame = max(1, int(sample_rate * frame_ms / 1000))
+    n_frames = audio.shape[0] // frame
+    if n_frames == 0:
+        return np.zeros(0, dtype=np.float32), frame
+    frames = audio[: n_frames * frame].reshape(n_frames, frame)
+    return np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1)), frame
+
+
+def split_on_silence(
+    audio: np.ndarray,
+    sample_rate: int,
+    target_seconds: float,
+    search_seconds: float = 10.0,
+) -> List[Tuple[int, int]]:
+    """
+    Split audio into windows of about `target_seconds`, cutting at the
+    lowest-energy frame within +/- `search_seconds` of each target boundary.
+
+    Returns:
+        list of (start_sample, end_sample) covering the whole input.
+    """
+    n = audio.shape[0]
+    target = int(target_seconds * sample_rate)
+    search = int(search_seconds * sample_rate)
+    # Avoid producing a tiny trailing window.
+    if target <= 0 or n <= target + target // 4:
+        return [(0, n)]
+
+    energies, frame = frame_energies(audio, sample_rate)
+    windows: List[Tuple[int, int]] = []
+    start = 0
+    while n - start > target + target // 4:
+        lo = max(start + 1, start + target - search) // frame
+        hi = min(len(energies), (start + target + search) // frame + 1)
+        if hi <= lo:
+            cut = start + target
+        else:
+            cut = (lo + int(np.argmin(energies[lo:hi]))) * frame + frame // 2
+        cut = min(max(cut, start + 1), n)
+        windows.append((start, cut))
+        start = cut
+    windows.append((start, n))
+    return windows
+
+
+def detect_speech_regions(
+    audio: np.ndarray,
+    sample_rate: int,
+    min_rms: float = 0.003,
+    margin_db: float = 6.0,
+    min_range_db: float = 25.0,
+    min_speech_ms: int = 250,
+    min_silence_ms: int = 1000,
+    pad_ms: int = 400,
+) -> List[Tuple[int, int]]:
+    """
+    Find speech-like regions with an adaptive energy threshold.
+
+    The noise floor is the 10th percentile of frame energy and the speech
+    level the 90th. When they are less than `min_range_db` apart the clip has
+    no clear noise floor (continuous speech, music, steady noise) and is kept
+    whole. Otherwise frames more than `margin_db` above the floor (and above
+    `min_rms`) are speech. Gaps shorter than `min_silence_ms` are bridged
+    (hangover), blips shorter than `min_speech_ms` dropped, and every region
+    is padded by `pad_ms` on both sides. The defaults err on keeping audio:
+    dropping real speech loses words, keeping silence only costs time.
+
+    Returns:
+        sorted, non-overlapping list of (start_sample, end_sample).
+    """
+    energies, frame = frame_energies(audio, sample_rate)
+    if energies.size == 0:
+        return []
+
+    floor, level = (float(v) for v in np.percentile(energies, (10, 90)))
+    if level <= min_rms:
+        return []
+    floor = max(floor, 1e-6)  # digital silence
+    if 20.0 * np.log10(level / floor) < min_range_db:
+        return [(0, audio.shape[0])]
+
+    threshold = max(min_rms, floor * 10.0 ** (margin_db / 20.0))
+    active = energies > threshold
+    if not active.any():
+        return []
+
+    # Run boundaries of consecutive active frames.
+    padded = np.concatenate(([False], active, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    runs = list(zip(edges[0::2].tolist(), edges[1::2].tolist()))
+
+    max_gap = max(1, min_silence_ms // FRAME_MS)
+    merged: List[List[int]] = [list(runs[0])]
+    for start, end in runs[1:]:
+        if start - merged[-1][1] < max_gap:
+            merged[-1][1] = end
+        else:
+            merged.append([start, end])
+
+    min_run = max(1, min_speech_ms // FRAME_MS)
+    pad = int(sample_rate * pad_ms / 1000)
+    n = audio.shape[0]
+    regions: List[Tuple[int, int]] = []
+    for start, end in merged:
+        if end - start < min_run:
+            continue
+        s, e = max(0, start * frame - pad), min(n, end * frame + pad)
+        if regions and s <= regions[-1][1]:
+            regions[-1] = (regions[-1][0], max(regions[-1][1], e))
+        else:
+            regions.append((s, e))
+    return regions
+
+
+def compact_regions(
+    audio: np.ndarray,
+    regions: List[Tuple[int, int]],
+    sample_rate: int,
+    gap_seconds: float = 0.3,
+) -> Tuple[np.ndarray, List[Tuple[float, float]]]:
+    """
+    Concatenate the given regions, separated by short silent gaps.
+
+    Returns:
+        (compact_audio, mapping) where mapping holds (compact_start_s, original_start_s)
+        for each region, in order; see `map_to_original`.
+    """
+    gap = np.zeros(int(gap_seconds * sample_rate), dtype=audio.dtype)
+    pieces: List[np.ndarray] = []
+    mapping: List[Tuple[float, float]] = []
+    cursor = 0
+    for i, (start, end) in enumerate(regions):
+        if i:
+            pieces.append(gap)
+            cursor += gap.shape[0]
+        mapping.append((cursor / sample_rate, start / sample_rate))
+        pieces.append(audio[start:end])
+        cursor += end - start
+    if not pieces:
+        return np.zeros(0, dtype=audio.dtype), []
+    return np.concatenate(pieces), mapping
+
+
+def map_to_original(t: float, mapping: List[Tuple[float, float]]) -> float:
+    """Map a timestamp on the compacted audio back to the original timeline."""
+    if not mapping:
+        return t
+    i = max(0, bisect_right([m[0] for m in mapping], t) - 1)
+    compact_start, original_start = mapping[i]
+    return original_start + max(0.0, t - compact_start)
@@ -2,34 +2,128 @@
 Abstractive summarization using a free, CPU-friendly model:
 - Default model: sshleifer/distilbart-cnn-12-6 (DistilBART)
 - Uses local model path if available (baked into the Docker image)
-- CPU-only inference (device=-1)
+- Several models can be served side by side (AI_SUMMARY_MODELS aliases,
+  picked per request); they are loaded through the shared model registry
+  (app/core/model_registry.py), which enforces the RAM budget and evicts idle ones.
+- CPU-only inference (device=-1) under torch.inference_mode()
+- torch/transformers are imported on first model load, not at module import,
+  so processes serving only cheap endpoints start fast
+- Optional dynamic int8 quantization of linear layers (AI_SUMMARY_QUANTIZE=1,
+  see app/services/text/quantization.py) and explicit torch thread counts
+  (see app/core/torch_runtime.py)
+- Cross-request micro-batching: blocks from concurrent requests are grouped
+  into padded batches and run by a single worker thread.
+- Streaming summarizer: the map step can start while input text (e.g. ASR
+  output) is still arriving; only the reduce waits for the end.
+- Hybrid mode (reduce_mode="hybrid"): long inputs are first cut down to one
+  MAX_INPUT_TOKENS window of top-ranked sentences by the extractive engine,
+  then summarized in a single model pass instead of map-reduce.
 """
 
 from __future__ import annotations
 
 import os
+import queue
+import threading
+import time
+from bisect import bisect_left
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from functools import lru_cache
-from typing import List
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
-from transformers import pipeline, AutoTokenizer, AutoModelForSeq2SeqLM
+import numpy as np
+
+from app.core import metrics
+from app.core.model_registry import model_registry, parse_model_aliases, torch_module_bytes
+from app.core.torch_runtime import configure_torch_threads
+from app.services.text.quantization import QUANTIZE_ENABLED, load_quantized_model
+from app.services.text.summarize_service import rank_sentences, sentence_spans, split_sentences
+from app.services.text.summary_cache import CACHE_ENABLED, get_summary_cache, make_key
 
 # DEFAULT_MODEL = os.getenv("AI_SUMMARY_MODEL", "sshleifer/distilbart-cnn-12-6")
 DEFAULT_MODEL = os.getenv("AI_SUMMARY_MODEL", "t5-small")
 LOCAL_MODEL_PATH = os.getenv("AI_SUMMARY_MODEL_PATH")  # e.g., /models/distilbart-cnn-12-6
 MODEL_SOURCE = LOCAL_MODEL_PATH if (LOCAL_MODEL_PATH and os.path.isdir(LOCAL_MODEL_PATH)) else DEFAULT_MODEL
 
+# Models selectable per request, as "alias=model" pairs; the default model is always allowed.
+MODEL_ALIASES = parse_model_aliases(
+    os.getenv("AI_SUMMARY_MODELS", "fast=t5-small,quality=sshleifer/distilbart-cnn-12-6")
+)
+AVAILABLE_MODELS = sorted({DEFAULT_MODEL, *MODEL_ALIASES.values()})
+
+# Approximate fp32 weight sizes, used to plan evictions before a model is loaded.
+MODEL_SIZE_HINTS_MB = {
+    "t5-small": 250,
+    "t5-base": 900,
+    "sshleifer/distilbart-cnn-12-6": 1250,
+    "facebook/bart-large-cnn": 1650,
+}
+
 MAX_INPUT_TOKENS = int(os.getenv("AI_SUMMARY_MAX_INPUT_TOKENS", "900"))
 CHUNK_OVERLAP_SENTENCES = int(os.getenv("AI_SUMMARY_SENT_OVERLAP", "1"))
 
+# Micro-batching scheduler (set AI_SUMMARY_BATCHING=0 to call the pipeline directly).
+BATCHING_ENABLED = os.getenv("AI_SUMMARY_BATCHING", "1") == "1"
+BATCH_MAX_SIZE = int(os.getenv("AI_SUMMARY_BATCH_MAX_SIZE", "8"))
+BATCH_MAX_WAIT_MS = float(os.getenv("AI_SUMMARY_BATCH_MAX_WAIT_MS", "20"))
+BATCH_LENGTH_BUCKET = int(os.getenv("AI_SUMMARY_BATCH_LENGTH_BUCKET", "128"))
 
-@lru_cache(maxsize=1)
-def get_pipeline():
+# Batch size for the map step of long documents when batching is disabled
+# (with the scheduler, chunks share its BATCH_MAX_SIZE batches instead).
+MAP_BATCH_SIZE = int(os.getenv("AI_SUMMARY_MAP_BATCH_SIZE", "4"))
+
+# Reduce strategy for multi-chunk inputs:
+# - "flat": summarize the joined partials once (truncates when they overflow the window)
+# - "tree": re-chunk and reduce level by level until the partials fit MAX_INPUT_TOKENS
+# - "hybrid": no map step; summarize the top-ranked sentences that fit one window
+REDUCE_MODE = os.getenv("AI_SUMMARY_REDUCE_MODE", "tree")
+MAX_REDUCE_DEPTH = int(os.getenv("AI_SUMMARY_MAX_REDUCE_DEPTH", "6"))
+
+# Callback receiving (chunk_index, partial_summary) as map-step results become available.
+PartialCallback = Callable[[int, str], None]
+
+
+def resolve_model(name: Optional[str] = None) -> str:
+    """
+    Map a requested model (alias, model id, or None for the default) to a model id.
+
+    Raises:
+        ValueError: the model is not in AI_SUMMARY_MODELS.
+    """
+    if not name:
+        return DEFAULT_MODEL
+    model = MODEL_ALIASES.get(name, name)
+    if model not in AVAILABLE_MODELS:
+        raise ValueError(f"Unknown summarization model '{name}'. Available: {', '.join(sorted(MODEL_ALIASES) + AVAILABLE_MODELS)}.")
+    return model
+
+
+def model_label(model: str) -> str:
+    """Identifier of the weights actually served (int8 outputs differ slightly from fp32)."""
+    return f"{model}+int8" if QUANTIZE_ENABLED else model
+
+
+def _model_source(model: str) -> str:
+    # The baked-in local copy only applies to the default model.
+    return MODEL_SOURCE if model == DEFAULT_MODEL else model
+
+
+def _load_pipeline(model_id: str):
     """
-    Lazily load and cache the summarization pipeline.
+    Load a summarization pipeline (registry loader).
     Prioritize local model directory to avoid network at runtime.
+    With AI_SUMMARY_QUANTIZE=1 the cached int8 model is used.
     """
-    tokenizer = AutoTokenizer.from_pretrained(MODEL_SOURCE)
-    model = AutoModelForSeq2SeqLM.from_pretrained(MODEL_SOURCE)
+    from transformers import pipeline, AutoTokenizer, AutoModelForSeq2SeqLM
+
+    configure_torch_threads()
+    source = _model_source(model_id)
+    tokenizer = AutoTokenizer.from_pretrained(source)
+    if QUANTIZE_ENABLED:
+        model = load_quantized_model(source)
+    else:
+        model = AutoModelForSeq2SeqLM.from_pretrained(source)
     summarizer = pipeline(
         "summarization",
         model=model,
@@ -40,91 +134,723 @@ def get_pipeline():
     return summarizer, tokenizer
 
 
-def _naive_sentence_split(text: str) -> List[str]:
-    """Minimal sentence segmentation by punctuation."""
-    import re
-    _SENT_SPLIT = re.compile(r'(?<=[\.\!\?])\s+')
-    parts = _SENT_SPLIT.split(text.strip())
-    return [p.strip() for p in parts if p.strip()]
+model_registry.register(
+    "summarizer",
+    loader=_load_pipeline,
+    sizer=lambda loaded: torch_module_bytes(loaded[0].model),
+    size_hints_mb={m: mb / (4 if QUANTIZE_ENABLED else 1) for m, mb in MODEL_SIZE_HINTS_MB.items()},
+)
+
+
+def get_pipeline(model: Optional[str] = None):
+    """
+    Return (summarizer, tokenizer) for `model` (default model when None),
+    loading it through the model registry if needed.
+    """
+    return model_registry.get("summarizer", resolve_model(model))
+
 
+def warmup(model: Optional[str] = None) -> None:
+    """Load the model and run one tiny generation (bypasses cache and scheduler)."""
+    _run_pipeline(["Warm up the summarization model with a short sentence."], 5, 10, resolve_model(model))
 
-def _split_into_token_chunks(text: str, max_tokens: int) -> List[str]:
+
+def _token_chunks(text: str, max_tokens: int, model: str = DEFAULT_MODEL) -> List[Tuple[str, int]]:
     """
-    Split text into token-aware chunks using the model tokenizer.
-    Keeps a small sentence overlap between chunks to preserve context.
+    Split text into token-aware chunks, returning (chunk_text, token_count) pairs.
+
+    The whole document is tokenized once; with a fast tokenizer the offset
+    mapping locates sentence boundaries and hard-split points, and chunks are
+    sliced from the original text (no decode round-trip). A small sentence
+    overlap is kept between chunks to preserve context.
     """
-    summarizer, tokenizer = get_pipeline()
-    sentences = _naive_sentence_split(text)
-    chunks: List[str] = []
+    _, tokenizer = get_pipeline(model)
+    spans = sentence_spans(text)
+    if not spans:
+        return []
 
-    current: List[str] = []
+    offsets: Optional[List[Tuple[int, int]]] = None
+    if getattr(tokenizer, "is_fast", False):
+        enc = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True, verbose=False)
+        offsets = enc["offset_mapping"]
+        token_starts = [start for start, _ in offsets]
+        bounds = [bisect_left(token_starts, start) for start, _ in spans] + [len(offsets)]
+        bounds[0] = 0
+        counts = [bounds[k + 1] - bounds[k] for k in range(len(spans))]
+    else:
+        # Slow tokenizers have no offsets: count all sentences in one batched call.
+        ids = tokenizer([text[a:b] for a, b in spans], add_special_tokens=False)["input_ids"]
+        counts = [len(x) for x in ids]
+        bounds = []
+
+    chunks: List[Tuple[str, int]] = []
+    current: List[int] = []  # sentence indices
     current_len = 0
 
-    def tokens_count(s: str) -> int:
-        return len(tokenizer.encode(s, add_special_tokens=False))
+    def flush() -> None:
+        if current:
+            chunks.append((text[spans[current[0]][0]:spans[current[-1]][1]], current_len))
 
-    for s in sentences:
-        s_len = tokens_count(s)
+    for k, (s_start, s_end) in enumerate(spans):
+        s_len = counts[k]
         if s_len > max_tokens:
             # Hard-split a single long sentence by tokens
-            hard_tokens = tokenizer.encode(s, add_special_tokens=False)
-            for j in range(0, len(hard_tokens), max_tokens):
-                piece = tokenizer.decode(hard_tokens[j:j + max_tokens], skip_special_tokens=True)
-                chunks.append(piece.strip())
+            flush()
+            if offsets is not None:
+                for j in range(bounds[k], bounds[k + 1], max_tokens):
+                    last = min(j + max_tokens, bounds[k + 1]) - 1
+                    piece = text[max(offsets[j][0], s_start):min(offsets[last][1], s_end)].strip()
+                    if piece:
+                        chunks.append((piece, last - j + 1))
+            else:
+                hard_tokens = tokenizer.encode(text[s_start:s_end], add_special_tokens=False)
+                for j in range(0, len(hard_tokens), max_tokens):
+                    window = hard_tokens[j:j + max_tokens]
+                    piece = tokenizer.decode(window, skip_special_tokens=True).strip()
+                    chunks.append((piece, len(window)))
             current, current_len = [], 0
             continue
 
         if current_len + s_len <= max_tokens:
-            current.append(s)
+            current.append(k)
             current_len += s_len
         else:
-            if current:
-                chunks.append(" ".join(current).strip())
+            flush()
             overlap = current[-CHUNK_OVERLAP_SENTENCES:] if CHUNK_OVERLAP_SENTENCES and current else []
-            current = overlap + [s] if overlap else [s]
-            current_len = sum(tokens_count(x) for x in current)
-
-    if current:
-        chunks.append(" ".join(current).strip())
+            current = overlap + [k]
+            current_len = sum(counts[i] for i in current)
+            while current_len > max_tokens and len(current) > 1:
+                current_len -= counts[current.pop(0)]
 
+    flush()
     return chunks
 
 
-def _summarize_block(block: str, min_length: int, max_length: int) -> str:
-    """Summarize a single chunk using the pipeline."""
-    summarizer, _ = get_pipeline()
-    out = summarizer(
-        block,
-        max_length=max_length,
-        min_length=min_length,
-        do_sample=False,
-        truncation=True,
-        clean_up_tokenization_spaces=True,
-    )[0]["summary_text"]
-    return out.strip()
+def _split_into_token_chunks(text: str, max_tokens: int, model: str = DEFAULT_MODEL) -> List[str]:
+    """Split text into token-aware chunks (see `_token_chunks`)."""
+    return [chunk for chunk, _ in _token_chunks(text, max_tokens, model)]
 
 
-def summarize_ai_text(
+def _count_tokens(text: str, model: str = DEFAULT_MODEL) -> int:
+    """Number of model tokens in `text` (without special tokens)."""
+    _, tokenizer = get_pipeline(model)
+    return len(tokenizer.encode(text, add_special_tokens=False))
+
+
+def _extract_to_window(text: str, max_tokens: int, model: str = DEFAULT_MODEL) -> Tuple[str, int, int]:
+    """
+    Extractive pre-selection of the hybrid mode.
+
+    Sentences are ranked by the extractive engine (TextRank) and taken best
+    first while they still fit in `max_tokens`; the kept sentences are joined
+    in their original order.
+
+    Returns:
+        (extract, n_tokens, n_sentences)
+    """
+    _, tokenizer = get_pipeline(model)
+    sentences = split_sentences(text)
+    if not sentences:
+        return "", 0, 0
+    ids = tokenizer(sentences, add_special_tokens=False)["input_ids"]
+    counts = [len(x) for x in ids]
+
+    kept: List[int] = []
+    total = 0
+    for i in np.argsort(-rank_sentences(sentences), kind="stable"):
+        if total + counts[i] <= max_tokens:
+            kept.append(int(i))
+            total += counts[i]
+    if not kept:
+        # Every sentence overflows the window on its own: keep the first hard-split piece.
+        extract, n_tokens = _token_chunks(text, max_tokens, model)[0]
+        return extract, n_tokens, 1
+    kept.sort()
+    return " ".join(sentences[i] for i in kept), total, len(kept)
+
+
+def _run_pipeline(blocks: List[str], min_length: int, max_length: int, model: str = DEFAULT_MODEL) -> List[str]:
+    """Run the pipeline on a list of blocks as one padded batch."""
+    import torch
+
+    # Pinned while generating so the registry cannot evict it mid-batch.
+    with model_registry.use("summarizer", model) as (summarizer, tokenizer), torch.inference_mode():
+        outputs = summarizer(
+            blocks,
+            batch_size=len(blocks),
+            max_length=max_length,
+            min_length=min_length,
+            do_sample=False,
+            truncation=True,
+            clean_up_tokenization_spaces=True,
+        )
+    results: List[str] = []
+    for out in outputs:
+        if isinstance(out, list):
+            out = out[0]
+        results.append(out["summary_text"].strip())
+    if metrics.METRICS_ENABLED:
+        # One batched tokenizer call; cheap next to generation.
+        ids = tokenizer(blocks + results, add_special_tokens=False)["input_ids"]
+        metrics.inc("summary_tokens_in_total", sum(len(x) for x in ids[:len(blocks)]), model)
+        metrics.inc("summary_tokens_out_total", sum(len(x) for x in ids[len(blocks):]), model)
+    return results
+
+
+@dataclass
+class _PendingBlock:
+    text: str
+    min_length: int
+    max_length: int
+    n_tokens: int
+    model: str
+    future: Future = field(default_factory=Future)
+
+
+class MicroBatchScheduler:
+    """
+    Collect blocks submitted by concurrent requests and run them together.
+
+    Pending blocks are gathered for at most `max_wait_ms` (or until
+    `max_batch_size` blocks are waiting), grouped by generation parameters and
+    token-length bucket (and model), and executed as padded batches on one worker thread.
+    Each caller receives a Future resolved with its own summary.
+    """
+
+    def __init__(self, max_batch_size: int, max_wait_ms: float, length_bucket: int) -> None:
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_ms = max(0.0, max_wait_ms)
+        self.length_bucket = max(1, length_bucket)
+        self._queue: "queue.Queue[_PendingBlock]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._batches = 0
+        self._blocks = 0
+        self._largest_batch = 0
+        self._busy_seconds = 0.0
+
+    def submit(
+        self,
+        text: str,
+        min_length: int,
+        max_length: int,
+        n_tokens: Optional[int] = None,
+        model: str = DEFAULT_MODEL,
+    ) -> Future:
+        """Queue a block for summarization and return a Future with its summary."""
+        if n_tokens is None:
+            n_tokens = _count_tokens(text, model)
+        item = _PendingBlock(text, min_length, max_length, n_tokens, model)
+        self._ensure_worker()
+        self._queue.put(item)
+        return item.future
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of scheduler configuration and counters."""
+        with self._lock:
+            return {
+                "enabled": True,
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait_ms,
+                "queue_depth": self._queue.qsize(),
+                "batches_run": self._batches,
+                "blocks_processed": self._blocks,
+                "avg_batch_size": (self._blocks / self._batches) if self._batches else 0.0,
+                "largest_batch": self._largest_batch,
+                "busy_seconds": round(self._busy_seconds, 3),
+            }
+
+    def _ensure_worker(self) -> None:
+        # Started lazily so that importing this module never spawns threads.
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="ai-summary-batcher", daemon=True)
+                self._worker.start()
+
+    def _collect(self) -> List[_PendingBlock]:
+        pending = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait_ms / 1000.0
+        while len(pending) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                pending.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return pending
+
+    def _group(self, pending: List[_PendingBlock]) -> List[List[_PendingBlock]]:
+        groups: Dict[Tuple[str, int, int, int], List[_PendingBlock]] = {}
+        for item in pending:
+            key = (item.model, item.min_length, item.max_length, item.n_tokens // self.length_bucket)
+            groups.setdefault(key, []).append(item)
+        return list(groups.values())
+
+    def _execute(self, group: List[_PendingBlock]) -> None:
+        started = time.perf_counter()
+        try:
+            first = group[0]
+            outputs = _run_pipeline([it.text for it in group], first.min_length, first.max_length, first.model)
+        except Exception as exc:  # propagate to every waiting request
+            for it in group:
+                it.future.set_exception(exc)
+        else:
+            for it, out in zip(group, outputs):
+                it.future.set_result(out)
+        finally:
+            with self._lock:
+                self._batches += 1
+                self._blocks += len(group)
+                self._largest_batch = max(self._largest_batch, len(group))
+                self._busy_seconds += time.perf_counter() - started
+
+    def _run(self) -> None:
+        while True:
+            for group in self._group(self._collect()):
+                self._execute(group)
+
+
+@lru_cache(maxsize=1)
+def get_batch_scheduler() -> MicroBatchScheduler:
+    """Lazily create the process-wide micro-batching scheduler."""
+    return MicroBatchScheduler(BATCH_MAX_SIZE, BATCH_MAX_WAIT_MS, BATCH_LENGTH_BUCKET)
+
+
+def batching_stats() -> Dict[str, Any]:
+    """Scheduler stats (or the static configuration when batching is disabled)."""
+    if not BATCHING_ENABLED:
+        # Same keys as a live scheduler; an unused instance starts no thread.
+        idle = MicroBatchScheduler(BATCH_MAX_SIZE, BATCH_MAX_WAIT_MS, BATCH_LENGTH_BUCKET)
+        return {**idle.stats(), "enabled": False}
+    return get_batch_scheduler().stats()
+
+
+def _summarize_block(
+    block: str,
+    min_length: int,
+    max_length: int,
+    n_tokens: Optional[int] = None,
+    model: str = DEFAULT_MODEL,
+) -> str:
+    """Summarize a single chunk using the pipeline (through the scheduler if enabled)."""
+    if BATCHING_ENABLED:
+        return get_batch_scheduler().submit(block, min_length, max_length, n_tokens, model).result()
+    return _run_pipeline([block], min_length, max_length, model)[0]
+
+
+def _summarize_blocks(
+    blocks: List[str],
+    min_length: int,
+    max_length: int,
+    batch_size: int = MAP_BATCH_SIZE,
+    on_result: Optional[PartialCallback] = None,
+    model: str = DEFAULT_MODEL,
+    n_tokens: Optional[List[int]] = None,
+) -> Tuple[List[str], List[int]]:
+    """
+    Summarize many blocks.
+
+    With batching enabled every block goes through the micro-batching
+    scheduler, so chunks of concurrent documents share padded batches.
+    Otherwise blocks run in length-sorted batches of `batch_size`; sorting
+    keeps padding small when chunk lengths differ (e.g. the last chunk).
+    Blocks already in the summary cache are not sent to the model.
+    `on_result(index, summary)` is called as soon as each block is available.
+    `n_tokens` (token count per block) saves the scheduler a tokenizer call.
+
+    Returns:
+        (summaries in input order, indices of the blocks sent to the model)
+    """
+    batch_size = max(1, batch_size)
+    results: List[str] = [""] * len(blocks)
+    keys: List[str] = []
+    pending = list(range(len(blocks)))
+    if CACHE_ENABLED:
+        cache = get_summary_cache()
+        keys = [make_key("chunk", b, model_label(model), min_length, max_length) for b in blocks]
+        pending = []
+        for i, key in enumerate(keys):
+            hit = cache.get(key)
+            if hit is None:
+                pending.append(i)
+            else:
+                results[i] = hit
+                if on_result:
+                    on_result(i, hit)
+
+    def done(i: int, out: str) -> None:
+        results[i] = out
+        if CACHE_ENABLED:
+            get_summary_cache().put(keys[i], out)
+        if on_result:
+            on_result(i, out)
+
+    if BATCHING_ENABLED:
+        scheduler = get_batch_scheduler()
+        futures = {
+            scheduler.submit(blocks[i], min_length, max_length, n_tokens[i] if n_tokens else None, model): i
+            for i in pending
+        }
+        for future in as_completed(futures):
+            done(futures[future], future.result())
+        return results, pending
+
+    order = sorted(pending, key=lambda i: len(blocks[i]), reverse=True)
+    for start in range(0, len(order), batch_size):
+        idx = order[start:start + batch_size]
+        outputs = _run_pipeline([blocks[i] for i in idx], min_length, max_length, model)
+        for i, out in zip(idx, outputs):
+            done(i, out)
+    return results, pending
+
+
+def _doc_key(text: str, label: str, min_length: int, max_length: int, mode: str) -> str:
+    # Chunking and reduce-depth settings change the output of the same text.
+    return make_key(
+        "doc", text, label, min_length, max_length, mode,
+        MAX_INPUT_TOKENS, CHUNK_OVERLAP_SENTENCES, MAX_REDUCE_DEPTH,
+    )
+
+
+def _new_info(model: str, mode: str) -> Dict[str, Any]:
+    return {
+        "model": model_label(model),
+        "reduce_mode": mode,
+        "chunks": 0,
+        "reduce_depth": 0,
+        "model_calls": 0,
+        "cached": False,
+        "extracted_sentences": None,
+    }
+
+
+def summarize_ai_text_detailed(
     text: str,
     min_length: int = 60,
     max_length: int = 160,
-) -> str:
+    reduce_mode: Optional[str] = None,
+    on_partial: Optional[PartialCallback] = None,
+    model: Optional[str] = None,
+) -> Tuple[str, Dict[str, Any]]:
     """
     Map-Reduce summarization:
       1) Token-aware chunking.
-      2) Summarize each chunk.
-      3) Summarize the concatenated partials.
+      2) Summarize all chunks in batched pipeline calls.
+      3) Reduce the partials: once ("flat"), or level by level ("tree") by
+         re-chunking them until the joined text fits MAX_INPUT_TOKENS.
+
+    In "hybrid" mode multi-chunk inputs skip steps 2-3: the top-ranked
+    sentences that fit one MAX_INPUT_TOKENS window are summarized in a single
+    pass (see `_extract_to_window`).
+
+    Results are cached by content hash; a cache hit reports `cached=True`
+    and zero model calls. `on_partial(index, summary)` receives each map-step
+    partial of multi-chunk inputs as soon as it is ready.
+
+    `model` is an alias or model id (see `resolve_model`; ValueError if unknown).
+
+    Returns:
+        summary, info where info has `model` (weights actually used), `reduce_mode`,
+        `chunks`, `reduce_depth` (number of reduce levels), `model_calls`
+        (blocks sent to the model), `cached` and `extracted_sentences`
+        (sentences kept by the hybrid pre-selection, None otherwise).
     """
+    model_id = resolve_model(model)
+    mode = reduce_mode or REDUCE_MODE
+    info = _new_info(model_id, mode)
+
     text = text.strip()
     if not text:
-        return ""
+        return "", info
+
+    if CACHE_ENABLED:
+        doc_key = _doc_key(text, info["model"], min_length, max_length, mode)
+        hit = get_summary_cache().get(doc_key)
+        if hit is not None:
+            info["cached"] = True
+            return hit, info
+        summary, info = _summarize_uncached(text, min_length, max_length, info, model_id, on_partial)
+        if summary:
+            get_summary_cache().put(doc_key, summary)
+        return summary, info
+
+    return _summarize_uncached(text, min_length, max_length, info, model_id, on_partial)
+
+
+def _summarize_uncached(
+    text: str,
+    min_length: int,
+    max_length: int,
+    info: Dict[str, Any],
+    model: str,
+    on_partial: Optional[PartialCallback] = None,
+) -> Tuple[str, Dict[str, Any]]:
+    """Map-reduce body of `summarize_ai_text_detailed` (no document-level cache)."""
+    mode = info["reduce_mode"]
 
-    chunks = _split_into_token_chunks(text, MAX_INPUT_TOKENS)
+    with metrics.stage("summary_chunking"):
+        token_chunks = _token_chunks(text, MAX_INPUT_TOKENS, model)
+    chunks = [chunk for chunk, _ in token_chunks]
+    info["chunks"] = len(chunks)
+    if not chunks:
+        return "", info
+    metrics.observe("summary_chunks", len(chunks))
 
     if len(chunks) == 1:
-        return _summarize_block(chunks[0], min_length, max_length)
+        info["model_calls"] = 1
+        with metrics.stage("summary_map"):
+            return _summarize_block(chunks[0], min_length, max_length, token_chunks[0][1], model), info
 
-    partials = [_summarize_block(c, max(20, min_length // 2), max_length) for c in chunks]
+    if mode == "hybrid":
+        with metrics.stage("summary_extract"):
+            extract, n_tokens, kept = _extract_to_window(text, MAX_INPUT_TOKENS, model)
+        info["model_calls"] = 1
+        info["extracted_sentences"] = kept
+        with metrics.stage("summary_map"):
+            return _summarize_block(extract, min_length, max_length, n_tokens, model), info
+
+    partial_min = max(20, min_length // 2)
+    with metrics.stage("summary_map"):
+        partials, sent = _summarize_blocks(
+            chunks, partial_min, max_length, on_result=on_partial, model=model,
+            n_tokens=[n for _, n in token_chunks],
+        )
+    with metrics.stage("summary_reduce"):
+        final, depth, calls = _reduce_partials(partials, min_length, max_length, mode, model)
+    info["model_calls"] = len(sent) + calls
+    info["reduce_depth"] = depth
+    return final, info
+
+
+def _reduce_partials(
+    partials: List[str],
+    min_length: int,
+    max_length: int,
+    mode: str,
+    model: str = DEFAULT_MODEL,
+) -> Tuple[str, int, int]:
+    """
+    Reduce step shared by the batch and streaming summarizers.
+
+    Returns:
+        (summary, reduce_depth, model_calls) where model_calls counts the
+        blocks sent to the model (cached groups excluded)
+    """
+    partial_min = max(20, min_length // 2)
+    calls, depth = 0, 0
     combined = " ".join(partials)
-    final = _summarize_block(combined, min_length, max_length)
-    return final
\ No newline at end of file
+
+    if mode == "tree":
+        # The final pass below is the last level, hence the `- 1`.
+        while depth < MAX_REDUCE_DEPTH - 1 and _count_tokens(combined, model) > MAX_INPUT_TOKENS:
+            groups = _token_chunks(combined, MAX_INPUT_TOKENS, model)
+            if len(groups) <= 1:
+                break
+            partials, sent = _summarize_blocks(
+                [g for g, _ in groups], partial_min, max_length, model=model, n_tokens=[n for _, n in groups]
+            )
+            calls += len(sent)
+            depth += 1
+            combined = " ".join(partials)
+
+    final = _summarize_block(combined, min_length, max_length, model=model)
+    return final, depth + 1, calls + 1
+
+
+def summarize_ai_batch(
+    texts: List[str],
+    min_length: int = 60,
+    max_length: int = 160,
+    reduce_mode: Optional[str] = None,
+    model: Optional[str] = None,
+) -> List[Union[Tuple[str, Dict[str, Any]], Exception]]:
+    """
+    Summarize many documents, sharing model batches between them.
+
+    - Documents in the summary cache are answered from it.
+    - Single-chunk documents (the common case for bulk ingestion) are
+      summarized together in length-sorted batches of BATCH_MAX_SIZE.
+    - Longer documents run the regular map-reduce one after another.
+
+    Returns:
+        one entry per text, in order: (summary, info) as returned by
+        `summarize_ai_text_detailed`, or the exception raised for that document.
+    """
+    model_id = resolve_model(model)
+    mode = reduce_mode or REDUCE_MODE
+    label = model_label(model_id)
+    results: List[Any] = [None] * len(texts)
+    single: List[Tuple[int, str, str]] = []  # (index, stripped text, chunk)
+
+    for i, raw in enumerate(texts):
+        text = raw.strip()
+        info = _new_info(model_id, mode)
+        try:
+            if not text:
+                results[i] = ("", info)
+                continue
+            if CACHE_ENABLED:
+                hit = get_summary_cache().get(_doc_key(text, label, min_length, max_length, mode))
+                if hit is not None:
+                    info["cached"] = True
+                    results[i] = (hit, info)
+                    continue
+            chunks = _token_chunks(text, MAX_INPUT_TOKENS, model_id)
+            if len(chunks) == 1:
+                single.append((i, text, chunks[0][0]))
+                continue
+            results[i] = _summarize_uncached(text, min_length, max_length, info, model_id)
+            if CACHE_ENABLED and results[i][0]:
+                get_summary_cache().put(_doc_key(text, label, min_length, max_length, mode), results[i][0])
+        except Exception as exc:
+            results[i] = exc
+
+    if single:
+        outputs: Optional[List[str]] = None
+        computed: set = set()  # indices into `single` that reached the model
+        try:
+            outputs, sent = _summarize_blocks(
+                [chunk for _, _, chunk in single], min_length, max_length, BATCH_MAX_SIZE, model=model_id
+            )
+            computed = set(sent)
+        except Exception:
+            outputs = None  # retry one by one below so a bad document only fails itself
+        for k, (i, text, chunk) in enumerate(single):
+            try:
+                if outputs is not None:
+                    summary, calls = outputs[k], int(k in computed)
+                else:
+                    [summary], sent = _summarize_blocks([chunk], min_length, max_length, model=model_id)
+                    calls = len(sent)
+            except Exception as exc:
+                results[i] = exc
+                continue
+            info = _new_info(model_id, mode)
+            info["chunks"], info["model_calls"] = 1, calls
+            if CACHE_ENABLED and summary:
+                get_summary_cache().put(_doc_key(text, label, min_length, max_length, mode), summary)
+            results[i] = (summary, info)
+    return results
+
+
+class StreamingSummarizer:
+    """
+    Map-reduce summarizer fed incrementally (e.g. by ASR segments).
+
+    Text is buffered until it spans more than one MAX_INPUT_TOKENS chunk;
+    completed chunks are then summarized on a background thread while more
+    text keeps arriving. `finish()` flushes the tail and runs only the reduce.
+    `on_partial(index, summary)` is called (from the map thread) per chunk.
+
+    In "hybrid" mode there is no map step: text is only buffered and `finish()`
+    runs the single extract-then-abstract pass (no partials are reported).
+    """
+
+    def __init__(
+        self,
+        min_length: int = 60,
+        max_length: int = 160,
+        reduce_mode: Optional[str] = None,
+        on_partial: Optional[PartialCallback] = None,
+        model: Optional[str] = None,
+    ) -> None:
+        self.model = resolve_model(model)
+        self.min_length = min_length
+        self.on_partial = on_partial
+        self.max_length = max_length
+        self.mode = reduce_mode or REDUCE_MODE
+        self._partial_min = max(20, min_length // 2)
+        self._buffer = ""
+        self._parts: List[str] = []  # hybrid mode input
+        self._chunks = 0
+        self._futures: List[Future] = []
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ai-summary-map")
+
+    def feed(self, text: str) -> None:
+        """Append text; submit every completed chunk to the map step."""
+        text = text.strip()
+        if not text:
+            return
+        if self.mode == "hybrid":
+            self._parts.append(text)
+            return
+        self._buffer = f"{self._buffer} {text}" if self._buffer else text
+        with metrics.stage("summary_chunking"):
+            chunks = _split_into_token_chunks(self._buffer, MAX_INPUT_TOKENS, self.model)
+        if len(chunks) > 1:
+            # The last chunk may still grow; keep it (with its overlap) buffered.
+            self._submit(chunks[:-1])
+            self._buffer = chunks[-1]
+
+    def _submit(self, chunks: List[str]) -> None:
+        on_result = None
+        if self.on_partial:
+            base, callback = self._chunks, self.on_partial
+            on_result = lambda i, out: callback(base + i, out)  # noqa: E731
+        self._chunks += len(chunks)
+        self._futures.append(
+            self._pool.submit(
+                _summarize_blocks, chunks, self._partial_min, self.max_length, MAP_BATCH_SIZE, on_result, self.model
+            )
+        )
+
+    def finish(self) -> Tuple[str, Dict[str, Any]]:
+        """
+        Flush buffered text, wait for the map step and run the reduce.
+
+        Returns:
+            summary, info (same keys as `summarize_ai_text_detailed`)
+        """
+        info = _new_info(self.model, self.mode)
+        try:
+            if self.mode == "hybrid":
+                text = " ".join(self._parts)
+                return _summarize_uncached(text, self.min_length, self.max_length, info, self.model)
+            if not self._futures:
+                # Everything fit in one window: plain single-pass summary.
+                if not self._buffer:
+                    return "", info
+                info["chunks"] = info["model_calls"] = 1
+                metrics.observe("summary_chunks", 1)
+                with metrics.stage("summary_map"):
+                    return _summarize_block(self._buffer, self.min_length, self.max_length, model=self.model), info
+
+            if self._buffer:
+                self._submit([self._buffer])
+                self._buffer = ""
+            metrics.observe("summary_chunks", self._chunks)
+            # Only the part of the map step still running after the input ended.
+            with metrics.stage("summary_map"):
+                mapped = [f.result() for f in self._futures]
+            partials = [p for summaries, _ in mapped for p in summaries]
+            sent = sum(len(indices) for _, indices in mapped)
+            with metrics.stage("summary_reduce"):
+                final, depth, calls = _reduce_partials(
+                    partials, self.min_length, self.max_length, self.mode, self.model
+                )
+            info.update(chunks=self._chunks, reduce_depth=depth, model_calls=sent + calls)
+            return final, info
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Release the background map thread (pending chunks are dropped)."""
+        for future in self._futures:
+            future.cancel()
+        self._pool.shutdown(wait=False)
+
+
+def summarize_ai_text(
+    text: str,
+    min_length: int = 60,
+    max_length: int = 160,
+    reduce_mode: Optional[str] = None,
+    model: Optional[str] = None,
+) -> str:
+    """
+    Summarize `text` with the map-reduce strategy and return only the summary.
+    See `summarize_ai_text_detailed` for the reduce modes and models.
+    """
+    summary, _ = summarize_ai_text_detailed(text, min_length, max_length, reduce_mode, model=model)
+    return summary
@@ -0,0 +1,81 @@
+"""
+Dynamic int8 quantization of the summarization model (CPU).
+
+- Every nn.Linear is replaced by a dynamically quantized int8 version
+  (weights int8, activations quantized on the fly); embeddings and layer norms
+  stay fp32. On CPU the linear layers dominate encoder/decoder latency.
+- The quantized state dict is cached on disk, keyed by model source and
+  torch version, so later boots rebuild the module skeleton from the config
+  and load int8 weights instead of loading fp32 weights and re-quantizing.
+
+Build the artifact ahead of time (e.g. in the Docker image) with:
+
+    python -m app.services.text.quantization
+
+Environment variables:
+- AI_SUMMARY_QUANTIZE: load the int8 model instead of fp32 (default: 0)
+- AI_SUMMARY_QUANTIZED_DIR: artifact cache directory (default: ~/.cache/smart-summarizer/quantized)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+
+QUANTIZE_ENABLED = os.getenv("AI_SUMMARY_QUANTIZE", "0") == "1"
+QUANTIZED_DIR = Path(
+    os.getenv("AI_SUMMARY_QUANTIZED_DIR", os.path.expanduser("~/.cache/smart-summarizer/quantized"))
+)
+
+
+def quantize_model(model):
+    """Return `model` with its linear layers dynamically quantized to int8."""
+    import torch
+
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def artifact_path(model_source: str) -> Path:
+    """Location of the cached quantized state dict for `model_source`."""
+    import torch
+
+    tag = hashlib.sha256(f"{model_source}|torch-{torch.__version__}".encode("utf-8")).hexdigest()[:16]
+    name = Path(model_source.rstrip("/")).name or "model"
+    return QUANTIZED_DIR / f"{name}-{tag}-int8.pt"
+
+
+def load_quantized_model(model_source: str):
+    """
+    Load the int8 model for `model_source`, from the artifact cache when present.
+
+    On a cache miss the fp32 model is loaded, quantized, and its state dict
+    written to the cache (best effort: a read-only disk only costs the
+    quantization step on the next boot).
+    """
+    import torch
+    from transformers import AutoConfig, AutoModelForSeq2SeqLM
+
+    path = artifact_path(model_source)
+    if path.is_file():
+        config = AutoConfig.from_pretrained(model_source)
+        model = quantize_model(AutoModelForSeq2SeqLM.from_config(config).eval())
+        model.load_state_dict(torch.load(path, map_location="cpu"))
+        return model.eval()
+
+    model = quantize_model(AutoModelForSeq2SeqLM.from_pretrained(model_source).eval())
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        torch.save(model.state_dict(), tmp)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+    return model
+
+
+if __name__ == "__main__":
+    from app.services.text.ai_summarize_service import MODEL_SOURCE
+
+    load_quantized_model(MODEL_SOURCE)
+    print(f"Quantized artifact: {artifact_path(MODEL_SOURCE)}")
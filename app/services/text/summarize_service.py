@@ -1,49 +1,228 @@
 """
-Lightweight extractive summarization service.
+Lightweight extractive summarization service (NumPy only, no models).
 
-Heuristic:
 - Split text into sentences.
-- Rank by length (as a proxy for information density).
-- Keep top-N sentences and restore original order.
+- Build a sparse (COO) term-frequency matrix of the sentences.
+- Score sentences by one of:
+  - "textrank": PageRank over the TF-IDF cosine-similarity graph (default),
+  - "tfidf": cosine similarity of each sentence to the document TF-IDF centroid,
+  - "length": sentence length (the original heuristic).
+- Keep the top-N sentences (argpartition) and restore original order by index.
 """
 
 import re
 from typing import List, Tuple
 
+import numpy as np
+
 _SENT_SPLIT = re.compile(r'(?<=[\.\!\?])\s+')
+_WORD = re.compile(r"[^\W_]+", re.UNICODE)
+
+EXTRACTIVE_METHODS = ("textrank", "tfidf", "length")
+DEFAULT_METHOD = "textrank"
+
+# Function words carry no topic signal; English and Spanish cover our traffic.
+_STOPWORDS = frozenset("""
+a an and are as at be been but by can could did do does for from had has have he her his i if in into is it
+its just may might more most no not of on or our she so such than that the their them then there these they
+this those to too was we were what when where which while who will with would you your also about after
+all any because before between both each few how only other over same some very out up down
+el la los las un una unos unas y o de del al en que es son por para con sin se su sus lo le les
+como mas más pero muy ya no si sí este esta estos estas ese esa esos esas ha han fue ser era
+""".split())
+
+_DAMPING = 0.85
+_MAX_ITERATIONS = 100
+_TOLERANCE = 1e-6
+
+
+def sentence_spans(text: str) -> List[Tuple[int, int]]:
+    """
+    Character offsets (start, end) of each sentence in `text`, whitespace-trimmed.
+    Shared by the extractive and the token-aware AI chunker.
+    """
+    spans: List[Tuple[int, int]] = []
+    pos = 0
+    bounds = [(m.start(), m.end()) for m in _SENT_SPLIT.finditer(text)]
+    bounds.append((len(text), len(text)))
+    for cut, nxt in bounds:
+        start, end = pos, cut
+        while start < end and text[start].isspace():
+            start += 1
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        if start < end:
+            spans.append((start, end))
+        pos = nxt
+    return spans
 
 
 def split_sentences(text: str) -> List[str]:
     """Split text into sentences using a simple regex rule."""
-    parts = _SENT_SPLIT.split(text.strip())
-    return [p.strip() for p in parts if p.strip()]
+    return [text[start:end] for start, end in sentence_spans(text)]
+
+
+def _term_matrix(sentences: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+    """
+    Sparse term-frequency matrix of `sentences` in COO form.
+
+    Returns:
+        (rows, cols, counts, n_terms): one entry per distinct (sentence, term) pair.
+    """
+    tokens = [[w for w in _WORD.findall(s.lower()) if w not in _STOPWORDS] for s in sentences]
+    lengths = np.fromiter((len(t) for t in tokens), dtype=np.int64, count=len(tokens))
+    flat = [w for t in tokens for w in t]
+    if not flat:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty, 0
+
+    vocab, term_ids = np.unique(np.array(flat), return_inverse=True)
+    n_terms = len(vocab)
+    sentence_ids = np.repeat(np.arange(len(sentences)), lengths)
+    pairs, counts = np.unique(sentence_ids * n_terms + term_ids.ravel(), return_counts=True)
+    return pairs // n_terms, pairs % n_terms, counts, n_terms
+
+
+def _tfidf_weights(cols: np.ndarray, counts: np.ndarray, n_sentences: int, n_terms: int) -> np.ndarray:
+    """Sublinear TF times smoothed IDF (sentences act as documents), per COO entry."""
+    df = np.bincount(cols, minlength=n_terms)
+    idf = np.log((1.0 + n_sentences) / (1.0 + df)) + 1.0
+    return (1.0 + np.log(counts)) * idf[cols]
+
+
+def _tfidf_scores(rows, cols, weights, n_sentences: int, n_terms: int) -> np.ndarray:
+    centroid = np.bincount(cols, weights=weights, minlength=n_terms)
+    dots = np.bincount(rows, weights=weights * centroid[cols], minlength=n_sentences)
+    norms = np.sqrt(np.bincount(rows, weights=weights ** 2, minlength=n_sentences))
+    centroid_norm = np.sqrt(np.dot(centroid, centroid))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores = dots / (norms * centroid_norm)
+    return np.nan_to_num(scores)
+
+
+def _textrank_scores(rows, cols, weights, n_sentences: int, n_terms: int) -> np.ndarray:
+    matrix = np.zeros((n_sentences, n_terms), dtype=np.float32)
+    matrix[rows, cols] = weights
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+
+    similarity = matrix @ matrix.T
+    np.fill_diagonal(similarity, 0.0)
+    out_weight = similarity.sum(axis=1, keepdims=True)
+    # Row-stochastic transitions; sentences without edges jump uniformly.
+    transition = np.divide(
+        similarity, out_weight, out=np.full_like(similarity, 1.0 / n_sentences), where=out_weight > 0
+    )
+
+    scores = np.full(n_sentences, 1.0 / n_sentences, dtype=np.float32)
+    teleport = (1.0 - _DAMPING) / n_sentences
+    for _ in range(_MAX_ITERATIONS):
+        updated = teleport + _DAMPING * (transition.T @ scores)
+        if np.abs(updated - scores).sum() < _TOLERANCE:
+            return updated
+        scores = updated
+    return scores
+
+
+def _score(method: str, rows, cols, counts, n_sentences: int, n_terms: int) -> np.ndarray:
+    weights = _tfidf_weights(cols, counts, n_sentences, n_terms)
+    if method == "tfidf":
+        return _tfidf_scores(rows, cols, weights, n_sentences, n_terms)
+    return _textrank_scores(rows, cols, weights, n_sentences, n_terms)
+
+
+def rank_sentences(sentences: List[str], method: str = DEFAULT_METHOD) -> np.ndarray:
+    """
+    Score each sentence (higher = more central) with the given method.
+
+    Returns:
+        float array aligned with `sentences`.
+    """
+    return rank_sentences_batch([sentences], method)[0]
+
+
+def rank_sentences_batch(documents: List[List[str]], method: str = DEFAULT_METHOD) -> List[np.ndarray]:
+    """
+    Score the sentences of many documents at once.
+
+    Tokenization and the term-frequency matrix are built in one pass over all
+    sentences; each document is then scored on its slice of the matrix (with
+    its own IDF), so results match `rank_sentences` per document.
+    """
+    if method not in EXTRACTIVE_METHODS:
+        raise ValueError(f"Unknown extractive method '{method}'. Available: {', '.join(EXTRACTIVE_METHODS)}.")
+    lengths = [np.fromiter((len(s) for s in doc), dtype=np.float64, count=len(doc)) for doc in documents]
+    if method == "length":
+        return lengths
+
+    rows, cols, counts, _ = _term_matrix([s for doc in documents for s in doc])
+    bounds = np.cumsum([0] + [len(doc) for doc in documents])
+    # COO entries are sorted by sentence, so each document is a contiguous slice.
+    starts = np.searchsorted(rows, bounds)
+    scores: List[np.ndarray] = []
+    for k, doc in enumerate(documents):
+        n = len(doc)
+        lo, hi = starts[k], starts[k + 1]
+        if n < 2:
+            scores.append(lengths[k])
+        elif lo == hi:
+            scores.append(np.zeros(n))
+        else:
+            terms, local_cols = np.unique(cols[lo:hi], return_inverse=True)
+            scores.append(_score(method, rows[lo:hi] - bounds[k], local_cols.ravel(), counts[lo:hi], n, len(terms)))
+    return scores
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the `k` best scores (argpartition, O(n)), in original order."""
+    n = scores.shape[0]
+    k = min(max(0, k), n)
+    if k == n:
+        return np.arange(n)
+    idx = np.argpartition(-scores, k - 1)[:k] if k else np.zeros(0, dtype=np.int64)
+    return np.sort(idx)
 
 
 def extractive_summary(
     text: str,
     ratio: float,
-    max_sentences: int | None = None
+    max_sentences: int | None = None,
+    method: str = DEFAULT_METHOD,
 ) -> Tuple[List[str], int]:
     """
-    Compute a minimal extractive summary.
+    Compute an extractive summary.
 
     Args:
         text: Raw input text.
         ratio: Fraction of sentences to keep (0.05 - 0.6).
         max_sentences: Optional absolute cap for the number of sentences.
+        method: "textrank", "tfidf" or "length" (see module docstring).
 
     Returns:
         chosen: The selected summary sentences in original order.
         total: Total number of sentences in the input text.
     """
-    sentences = split_sentences(text)
-    if not sentences:
-        return [], 0
+    return extractive_summaries([text], ratio, max_sentences, method)[0]
 
-    ranked = sorted(sentences, key=len, reverse=True)
-    n = max(1, int(len(sentences) * ratio))
-    if max_sentences:
-        n = min(n, max_sentences)
 
-    chosen = sorted(ranked[:n], key=lambda s: sentences.index(s))
-    return chosen, len(sentences)
\ No newline at end of file
+def extractive_summaries(
+    texts: List[str],
+    ratio: float,
+    max_sentences: int | None = None,
+    method: str = DEFAULT_METHOD,
+) -> List[Tuple[List[str], int]]:
+    """
+    Batch form of `extractive_summary`: one (chosen, total) pair per text, in order.
+    """
+    documents = [split_sentences(text) for text in texts]
+    results: List[Tuple[List[str], int]] = []
+    for sentences, scores in zip(documents, rank_sentences_batch(documents, method)):
+        if not sentences:
+            results.append(([], 0))
+            continue
+        n = max(1, int(len(sentences) * ratio))
+        if max_sentences:
+            n = min(n, max_sentences)
+        idx = top_k_indices(scores, n)
+        results.append(([sentences[i] for i in idx], len(sentences)))
+    return results
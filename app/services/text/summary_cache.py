@@ -0,0 +1,208 @@
+"""
+Content-addressed cache for abstractive summaries.
+
+- Key: SHA-256 of the normalized text + model id + generation parameters.
+- Memory tier: LRU bounded by total bytes, with per-entry TTL.
+- Optional disk tier: a sqlite file that survives restarts and is shared by
+  every uvicorn worker pointing at the same path.
+
+Used for whole documents and for individual map-step chunks, so an edited
+document only regenerates the chunks that actually changed.
+
+Environment variables:
+- AI_SUMMARY_CACHE: enable the cache (default: 1)
+- AI_SUMMARY_CACHE_MAX_BYTES: memory tier budget in bytes (default: 67108864 = 64 MiB)
+- AI_SUMMARY_CACHE_TTL_SECONDS: entry lifetime, 0 disables expiry (default: 86400)
+- AI_SUMMARY_CACHE_DB: sqlite file for the disk tier (default: unset = memory only)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+CACHE_ENABLED = os.getenv("AI_SUMMARY_CACHE", "1") == "1"
+CACHE_MAX_BYTES = int(os.getenv("AI_SUMMARY_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+CACHE_TTL_SECONDS = float(os.getenv("AI_SUMMARY_CACHE_TTL_SECONDS", "86400"))
+CACHE_DB_PATH = os.getenv("AI_SUMMARY_CACHE_DB")
+
+# Expired rows are purged from the disk tier every N writes.
+_DISK_PURGE_EVERY = 500
+
+_WS = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so trivially reformatted inputs share a key."""
+    return _WS.sub(" ", text).strip()
+
+
+def make_key(scope: str, text: str, model_id: str, *params: Any) -> str:
+    """
+    Build a content-addressed key.
+
+    Args:
+        scope: what is cached ("doc" for full summaries, "chunk" for map-step blocks).
+        text: input text (normalized before hashing).
+        model_id: identifier of the model that produced the summary.
+        params: generation parameters (min/max length, reduce mode, ...).
+    """
+    h = hashlib.sha256()
+    h.update(normalize_text(text).encode("utf-8"))
+    header = "|".join([scope, model_id, *(str(p) for p in params)])
+    return f"{header}|{h.hexdigest()}"
+
+
+class SummaryCache:
+    """
+    Two-tier LRU/TTL cache (memory + optional sqlite).
+    Thread-safe; the sqlite connection is opened lazily on first use.
+    """
+
+    def __init__(self, max_bytes: int, ttl_seconds: float, db_path: Optional[str] = None) -> None:
+        self.max_bytes = max(0, max_bytes)
+        self.ttl_seconds = max(0.0, ttl_seconds)
+        self.db_path = db_path
+        self._entries: "OrderedDict[str, Tuple[str, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_writes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # ---------- public API ----------
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, stored_at, _ = entry
+                if not self._expired(stored_at, now):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                self._drop(key)
+
+            value = self._disk_get(key, now)
+            if value is not None:
+                self._remember(key, value, now)
+                self.hits += 1
+                self.disk_hits += 1
+                return value
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+            self._disk_put(key, value, now)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": True,
+                "disk_enabled": bool(self.db_path),
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+            }
+
+    # ---------- memory tier ----------
+    def _expired(self, stored_at: float, now: float) -> bool:
+        return bool(self.ttl_seconds) and (now - stored_at) > self.ttl_seconds
+
+    def _drop(self, key: str) -> None:
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def _remember(self, key: str, value: str, now: float) -> None:
+        size = len(key) + len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = (value, now, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.evictions += 1
+
+    # ---------- disk tier ----------
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        if not self.db_path:
+            return None
+        if self._db is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            db = sqlite3.connect(self.db_path, timeout=5.0, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS summaries ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)"
+            )
+            db.commit()
+            self._db = db
+        return self._db
+
+    def _disk_get(self, key: str, now: float) -> Optional[str]:
+        db = self._connection()
+        if db is None:
+            return None
+        try:
+            row = db.execute("SELECT value, stored_at FROM summaries WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None or self._expired(row[1], now):
+            return None
+        return row[0]
+
+    def _disk_put(self, key: str, value: str, now: float) -> None:
+        db = self._connection()
+        if db is None:
+            return
+        try:
+            db.execute(
+                "INSERT OR REPLACE INTO summaries (key, value, stored_at) VALUES (?, ?, ?)",
+                (key, value, now),
+            )
+            self._db_writes += 1
+            if self.ttl_seconds and self._db_writes % _DISK_PURGE_EVERY == 0:
+                db.execute("DELETE FROM summaries WHERE stored_at < ?", (now - self.ttl_seconds,))
+            db.commit()
+        except sqlite3.Error:
+            # The disk tier is best-effort; the memory tier keeps working.
+            pass
+
+
+@lru_cache(maxsize=1)
+def get_summary_cache() -> SummaryCache:
+    """Lazily create the process-wide summary cache."""
+    return SummaryCache(CACHE_MAX_BYTES, CACHE_TTL_SECONDS, CACHE_DB_PATH)
+
+
+def cache_stats() -> Dict[str, Any]:
+    """Cache counters (or the static configuration when caching is disabled)."""
+    if not CACHE_ENABLED:
+        # Same keys as a live cache; the sqlite file is only opened on first use.
+        empty = SummaryCache(CACHE_MAX_BYTES, CACHE_TTL_SECONDS, CACHE_DB_PATH)
+        return {**empty.stats(), "enabled": False}
+    return get_summary_cache().stats()
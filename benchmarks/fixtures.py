@@ -0,0 +1,100 @@
+"""
+Deterministic synthetic inputs for the offline benchmarks (no downloads).
+
+- `synthetic_text(n_chars, seed)`: English prose of roughly `n_chars`
+  characters assembled from fixed templates, so runs are comparable.
+- `make_test_video(path, seconds, variant)`: small MP4 with an audio track
+  generated by ffmpeg. Speech is synthesized with the lavfi `flite` source
+  when ffmpeg has it; otherwise a modulated tone is used (Whisper then
+  mostly finds no speech, but decode and ASR time are still exercised).
+"""
+
+from __future__ import annotations
+
+import random
+import subprocess
+from functools import lru_cache
+from pathlib import Path
+
+_SUBJECTS = (
+    "The city council", "A research team", "The regional library", "Local engineers", "The transit agency",
+    "A group of volunteers", "The university lab", "Hospital administrators", "The school district",
+    "Small business owners",
+)
+_VERBS = (
+    "announced", "reviewed", "expanded", "measured", "proposed", "tested", "funded", "delayed", "published",
+    "evaluated",
+)
+_OBJECTS = (
+    "a new battery storage program", "the late-night bus schedule", "a pilot for free reading workshops",
+    "the water quality report", "a plan to replace aging bridges", "the results of a two-year study",
+    "an update to the recycling rules", "a grant for solar panels on schools", "the budget for park repairs",
+    "a survey of commuter habits",
+)
+_TAILS = (
+    "after months of public hearings", "to cut waiting times by a third", "despite concerns about cost",
+    "with support from neighboring towns", "ahead of the winter season", "following complaints from residents",
+    "as part of a broader climate strategy", "using data collected from sensors", "before the next election",
+    "in partnership with local companies",
+)
+
+_SPOKEN = (
+    "Good morning and welcome to the weekly city update. "
+    "The transit agency will extend late night bus service on three routes starting next month. "
+    "The library is adding free reading workshops for adults on Saturday mornings. "
+    "Researchers at the university reported that the new batteries kept most of their capacity after a year. "
+    "Residents can comment on the park budget until the end of the week. "
+)
+
+
+def synthetic_text(n_chars: int, seed: int = 0) -> str:
+    """Deterministic prose of about `n_chars` characters (paragraphs of 5 sentences)."""
+    rng = random.Random(seed)
+    sentences, size = [], 0
+    while size < n_chars:
+        sentence = f"{rng.choice(_SUBJECTS)} {rng.choice(_VERBS)} {rng.choice(_OBJECTS)} {rng.choice(_TAILS)}."
+        sentences.append(sentence)
+        size += len(sentence) + 1
+    paragraphs = [" ".join(sentences[i:i + 5]) for i in range(0, len(sentences), 5)]
+    return "\n\n".join(paragraphs)
+
+
+@lru_cache(maxsize=1)
+def ffmpeg_has_flite() -> bool:
+    try:
+        out = subprocess.run(["ffmpeg", "-hide_banner", "-filters"], capture_output=True, text=True)
+    except FileNotFoundError:
+        return False
+    return out.returncode == 0 and " flite " in out.stdout
+
+
+def make_test_video(path: Path, seconds: float, variant: int = 0) -> Path:
+    """
+    Write a `seconds`-long MP4 (tiny black video + mono audio) to `path`.
+    Different `variant`s produce different bytes (distinct uploads are not
+    coalesced by the single-flight layer).
+    """
+    if ffmpeg_has_flite():
+        repeats = int(seconds // 20) + 1
+        text = (f"Update number {variant + 1}. " + _SPOKEN * repeats).replace("'", "")
+        audio = ["-f", "lavfi", "-i", f"flite=text='{text}':voice=slt"]
+    else:
+        # 1 s on / 1 s off, so an enabled VAD sees speech-like regions.
+        expr = f"0.3*sin(2*PI*{220 + 10 * variant}*t)*gt(sin(PI*t),0)"
+        audio = ["-f", "lavfi", "-i", f"aevalsrc={expr}:s=16000"]
+    cmd = [
+        "ffmpeg", "-hide_banner", "-loglevel", "error", "-y",
+        *audio,
+        "-f", "lavfi", "-i", "color=c=black:s=64x64:r=5",
+        "-t", str(seconds),
+        "-map", "1:v", "-map", "0:a",
+        "-c:v", "libx264", "-preset", "ultrafast",
+        "-c:a", "aac", "-ac", "1",
+        "-af", "apad",
+        "-movflags", "+faststart",
+        str(path),
+    ]
+    proc = subprocess.run(cmd, capture_output=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffmpeg could not generate {path}: {proc.stderr.decode('utf-8', errors='ignore')}")
+    return path
@@ -0,0 +1,93 @@
+"""
+Quality and latency of the hybrid (extract-then-abstract) summary mode against map-reduce.
+
+Summarizes every text in benchmarks/corpus/ (plus all of them concatenated,
+the long-input case hybrid targets) with reduce_mode="tree" and "hybrid",
+reports ROUGE of the hybrid summaries using the tree summaries as reference,
+model calls and wall time per mode, and exits non-zero when mean ROUGE-L
+falls below --min-rouge-l.
+
+The corpus texts are short, so the model window is lowered with
+--max-input-tokens (AI_SUMMARY_MAX_INPUT_TOKENS) to make them multi-chunk;
+pass 0 to keep the server setting. The summary cache is disabled.
+
+    python -m benchmarks.hybrid_quality --max-input-tokens 128 --min-rouge-l 0.3
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from benchmarks.rouge import mean_scores, rouge_scores
+
+CORPUS_DIR = Path(__file__).parent / "corpus"
+MODES = ("tree", "hybrid")
+
+
+def _summarize_all(texts: List[str], mode: str, min_length: int, max_length: int) -> Tuple[List[Tuple[str, dict]], float]:
+    from app.services.text.ai_summarize_service import summarize_ai_text_detailed
+
+    started = time.perf_counter()
+    results = [summarize_ai_text_detailed(t, min_length, max_length, reduce_mode=mode) for t in texts]
+    return results, time.perf_counter() - started
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--min-length", type=int, default=30)
+    parser.add_argument("--max-length", type=int, default=120)
+    parser.add_argument("--max-input-tokens", type=int, default=128)
+    parser.add_argument("--min-rouge-l", type=float, default=0.3)
+    parser.add_argument("--corpus", type=Path, default=CORPUS_DIR)
+    args = parser.parse_args()
+
+    # Read at import time by the summarizer, so set them before importing it.
+    os.environ["AI_SUMMARY_CACHE"] = "0"
+    if args.max_input_tokens:
+        os.environ["AI_SUMMARY_MAX_INPUT_TOKENS"] = str(args.max_input_tokens)
+    from app.services.text.ai_summarize_service import MAX_INPUT_TOKENS, get_pipeline, model_label, resolve_model
+    from benchmarks.quantization_check import load_corpus
+
+    corpus = load_corpus(args.corpus)
+    corpus["combined"] = "\n\n".join(corpus.values())
+    names, texts = list(corpus), list(corpus.values())
+    get_pipeline()  # load outside the timings
+
+    runs: Dict[str, List[Tuple[str, dict]]] = {}
+    seconds: Dict[str, float] = {}
+    for mode in MODES:
+        runs[mode], seconds[mode] = _summarize_all(texts, mode, args.min_length, args.max_length)
+
+    per_doc = {}
+    for k, name in enumerate(names):
+        (tree_summary, tree_info), (hybrid_summary, hybrid_info) = runs["tree"][k], runs["hybrid"][k]
+        per_doc[name] = {
+            "chunks": tree_info["chunks"],
+            "tree_model_calls": tree_info["model_calls"],
+            "hybrid_model_calls": hybrid_info["model_calls"],
+            "extracted_sentences": hybrid_info["extracted_sentences"],
+            "rouge_vs_tree": rouge_scores(hybrid_summary, tree_summary),
+        }
+    mean = mean_scores([d["rouge_vs_tree"] for d in per_doc.values()])
+    report = {
+        "model": model_label(resolve_model()),
+        "max_input_tokens": MAX_INPUT_TOKENS,
+        "documents": len(texts),
+        "seconds": {mode: round(s, 3) for mode, s in seconds.items()},
+        "model_calls": {mode: sum(info["model_calls"] for _, info in runs[mode]) for mode in MODES},
+        "speedup": round(seconds["tree"] / seconds["hybrid"], 2) if seconds["hybrid"] else None,
+        "rouge_vs_tree": mean,
+        "per_document": per_doc,
+    }
+    print(json.dumps(report, indent=2))
+    return 0 if mean.get("rougeL", 0.0) >= args.min_rouge_l else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
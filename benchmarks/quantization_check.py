@@ -0,0 +1,86 @@
+"""
+Accuracy and latency check for the int8 summarizer against fp32.
+
+Summarizes every text in benchmarks/corpus/ with both variants of the
+configured model (AI_SUMMARY_MODEL / AI_SUMMARY_MODEL_PATH), reports ROUGE of
+the int8 summaries using the fp32 summaries as reference, plus the speedup,
+and exits non-zero when mean ROUGE-L falls below --min-rouge-l.
+
+    python -m benchmarks.quantization_check --min-rouge-l 0.8
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import torch
+from transformers import AutoModelForSeq2SeqLM, AutoTokenizer, pipeline
+
+from app.core.torch_runtime import configure_torch_threads
+from app.services.text.ai_summarize_service import MODEL_SOURCE
+from app.services.text.quantization import load_quantized_model
+from benchmarks.rouge import mean_scores, rouge_scores
+
+CORPUS_DIR = Path(__file__).parent / "corpus"
+
+
+def load_corpus(corpus_dir: Path = CORPUS_DIR) -> Dict[str, str]:
+    """Map file stem -> text for every .txt file in `corpus_dir`."""
+    return {p.stem: p.read_text(encoding="utf-8").strip() for p in sorted(corpus_dir.glob("*.txt"))}
+
+
+def _summarize_all(model, tokenizer, texts: List[str], min_length: int, max_length: int) -> Tuple[List[str], float]:
+    summarizer = pipeline("summarization", model=model, tokenizer=tokenizer, framework="pt", device=-1)
+    # Warm up once so the timing excludes lazy initialization.
+    summarizer(texts[0], min_length=5, max_length=10, do_sample=False, truncation=True)
+    started = time.perf_counter()
+    with torch.inference_mode():
+        outputs = [
+            summarizer(t, min_length=min_length, max_length=max_length, do_sample=False, truncation=True)[0]
+            for t in texts
+        ]
+    elapsed = time.perf_counter() - started
+    return [o["summary_text"].strip() for o in outputs], elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--min-length", type=int, default=30)
+    parser.add_argument("--max-length", type=int, default=120)
+    parser.add_argument("--min-rouge-l", type=float, default=0.8)
+    parser.add_argument("--corpus", type=Path, default=CORPUS_DIR)
+    args = parser.parse_args()
+
+    configure_torch_threads()
+    corpus = load_corpus(args.corpus)
+    names, texts = list(corpus), list(corpus.values())
+    tokenizer = AutoTokenizer.from_pretrained(MODEL_SOURCE)
+
+    fp32 = AutoModelForSeq2SeqLM.from_pretrained(MODEL_SOURCE).eval()
+    reference, fp32_seconds = _summarize_all(fp32, tokenizer, texts, args.min_length, args.max_length)
+    del fp32
+    int8 = load_quantized_model(MODEL_SOURCE)
+    candidate, int8_seconds = _summarize_all(int8, tokenizer, texts, args.min_length, args.max_length)
+
+    per_doc = {name: rouge_scores(c, r) for name, c, r in zip(names, candidate, reference)}
+    mean = mean_scores(list(per_doc.values()))
+    report = {
+        "model": MODEL_SOURCE,
+        "documents": len(texts),
+        "fp32_seconds": round(fp32_seconds, 3),
+        "int8_seconds": round(int8_seconds, 3),
+        "speedup": round(fp32_seconds / int8_seconds, 2) if int8_seconds else None,
+        "rouge_vs_fp32": mean,
+        "per_document": per_doc,
+    }
+    print(json.dumps(report, indent=2))
+    return 0 if mean.get("rougeL", 0.0) >= args.min_rouge_l else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
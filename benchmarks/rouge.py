@@ -0,0 +1,58 @@
+"""
+Minimal ROUGE-1 / ROUGE-2 / ROUGE-L (F1) for offline quality checks.
+
+Lowercased alphanumeric tokens, no stemming; close enough to compare two
+model variants on the same corpus without extra dependencies.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import Counter
+from typing import Dict, List
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def _f1(overlap: int, n_candidate: int, n_reference: int) -> float:
+    if not overlap or not n_candidate or not n_reference:
+        return 0.0
+    precision = overlap / n_candidate
+    recall = overlap / n_reference
+    return 2 * precision * recall / (precision + recall)
+
+
+def _ngrams(tokens: List[str], n: int) -> Counter:
+    return Counter(tuple(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+
+
+def _lcs_length(a: List[str], b: List[str]) -> int:
+    prev = [0] * (len(b) + 1)
+    for x in a:
+        cur = [0]
+        for j, y in enumerate(b):
+            cur.append(prev[j] + 1 if x == y else max(prev[j + 1], cur[j]))
+        prev = cur
+    return prev[-1]
+
+
+def rouge_scores(candidate: str, reference: str) -> Dict[str, float]:
+    """F1 scores {"rouge1", "rouge2", "rougeL"} of `candidate` against `reference`."""
+    cand, ref = tokenize(candidate), tokenize(reference)
+    scores = {}
+    for n in (1, 2):
+        c, r = _ngrams(cand, n), _ngrams(ref, n)
+        scores[f"rouge{n}"] = _f1(sum((c & r).values()), sum(c.values()), sum(r.values()))
+    scores["rougeL"] = _f1(_lcs_length(cand, ref), len(cand), len(ref))
+    return {k: round(v, 4) for k, v in scores.items()}
+
+
+def mean_scores(rows: List[Dict[str, float]]) -> Dict[str, float]:
+    """Average a list of score dicts key by key."""
+    if not rows:
+        return {}
+    return {k: round(sum(r[k] for r in rows) / len(rows), 4) for k in rows[0]}
@@ -0,0 +1,148 @@
+"""
+Measure cold startup of the API as shipped and check that no heavy ML stack
+is loaded before the port is bound.
+
+Two measurements per run, each in fresh processes:
+- import: imports `serve` (and with it `main`) and runs what serve.py does
+  before binding (`preload_models()` with the configured PRELOAD_MODELS);
+  reports the wall time and which of torch / transformers / whisper ended
+  up in sys.modules.
+- ready: starts `python serve.py` (the Docker entrypoint) on a free port and
+  reports the wall time until GET /ready answers 200.
+
+Both run with the shipped defaults (the Dockerfile's WEB_CONCURRENCY=1, no
+PRELOAD_MODELS / WARMUP_ON_STARTUP overrides); pass --env KEY=VALUE to
+measure other settings. Exits non-zero if a heavy module was imported or
+the server did not become ready within --timeout.
+
+    python -m benchmarks.startup_time --runs 5
+    python -m benchmarks.startup_time --env WEB_CONCURRENCY=2
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Dict, List, Optional
+
+HEAVY_MODULES = ("torch", "transformers", "whisper")
+ROOT = Path(__file__).resolve().parent.parent
+
+# Settings that change startup; cleared so runs use the shipped defaults.
+_STARTUP_SETTINGS = ("WEB_CONCURRENCY", "PRELOAD_MODELS", "WARMUP_ON_STARTUP", "WARMUP_MODELS")
+_SHIPPED_ENV = {"WEB_CONCURRENCY": "1"}
+
+_PROBE = f"""
+import json, sys, time
+t = time.perf_counter()
+import serve
+serve.preload_models()
+elapsed = time.perf_counter() - t
+print(json.dumps({{"seconds": elapsed, "heavy": [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))
+"""
+
+
+def _env(overrides: Dict[str, str]) -> Dict[str, str]:
+    env = {k: v for k, v in os.environ.items() if k not in _STARTUP_SETTINGS}
+    return {**env, **_SHIPPED_ENV, **overrides}
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _ready_seconds(env: Dict[str, str], timeout: float) -> Optional[float]:
+    """Seconds from launching serve.py until /ready returns 200 (None on timeout or exit)."""
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}/ready"
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "serve.py"], cwd=ROOT, env={**env, "HOST": "127.0.0.1", "PORT": str(port)},
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout and proc.poll() is None:
+            try:
+                with urllib.request.urlopen(url, timeout=1) as resp:
+                    if resp.status == 200:
+                        return time.perf_counter() - started
+            except (urllib.error.URLError, ConnectionError, TimeoutError):
+                pass  # not bound yet, or still warming up (503)
+            time.sleep(0.05)
+        return None
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def _summary(samples: List[float], name: str) -> dict:
+    if not samples:
+        return {f"{name}_seconds_median": None, f"{name}_seconds_max": None}
+    return {
+        f"{name}_seconds_median": round(statistics.median(samples), 3),
+        f"{name}_seconds_max": round(max(samples), 3),
+    }
+
+
+def measure(runs: int, overrides: Dict[str, str], timeout: float) -> dict:
+    env = _env(overrides)
+    import_samples, ready_samples, heavy, ready_failures = [], [], set(), 0
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", _PROBE], cwd=ROOT, env=env, capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(out.strip().splitlines()[-1])
+        import_samples.append(result["seconds"])
+        heavy.update(result["heavy"])
+
+        seconds = _ready_seconds(env, timeout)
+        if seconds is None:
+            ready_failures += 1
+        else:
+            ready_samples.append(seconds)
+    return {
+        "runs": runs,
+        "settings": {k: env[k] for k in _STARTUP_SETTINGS if k in env},
+        **_summary(import_samples, "import"),
+        **_summary(ready_samples, "ready"),
+        "ready_failures": ready_failures,
+        "heavy_modules_imported": sorted(heavy),
+    }
+
+
+def _assignment(raw: str) -> tuple:
+    key, sep, value = raw.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError("expected KEY=VALUE")
+    return key, value
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--env", type=_assignment, action="append", default=[], help="KEY=VALUE override.")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Seconds to wait for /ready.")
+    args = parser.parse_args()
+
+    report = measure(max(1, args.runs), dict(args.env), args.timeout)
+    print(json.dumps(report, indent=2))
+    return 1 if report["heavy_modules_imported"] or report["ready_failures"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,283 @@
+"""
+Offline performance suite for the summarize and transcribe paths.
+
+Targets (each measured in a fresh interpreter so model-load time and peak
+RSS are per target):
+- extractive_summary: synthetic texts of several sizes
+- summarize_ai_text: same texts (summary cache disabled)
+- transcribe_video_action: ffmpeg-generated MP4s of several durations
+  (do_summary=false, never shed by admission control)
+
+For every target and input size it reports p50/p95/mean latency of
+sequential calls and throughput (calls/s) at each concurrency level, plus
+the target's model-load time and peak RSS. Results are written as JSON;
+with --baseline they are compared against a stored run and the suite exits
+non-zero when a metric regressed by more than --tolerance.
+
+Runs without network: HF_HUB_OFFLINE / TRANSFORMERS_OFFLINE are set, so
+the summarization model must already be in the local cache (or
+AI_SUMMARY_MODEL_PATH), and the Whisper weights in ~/.cache/whisper.
+Settings under test (AI_SUMMARY_MAX_INPUT_TOKENS, AI_SUMMARY_MODEL,
+WHISPER_MODEL, ...) are read from the environment and recorded in the output.
+
+    python -m benchmarks.suite --output benchmarks/results.json
+    python -m benchmarks.suite --baseline benchmarks/baseline.json --tolerance 0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from benchmarks.fixtures import ffmpeg_has_flite, make_test_video, synthetic_text
+
+ROOT = Path(__file__).resolve().parent.parent
+TARGETS = ("extractive_summary", "summarize_ai_text", "transcribe_video_action")
+
+# Recorded with every run so results are only compared like for like.
+_SETTINGS = (
+    "AI_SUMMARY_MODEL", "AI_SUMMARY_MODEL_PATH", "AI_SUMMARY_MAX_INPUT_TOKENS", "AI_SUMMARY_REDUCE_MODE",
+    "AI_SUMMARY_BATCHING", "AI_SUMMARY_QUANTIZE", "WHISPER_MODEL", "ASR_PROFILE", "ASR_PARALLEL_WORKERS", "ASR_VAD_ENABLED",
+    "TORCH_INTRA_OP_THREADS", "TORCH_INTER_OP_THREADS",
+)
+_OFFLINE_ENV = {"HF_HUB_OFFLINE": "1", "TRANSFORMERS_OFFLINE": "1", "AI_SUMMARY_CACHE": "0"}
+
+# (model load seconds or None, {case label: call(i)})
+_Setup = Tuple[Optional[float], Dict[str, Callable[[int], Any]]]
+
+
+# ---------- measurement ----------
+def percentile(samples: List[float], q: float) -> float:
+    """Linear-interpolated percentile (q in [0, 100]) of a non-empty sample."""
+    ordered = sorted(samples)
+    pos = (len(ordered) - 1) * q / 100.0
+    low = int(pos)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (pos - low)
+
+
+def _latency(call: Callable[[int], Any], iterations: int) -> Dict[str, float]:
+    samples = []
+    for i in range(iterations):
+        started = time.perf_counter()
+        call(i)
+        samples.append(time.perf_counter() - started)
+    return {
+        "p50_seconds": round(percentile(samples, 50), 4),
+        "p95_seconds": round(percentile(samples, 95), 4),
+        "mean_seconds": round(statistics.fmean(samples), 4),
+    }
+
+
+def _throughput(call: Callable[[int], Any], concurrency: int, rounds: int) -> float:
+    n_calls = concurrency * rounds
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        started = time.perf_counter()
+        list(pool.map(call, range(n_calls)))
+        elapsed = time.perf_counter() - started
+    return round(n_calls / elapsed, 3) if elapsed else 0.0
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux (bytes on macOS).
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+# ---------- targets (run inside the child process) ----------
+def _setup_extractive(args: argparse.Namespace, workdir: Path) -> _Setup:
+    from app.services.text.summarize_service import extractive_summary
+
+    cases = {}
+    for n_chars in args.text_sizes:
+        text = synthetic_text(n_chars, seed=n_chars)
+        cases[f"{n_chars}_chars"] = lambda _i, text=text: extractive_summary(text, ratio=0.2)
+    return None, cases
+
+
+def _setup_ai(args: argparse.Namespace, workdir: Path) -> _Setup:
+    from app.services.text.ai_summarize_service import get_pipeline, summarize_ai_text
+
+    started = time.perf_counter()
+    get_pipeline()
+    load_seconds = time.perf_counter() - started
+
+    cases = {}
+    for n_chars in args.text_sizes:
+        text = synthetic_text(n_chars, seed=n_chars)
+        cases[f"{n_chars}_chars"] = lambda _i, text=text: summarize_ai_text(text, min_length=30, max_length=120)
+    return load_seconds, cases
+
+
+def _setup_transcribe(args: argparse.Namespace, workdir: Path) -> _Setup:
+    from fastapi import HTTPException, UploadFile
+
+    from app.controllers.transcribe_controller import transcribe_video_action
+    from app.core.admission import admission_exempt
+    from app.services.speech.asr_service import get_asr_model
+
+    started = time.perf_counter()
+    get_asr_model()
+    load_seconds = time.perf_counter() - started
+
+    # One file per concurrent caller: identical uploads would share one run.
+    variants = max(args.concurrency)
+    cases = {}
+    for seconds in args.audio_seconds:
+        paths = [make_test_video(workdir / f"{seconds}s_{v}.mp4", seconds, v) for v in range(variants)]
+
+        def call(i: int, paths: List[Path] = paths) -> None:
+            with open(paths[i % len(paths)], "rb") as f, admission_exempt():
+                try:
+                    transcribe_video_action(UploadFile(file=f, filename="bench.mp4"), False, 60, 160)
+                except HTTPException as exc:
+                    if exc.status_code != 422:  # synthetic audio may contain no speech
+                        raise
+
+        cases[f"{seconds:g}s_audio"] = call
+    return load_seconds, cases
+
+
+_SETUPS = {
+    "extractive_summary": _setup_extractive,
+    "summarize_ai_text": _setup_ai,
+    "transcribe_video_action": _setup_transcribe,
+}
+
+
+def run_target(target: str, args: argparse.Namespace) -> Dict[str, Any]:
+    """Measure one target in this process (called in the child)."""
+    with tempfile.TemporaryDirectory(prefix="bench-") as tmp:
+        load_seconds, cases = _SETUPS[target](args, Path(tmp))
+        rss_after_load = _peak_rss_mb()
+        results: Dict[str, Any] = {}
+        for label, call in cases.items():
+            call(0)  # warm-up, excluded from the timings
+            results[label] = {
+                **_latency(call, args.iterations),
+                "throughput_rps": {str(c): _throughput(call, c, args.rounds) for c in args.concurrency},
+            }
+    return {
+        "model_load_seconds": round(load_seconds, 3) if load_seconds is not None else None,
+        "peak_rss_after_load_mb": rss_after_load,
+        "peak_rss_mb": _peak_rss_mb(),
+        "cases": results,
+    }
+
+
+# ---------- orchestration ----------
+def _run_child(target: str, argv: List[str]) -> Dict[str, Any]:
+    env = {**os.environ, **_OFFLINE_ENV}
+    proc = subprocess.run(
+        [sys.executable, "-m", "benchmarks.suite", "--child", target, *argv],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        return {"error": (proc.stderr.strip().splitlines() or ["failed"])[-1]}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def _metadata() -> Dict[str, Any]:
+    commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "commit": commit.stdout.strip() or None,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "speech_audio": ffmpeg_has_flite(),
+        "settings": {name: os.environ[name] for name in _SETTINGS if name in os.environ},
+    }
+
+
+def _flatten(results: Dict[str, Any], prefix: str = "") -> Iterator[Tuple[str, float]]:
+    for key, value in results.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            yield from _flatten(value, path + ".")
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield path, float(value)
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> Dict[str, Any]:
+    """
+    Compare two `results` sections metric by metric. Latencies, load times and
+    RSS regress when higher, throughput when lower, beyond `tolerance` (0.2 = 20%).
+    """
+    base = dict(_flatten(baseline))
+    changes, regressions = {}, []
+    for path, value in _flatten(current):
+        before = base.get(path)
+        if not before:
+            continue
+        ratio = value / before
+        changes[path] = {"baseline": before, "current": value, "ratio": round(ratio, 3)}
+        worse = ratio < 1 - tolerance if ".throughput_rps." in path else ratio > 1 + tolerance
+        if worse:
+            regressions.append(path)
+    return {"tolerance": tolerance, "regressions": regressions, "metrics": changes}
+
+
+def _csv(kind: Callable[[str], Any]) -> Callable[[str], List[Any]]:
+    return lambda raw: [kind(x) for x in raw.split(",") if x.strip()]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--targets", type=_csv(str), default=list(TARGETS))
+    parser.add_argument("--text-sizes", type=_csv(int), default=[1000, 5000, 20000], help="Characters per text.")
+    parser.add_argument("--audio-seconds", type=_csv(float), default=[15.0, 60.0])
+    parser.add_argument("--iterations", type=int, default=5, help="Sequential calls per case for latency.")
+    parser.add_argument("--concurrency", type=_csv(int), default=[1, 4])
+    parser.add_argument("--rounds", type=int, default=2, help="Calls per worker in throughput runs.")
+    parser.add_argument("--output", type=Path, default=None, help="Write results JSON here.")
+    parser.add_argument("--baseline", type=Path, default=None, help="Results JSON to compare against.")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--child", choices=TARGETS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_target(args.child, args)))
+        return 0
+
+    unknown = set(args.targets) - set(TARGETS)
+    if unknown:
+        parser.error(f"unknown targets: {', '.join(sorted(unknown))}")
+    child_argv = [
+        "--text-sizes", ",".join(map(str, args.text_sizes)),
+        "--audio-seconds", ",".join(map(str, args.audio_seconds)),
+        "--iterations", str(args.iterations),
+        "--concurrency", ",".join(map(str, args.concurrency)),
+        "--rounds", str(args.rounds),
+    ]
+    report: Dict[str, Any] = {
+        "meta": _metadata(),
+        "results": {target: _run_child(target, child_argv) for target in args.targets},
+    }
+    failed = any("error" in r for r in report["results"].values())
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        report["comparison"] = compare(report["results"], baseline["results"], args.tolerance)
+        failed = failed or bool(report["comparison"]["regressions"])
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    print(text)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
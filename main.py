@@ -1,31 +1,81 @@
 """
 Smart AI Tools - Main Application
-- /health
+- /health (liveness) and /ready (readiness, after optional warmup)
+- /metrics (Prometheus text format: per-stage latencies, tokens, ASR speed)
 - /summarize
 - /summarize/ai (model loads lazily on first call)
+- /transcribe/video
+- /jobs (asynchronous jobs backed by a durable local queue)
+- /models (selectable models and the in-memory model registry)
 """
 
+import time
+
+_IMPORT_STARTED = time.perf_counter()
+
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, Response
+from app.core import metrics
 from app.core.config import settings
 from app.core.cors import setup_cors
+from app.core.limits import setup_upload_limit
+from app.core.warmup import mark_started, readiness, start_warmup
 from app.routers.summarize_router import router as summarize_router
 from app.routers.transcribe_router import router as transcribe_router
-# NOTE: we do NOT import get_pipeline here to avoid side effects on startup.
-# The controller/service will import and call it only when /summarize/ai is hit.
+from app.routers.jobs_router import router as jobs_router
+from app.routers.models_router import router as models_router
+from app.controllers.jobs_controller import start_job_workers, stop_job_workers
+# NOTE: torch, transformers and whisper are imported by the services on first
+# model load, not here, so startup stays fast (see benchmarks/startup_time.py).
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    """Start job workers (and the optional warmup) on startup; stop workers on shutdown."""
+    start_job_workers()
+    mark_started(time.perf_counter() - _IMPORT_STARTED)
+    start_warmup()
+    yield
+    stop_job_workers()
+
 
 app = FastAPI(
     title=settings.app_name,
     version=settings.version,
     description="Summarization API (extractive + AI) using free CPU-friendly models.",
+    lifespan=lifespan,
 )
 
 setup_cors(app)
+setup_upload_limit(app, path_prefixes=("/transcribe", "/jobs/transcribe"))
+metrics.setup_server_timing(app)
 
 @app.get("/health")
 def health() -> dict:
     """Simple health check."""
     return {"status": "ok"}
 
+
+@app.get("/ready")
+def ready():
+    """Readiness check: 503 until the startup warmup (WARMUP_ON_STARTUP=1) has finished."""
+    state = readiness()
+    if not state["ready"]:
+        return JSONResponse(status_code=503, content={"status": "warming_up", **state})
+    return {"status": "ready", **state}
+
+
+@app.get("/metrics")
+def prometheus_metrics():
+    """Per-process metrics in Prometheus text format (404 when METRICS_ENABLED=0)."""
+    if not metrics.METRICS_ENABLED:
+        return JSONResponse(status_code=404, content={"detail": "Metrics are disabled."})
+    return Response(metrics.metrics.render(), media_type=metrics.CONTENT_TYPE)
+
 # Register routes last
 app.include_router(summarize_router)
-app.include_router(transcribe_router)
\ No newline at end of file
+app.include_router(transcribe_router)
+app.include_router(jobs_router)
+app.include_router(models_router)
\ No newline at end of file
@@ -0,0 +1,141 @@
+"""
+Pre-fork server: load model weights once, then fork uvicorn workers that share them.
+
+The parent imports the app, preloads and pins the models (PRELOAD_MODELS, by
+default only when WEB_CONCURRENCY > 1), freezes the GC so collections in the
+workers do not touch (and copy) the parent's objects, binds the socket, and
+forks WEB_CONCURRENCY workers. Model
+tensors are never written after loading, so the workers share those pages
+copy-on-write instead of each loading its own copy. Dead workers are
+restarted with exponential backoff; after WORKER_MAX_RESTARTS consecutive
+crashes (workers dying within WORKER_STABLE_SECONDS of starting) the server
+gives up and exits non-zero. SIGTERM/SIGINT stop all of them.
+
+The parent only loads weights and never runs inference, so no torch thread
+pools exist when forking. Warmup (WARMUP_ON_STARTUP=1) runs in each worker.
+
+    python serve.py
+
+Environment variables:
+- HOST (default: 0.0.0.0), PORT (default: 8000)
+- WEB_CONCURRENCY: number of worker processes (default: 1)
+- WORKER_MAX_RESTARTS: consecutive crash restarts before giving up (default: 10)
+- WORKER_STABLE_SECONDS: uptime after which a worker exit no longer counts as a crash loop (default: 60)
+- PRELOAD_MODELS: models loaded in the parent (see app/core/warmup.py; default:
+  "summarizer,asr" with several workers, none with one)
+"""
+
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+
+import uvicorn
+
+from app.core.warmup import preload_models
+from main import app
+
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", "8000"))
+WEB_CONCURRENCY = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+WORKER_MAX_RESTARTS = int(os.getenv("WORKER_MAX_RESTARTS", "10"))
+WORKER_STABLE_SECONDS = float(os.getenv("WORKER_STABLE_SECONDS", "60"))
+MAX_RESTART_BACKOFF_SECONDS = 30.0
+
+logger = logging.getLogger("serve")
+
+
+def _serve(sock: socket.socket) -> None:
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    config = uvicorn.Config(app, host=HOST, port=PORT, lifespan="on")
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def _spawn(sock: socket.socket) -> int:
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            _serve(sock)
+        except SystemExit as exc:
+            code = exc.code if isinstance(exc.code, int) else 1
+        except BaseException:
+            logger.exception("Worker %d crashed", os.getpid())
+            code = 1
+        finally:
+            logging.shutdown()
+            os._exit(code)
+    return pid
+
+
+def _restart_delay(crashes: int) -> float:
+    """Backoff before restarting a worker after `crashes` consecutive crashes: 1, 2, 4, ... s."""
+    return min(2.0 ** max(crashes - 1, 0), MAX_RESTART_BACKOFF_SECONDS)
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s [%(name)s] %(message)s")
+    started = time.perf_counter()
+    loaded = preload_models()
+    logger.info("Preloaded %s in %.1fs", ", ".join(loaded) or "no models", time.perf_counter() - started)
+
+    gc.collect()
+    gc.freeze()
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((HOST, PORT))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+
+    stopping = False
+    failed = False
+    workers = {}  # pid -> monotonic start time
+    crashes = 0
+
+    def stop(*_):
+        nonlocal stopping
+        stopping = True
+        for pid in list(workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for _ in range(WEB_CONCURRENCY):
+        workers[_spawn(sock)] = time.monotonic()
+    while workers:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        uptime = time.monotonic() - workers.pop(pid, time.monotonic())
+        if stopping:
+            continue
+        code = os.waitstatus_to_exitcode(status)
+        crashes = crashes + 1 if uptime < WORKER_STABLE_SECONDS else 1
+        if crashes > WORKER_MAX_RESTARTS:
+            logger.error("Worker %d exited with code %d; giving up after %d restarts", pid, code, WORKER_MAX_RESTARTS)
+            failed = True
+            stop()
+            continue
+        delay = _restart_delay(crashes)
+        logger.warning("Worker %d exited with code %d after %.1fs; restarting in %gs", pid, code, uptime, delay)
+        time.sleep(delay)
+        if not stopping:
+            workers[_spawn(sock)] = time.monotonic()
+    sock.close()
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+"""
+Shared pytest setup: make the `app` package importable when pytest is run
+from the repository root without installing anything.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
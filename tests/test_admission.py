@@ -0,0 +1,70 @@
+"""
+Admission control: budget and concurrency shedding, ticket release, exemption.
+"""
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.admission import AdmissionController, admission_exempt
+
+
+@pytest.fixture
+def controller():
+    return AdmissionController(budget_seconds=10.0, drain_rate=2.0, max_concurrent=2)
+
+
+def test_release_is_idempotent(controller):
+    ticket = controller.acquire(4.0, "test")
+    ticket.release()
+    ticket.release()
+
+    stats = controller.stats()
+    assert stats["in_flight_cost_seconds"] == 0.0 and stats["in_flight_requests"] == 0
+
+
+def test_zero_cost_ticket_frees_its_concurrency_slot(controller):
+    for _ in range(3):
+        controller.acquire(0.0, "test").release()
+    assert controller.stats()["in_flight_requests"] == 0
+
+
+def test_over_budget_is_shed_with_retry_after(controller):
+    held = controller.acquire(8.0, "test")
+
+    with pytest.raises(HTTPException) as info:
+        controller.acquire(6.0, "test")
+    assert info.value.status_code == 503
+    assert int(info.value.headers["Retry-After"]) >= 1
+    assert controller.stats()["rejected"] == 1
+
+    held.release()
+    controller.acquire(6.0, "test").release()
+
+
+def test_over_budget_request_runs_when_idle(controller):
+    with controller.admit(50.0, "test") as ticket:
+        assert ticket.cost == 50.0
+    assert controller.stats()["in_flight_requests"] == 0
+
+
+def test_concurrency_cap(controller):
+    tickets = [controller.acquire(0.1, "test") for _ in range(2)]
+
+    with pytest.raises(HTTPException) as info:
+        controller.acquire(0.1, "test")
+    assert info.value.status_code == 503
+    for ticket in tickets:
+        ticket.release()
+
+
+def test_exempt_work_is_admitted_and_counted(controller):
+    held = controller.acquire(9.0, "test")
+    with admission_exempt():
+        exempt = controller.acquire(9.0, "test")
+    assert controller.stats()["in_flight_cost_seconds"] == 18.0
+
+    with pytest.raises(HTTPException):
+        controller.acquire(1.0, "test")
+    exempt.release()
+    held.release()
+    assert controller.stats()["in_flight_requests"] == 0
@@ -0,0 +1,82 @@
+"""
+Micro-batching scheduler: blocks of concurrent callers share model batches.
+The model is replaced by a recorder, so no weights are loaded.
+"""
+
+import threading
+
+import pytest
+
+from app.services.text import ai_summarize_service as svc
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    recorded = []
+    lock = threading.Lock()
+
+    def fake_pipeline(blocks, min_length, max_length, model=svc.DEFAULT_MODEL):
+        with lock:
+            recorded.append((list(blocks), min_length, max_length))
+        return [f"summary of {b}" for b in blocks]
+
+    monkeypatch.setattr(svc, "_run_pipeline", fake_pipeline)
+    return recorded
+
+
+def test_blocks_submitted_together_share_one_batch(calls):
+    scheduler = svc.MicroBatchScheduler(max_batch_size=4, max_wait_ms=2000, length_bucket=128)
+    futures = [scheduler.submit(f"block {i}", 5, 20, n_tokens=10) for i in range(4)]
+
+    assert [f.result(timeout=5) for f in futures] == [f"summary of block {i}" for i in range(4)]
+    assert len(calls) == 1 and len(calls[0][0]) == 4
+    stats = scheduler.stats()
+    assert stats["batches_run"] == 1 and stats["blocks_processed"] == 4 and stats["largest_batch"] == 4
+
+
+def test_different_generation_parameters_are_not_mixed(calls):
+    scheduler = svc.MicroBatchScheduler(max_batch_size=4, max_wait_ms=2000, length_bucket=128)
+    futures = [scheduler.submit(f"block {i}", 5, 20 if i % 2 else 40, n_tokens=10) for i in range(4)]
+
+    for f in futures:
+        f.result(timeout=5)
+    assert sorted((len(blocks), max_length) for blocks, _, max_length in calls) == [(2, 20), (2, 40)]
+
+
+def test_pipeline_error_reaches_every_caller(monkeypatch):
+    def failing(blocks, *args, **kwargs):
+        raise RuntimeError("model crashed")
+
+    monkeypatch.setattr(svc, "_run_pipeline", failing)
+    scheduler = svc.MicroBatchScheduler(max_batch_size=2, max_wait_ms=2000, length_bucket=128)
+    futures = [scheduler.submit(f"block {i}", 5, 20, n_tokens=10) for i in range(2)]
+
+    for f in futures:
+        with pytest.raises(RuntimeError, match="model crashed"):
+            f.result(timeout=5)
+
+
+def test_summarize_blocks_goes_through_the_scheduler(monkeypatch, calls):
+    scheduler = svc.MicroBatchScheduler(max_batch_size=3, max_wait_ms=2000, length_bucket=128)
+    monkeypatch.setattr(svc, "BATCHING_ENABLED", True)
+    monkeypatch.setattr(svc, "CACHE_ENABLED", False)
+    monkeypatch.setattr(svc, "get_batch_scheduler", lambda: scheduler)
+    seen = {}
+
+    results, sent = svc._summarize_blocks(
+        ["a", "b", "c"], 5, 20, on_result=seen.__setitem__, n_tokens=[1, 1, 1]
+    )
+
+    assert results == ["summary of a", "summary of b", "summary of c"]
+    assert sent == [0, 1, 2]
+    assert seen == {0: "summary of a", 1: "summary of b", 2: "summary of c"}
+    assert scheduler.stats()["blocks_processed"] == 3
+
+
+def test_disabled_stats_have_the_live_keys(monkeypatch):
+    monkeypatch.setattr(svc, "BATCHING_ENABLED", False)
+    live = svc.MicroBatchScheduler(1, 0, 1).stats()
+    disabled = svc.batching_stats()
+
+    assert disabled.keys() == live.keys()
+    assert disabled["enabled"] is False
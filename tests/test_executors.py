@@ -0,0 +1,49 @@
+"""
+BoundedExecutor backlog limits and slot reservations.
+"""
+
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.executors import BoundedExecutor
+
+
+def test_full_backlog_is_rejected_with_503():
+    executor = BoundedExecutor("test", max_workers=1, max_queue=0)
+    release = threading.Event()
+    running = executor.submit(release.wait, 5)
+
+    with pytest.raises(HTTPException) as info:
+        executor.submit(lambda: None)
+    assert info.value.status_code == 503 and "Retry-After" in info.value.headers
+
+    release.set()
+    running.result(timeout=5)
+    assert executor.stats()["rejected"] == 1
+
+
+def test_reservation_holds_the_slot_until_used():
+    executor = BoundedExecutor("test", max_workers=1, max_queue=0)
+    slot = executor.reserve()
+
+    with pytest.raises(HTTPException):
+        executor.submit(lambda: None)
+    assert executor.stats()["queued"] == 1
+
+    assert slot.submit(lambda: 42).result(timeout=5) == 42
+    with pytest.raises(RuntimeError):
+        slot.submit(lambda: 0)
+    stats = executor.stats()
+    assert stats["queued"] == 0 and stats["completed"] == 1
+
+
+def test_cancelled_reservation_frees_the_slot():
+    executor = BoundedExecutor("test", max_workers=1, max_queue=0)
+    slot = executor.reserve()
+    slot.cancel()
+    slot.cancel()  # idempotent
+
+    assert executor.stats()["queued"] == 0
+    assert executor.submit(lambda: "ok").result(timeout=5) == "ok"
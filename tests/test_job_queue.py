@@ -0,0 +1,115 @@
+"""
+sqlite job queue: priorities, capacity, leases, reclaim and retry backoff.
+"""
+
+import socket
+import subprocess
+import sys
+import time
+
+import pytest
+
+from app.services.jobs.job_queue import JobQueue, JobRetry, QueueFull
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(str(tmp_path), max_attempts=2, lease_seconds=60, max_queued=10)
+
+
+def test_claims_by_priority_then_fifo(queue):
+    low = queue.enqueue("summarize", {"n": 1})
+    high = queue.enqueue("summarize", {"n": 2}, priority=5)
+    later = queue.enqueue("summarize", {"n": 3})
+
+    order = [queue.claim()["id"] for _ in range(3)]
+
+    assert order == [high["id"], low["id"], later["id"]]
+    assert queue.claim() is None
+
+
+def test_enqueue_refuses_past_capacity(tmp_path):
+    queue = JobQueue(str(tmp_path), max_queued=2)
+    queue.enqueue("summarize", {})
+    queue.enqueue("summarize", {})
+
+    with pytest.raises(QueueFull):
+        queue.enqueue("summarize", {})
+    assert queue.stats()["queued"] == 2
+
+
+def test_expired_lease_is_reclaimed_by_another_worker(tmp_path):
+    first = JobQueue(str(tmp_path), max_attempts=3, lease_seconds=0.05)
+    second = JobQueue(str(tmp_path), max_attempts=3, lease_seconds=60)
+    job = first.enqueue("summarize", {})
+    claimed = first.claim()
+    assert claimed["lease_owner"] == first.owner
+
+    time.sleep(0.1)
+    reclaimed = second.claim()
+
+    assert reclaimed["id"] == job["id"]
+    assert reclaimed["attempts"] == 2 and reclaimed["lease_owner"] == second.owner
+    # The first worker lost the lease: its late result is ignored.
+    first._finish(claimed, "succeeded", result={"stale": True})
+    assert second.get(job["id"])["status"] == "running"
+
+
+def test_renewed_lease_is_not_reclaimed(tmp_path):
+    first = JobQueue(str(tmp_path), lease_seconds=0.2)
+    second = JobQueue(str(tmp_path))
+    first.enqueue("summarize", {})
+    first.claim()
+
+    for _ in range(3):
+        time.sleep(0.1)
+        assert first.renew_leases() == 1
+    assert second.claim() is None
+
+
+def test_job_over_max_attempts_is_failed_and_skipped(tmp_path):
+    worker = JobQueue(str(tmp_path), max_attempts=1, lease_seconds=0.01)
+    dead = worker.enqueue("summarize", {})
+    worker.claim()
+    time.sleep(0.05)
+    fresh = worker.enqueue("summarize", {})
+
+    assert worker.claim()["id"] == fresh["id"]
+    assert worker.get(dead["id"])["status"] == "failed"
+
+
+def test_jobs_of_dead_local_processes_are_requeued(queue):
+    job = queue.enqueue("summarize", {})
+    proc = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"], capture_output=True, text=True)
+    dead_owner = f"{socket.gethostname()}:{proc.stdout.strip()}:deadbeef"
+    queue._db().execute(
+        "UPDATE jobs SET status = 'running', lease_owner = ?, lease_expires_at = ? WHERE id = ?",
+        (dead_owner, time.time() + 3600, job["id"]),
+    )
+
+    assert queue.reclaim_stale() == 1
+    assert queue.get(job["id"])["status"] == "queued"
+
+
+def test_retry_defers_without_using_an_attempt(queue):
+    job = queue.enqueue("summarize", {})
+
+    def busy(_job):
+        raise JobRetry({"status_code": 503, "detail": "busy"}, retry_after=30)
+
+    queue.register("summarize", busy)
+    assert queue.run_one()
+
+    deferred = queue.get(job["id"])
+    assert deferred["status"] == "queued" and deferred["attempts"] == 0 and deferred["deferrals"] == 1
+    assert deferred["available_at"] >= time.time() + 25
+    assert queue.claim() is None
+
+
+def test_handler_result_is_stored(queue):
+    job = queue.enqueue("summarize", {"text": "x"})
+    queue.register("summarize", lambda j: {"echo": j["params"]["text"]})
+
+    assert queue.run_one()
+    done = queue.get(job["id"])
+    assert done["status"] == "succeeded" and done["result"] == {"echo": "x"}
@@ -0,0 +1,76 @@
+"""
+Energy VAD, silence-aware window splitting and timestamp remapping.
+"""
+
+import numpy as np
+
+from app.services.speech.segmentation import (
+    compact_regions,
+    detect_speech_regions,
+    map_to_original,
+    split_on_silence,
+)
+
+SR = 16000
+
+
+def clip(seconds, bursts, noise=0.0005, amplitude=0.1, seed=0):
+    """Low noise with tone bursts (start_s, end_s) standing in for speech."""
+    rng = np.random.default_rng(seed)
+    audio = (rng.standard_normal(int(seconds * SR)) * noise).astype(np.float32)
+    for start, end in bursts:
+        t = np.arange(int(start * SR), int(end * SR))
+        audio[t] += (amplitude * np.sin(2 * np.pi * 220 * t / SR)).astype(np.float32)
+    return audio
+
+
+def test_speech_regions_are_found_with_padding():
+    regions = detect_speech_regions(clip(20, [(2, 4), (12, 15)]), SR, pad_ms=400)
+
+    assert len(regions) == 2
+    (s1, e1), (s2, e2) = (tuple(x / SR for x in r) for r in regions)
+    assert 1.5 <= s1 <= 2.0 and 4.0 <= e1 <= 4.5
+    assert 11.5 <= s2 <= 12.0 and 15.0 <= e2 <= 15.5
+
+
+def test_clip_without_clear_noise_floor_is_kept_whole():
+    audio = clip(10, [(0, 10)])
+    assert detect_speech_regions(audio, SR) == [(0, audio.shape[0])]
+
+
+def test_digital_silence_has_no_speech():
+    assert detect_speech_regions(np.zeros(5 * SR, dtype=np.float32), SR) == []
+
+
+def test_compacted_timestamps_map_back_to_the_original_timeline():
+    audio = clip(20, [(2, 4), (12, 15)])
+    regions = detect_speech_regions(audio, SR, pad_ms=400)
+    compact, mapping = compact_regions(audio, regions, SR, gap_seconds=0.3)
+
+    first_len = (regions[0][1] - regions[0][0]) / SR
+    assert compact.shape[0] == sum(e - s for s, e in regions) + int(0.3 * SR)
+    assert map_to_original(0.5, mapping) == regions[0][0] / SR + 0.5
+    # One second into the second region of the compacted audio.
+    t = first_len + 0.3 + 1.0
+    assert abs(map_to_original(t, mapping) - (regions[1][0] / SR + 1.0)) < 1e-6
+    assert map_to_original(3.0, []) == 3.0
+
+
+def test_windows_cover_the_input_and_cut_in_silence():
+    audio = clip(130, [(s, s + 8) for s in range(0, 130, 10)])
+    windows = split_on_silence(audio, SR, target_seconds=30, search_seconds=6)
+
+    assert windows[0][0] == 0 and windows[-1][1] == audio.shape[0]
+    assert all(a[1] == b[0] for a, b in zip(windows, windows[1:]))
+    for _, cut in windows[:-1]:
+        assert (cut / SR) % 10 >= 8  # inside a 2 s gap between bursts
+
+
+def test_whisper_segments_are_remapped_in_place():
+    from app.services.speech.asr_service import _remap_segments
+
+    mapping = [(0.0, 1.6), (2.7, 11.6)]
+    segments = [{"start": 0.2, "end": 2.0, "text": "a"}, {"start": 3.0, "end": 4.5, "text": "b"}]
+    _remap_segments(segments, mapping)
+
+    assert [(round(s["start"], 3), round(s["end"], 3)) for s in segments] == [(1.8, 3.6), (11.9, 13.4)]
@@ -0,0 +1,87 @@
+"""
+SingleFlight: concurrent calls with the same key share one execution.
+"""
+
+import threading
+import time
+
+import pytest
+
+from app.core.singleflight import SingleFlight
+
+
+def run_concurrently(flight, key, fn, n):
+    results, errors = [], []
+
+    def call():
+        try:
+            results.append(flight.do(key, fn))
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=call) for _ in range(n)]
+    for t in threads:
+        t.start()
+    return threads, results, errors
+
+
+def wait_for_leader(flight, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while flight.in_flight() == 0:
+        assert time.monotonic() < deadline, "leader never started"
+        time.sleep(0.005)
+
+
+def test_followers_share_the_leader_result():
+    flight = SingleFlight()
+    release = threading.Event()
+    runs = []
+
+    def work():
+        runs.append(1)
+        release.wait(5)
+        return "done"
+
+    threads, results, errors = run_concurrently(flight, "k", work, 1)
+    wait_for_leader(flight)
+    more, more_results, _ = run_concurrently(flight, "k", work, 4)
+    time.sleep(0.1)  # let the followers block on the leader's future
+    release.set()
+    for t in threads + more:
+        t.join(5)
+
+    assert runs == [1]
+    assert results + more_results == ["done"] * 5
+    assert not errors
+    assert flight.in_flight() == 0
+
+
+def test_followers_receive_the_leader_exception():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def work():
+        release.wait(5)
+        raise ValueError("boom")
+
+    threads, _, errors = run_concurrently(flight, "k", work, 1)
+    wait_for_leader(flight)
+    more, _, more_errors = run_concurrently(flight, "k", work, 2)
+    time.sleep(0.1)
+    release.set()
+    for t in threads + more:
+        t.join(5)
+
+    assert len(errors + more_errors) == 3
+    assert all(isinstance(e, ValueError) for e in errors + more_errors)
+
+
+def test_key_is_released_after_completion():
+    flight = SingleFlight()
+    counter = []
+
+    assert flight.do("k", lambda: counter.append(1) or len(counter)) == 1
+    assert flight.do("k", lambda: counter.append(1) or len(counter)) == 2
+    with pytest.raises(KeyError):
+        flight.do("k", lambda: {}["missing"])
+    assert flight.in_flight() == 0
@@ -0,0 +1,83 @@
+"""
+Summary cache: byte-bounded LRU, TTL expiry, sqlite tier and content keys.
+"""
+
+import types
+
+import pytest
+
+from app.services.text import summary_cache
+from app.services.text.summary_cache import SummaryCache, make_key
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(summary_cache, "time", types.SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+def entry_size(key, value):
+    return len(key) + len(value.encode("utf-8"))
+
+
+def test_evicts_least_recently_used_by_bytes():
+    cache = SummaryCache(max_bytes=3 * entry_size("k1", "x" * 10), ttl_seconds=0)
+    for key in ("k1", "k2", "k3"):
+        cache.put(key, "x" * 10)
+    assert cache.get("k1") is not None  # k2 is now the oldest
+
+    cache.put("k4", "x" * 10)
+
+    assert cache.get("k2") is None
+    assert all(cache.get(k) is not None for k in ("k1", "k3", "k4"))
+    stats = cache.stats()
+    assert stats["evictions"] == 1 and stats["bytes"] <= stats["max_bytes"]
+
+
+def test_entry_larger_than_the_budget_is_not_kept():
+    cache = SummaryCache(max_bytes=50, ttl_seconds=0)
+    cache.put("small", "ok")
+    cache.put("big", "x" * 100)
+
+    assert cache.get("big") is None
+    assert cache.get("small") == "ok"
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = SummaryCache(max_bytes=1024, ttl_seconds=60)
+    cache.put("k", "v")
+
+    clock[0] += 59
+    assert cache.get("k") == "v"
+    clock[0] += 2
+    assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_disk_tier_survives_a_new_instance_until_expiry(tmp_path, clock):
+    db = str(tmp_path / "cache.db")
+    SummaryCache(max_bytes=1024, ttl_seconds=60, db_path=db).put("k", "v")
+
+    fresh = SummaryCache(max_bytes=1024, ttl_seconds=60, db_path=db)
+    assert fresh.get("k") == "v"
+    assert fresh.stats()["disk_hits"] == 1
+
+    clock[0] += 61
+    assert SummaryCache(max_bytes=1024, ttl_seconds=60, db_path=db).get("k") is None
+
+
+def test_key_ignores_whitespace_but_not_parameters():
+    key = make_key("doc", "Some  text\n here", "t5-small", 60, 160)
+
+    assert key == make_key("doc", "Some text here", "t5-small", 60, 160)
+    assert key != make_key("doc", "Some text here", "t5-small", 60, 200)
+    assert key != make_key("chunk", "Some text here", "t5-small", 60, 160)
+
+
+def test_disabled_stats_have_the_live_keys(monkeypatch):
+    monkeypatch.setattr(summary_cache, "CACHE_ENABLED", False)
+    disabled = summary_cache.cache_stats()
+
+    assert disabled.keys() == SummaryCache(1, 0).stats().keys()
+    assert disabled["enabled"] is False
@@ -0,0 +1,72 @@
+"""
+Offset-based token chunking (`_token_chunks`), with a whitespace tokenizer
+standing in for the model tokenizer.
+"""
+
+import re
+
+import pytest
+
+from app.services.text import ai_summarize_service as svc
+
+SAMPLE = " ".join(
+    f"Sentence {i} reports that item {i} was {'reviewed' if i % 2 else 'approved'} by the"
+    f" {'council' if i % 3 else 'committee'} after {i + 2} weeks of debate."
+    for i in range(30)
+)
+
+
+class WordTokenizer:
+    """Fast-tokenizer stand-in: one token per whitespace-separated word."""
+
+    is_fast = True
+
+    def __call__(self, text, add_special_tokens=False, return_offsets_mapping=False, verbose=False):
+        if isinstance(text, list):
+            return {"input_ids": [self.encode(t) for t in text]}
+        offsets = [(m.start(), m.end()) for m in re.finditer(r"\S+", text)]
+        return {"input_ids": [0] * len(offsets), "offset_mapping": offsets}
+
+    def encode(self, text, add_special_tokens=False):
+        return [0] * len(text.split())
+
+
+@pytest.fixture(autouse=True)
+def word_tokenizer(monkeypatch):
+    monkeypatch.setattr(svc, "get_pipeline", lambda model=None: (None, WordTokenizer()))
+
+
+def test_chunks_without_overlap_reassemble_the_input(monkeypatch):
+    monkeypatch.setattr(svc, "CHUNK_OVERLAP_SENTENCES", 0)
+    chunks = svc._token_chunks(SAMPLE, 40)
+
+    assert len(chunks) > 1
+    assert " ".join(chunk for chunk, _ in chunks).split() == SAMPLE.split()
+
+
+def test_chunks_are_slices_of_the_input_within_budget():
+    for chunk, n_tokens in svc._token_chunks(SAMPLE, 40):
+        assert chunk in SAMPLE
+        assert n_tokens == len(chunk.split()) <= 40
+
+
+def test_overlap_repeats_the_last_sentence(monkeypatch):
+    monkeypatch.setattr(svc, "CHUNK_OVERLAP_SENTENCES", 1)
+    text = "One two three. Four five six. Seven eight nine. Ten eleven twelve."
+    chunks = [chunk for chunk, _ in svc._token_chunks(text, 6)]
+
+    assert chunks == [
+        "One two three. Four five six.",
+        "Four five six. Seven eight nine.",
+        "Seven eight nine. Ten eleven twelve.",
+    ]
+
+
+def test_long_sentence_is_hard_split_on_token_offsets(monkeypatch):
+    monkeypatch.setattr(svc, "CHUNK_OVERLAP_SENTENCES", 0)
+    words = [f"w{i}" for i in range(25)]
+    text = "Short one. " + " ".join(words) + ". Tail here."
+    chunks = svc._token_chunks(text, 10)
+
+    assert [n for _, n in chunks] == [2, 10, 10, 5, 2]
+    assert " ".join(chunk for chunk, _ in chunks).split() == text.split()
@@ -0,0 +1,28 @@
+"""
+Standalone job worker process.
+
+Consumes the same durable queue (JOBS_DIR) as the API, so workers can be
+scaled separately from the HTTP front end. Run the API with JOBS_RUN_IN_API=0
+and start as many of these as needed:
+
+    python worker.py
+"""
+
+import signal
+import threading
+
+from app.controllers.jobs_controller import register_job_handlers
+
+
+def main() -> None:
+    queue = register_job_handlers()
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    queue.start()
+    stop.wait()
+    queue.stop()
+
+
+if __name__ == "__main__":
+    main()